@@ -1,22 +1,26 @@
 from pathlib import Path
 import os
 from dash import Dash
-from dash_bootstrap_templates import load_figure_template
 import i18n
 import dash_bootstrap_components as dbc
 
+from src.components.figures.styles import load_template
 from src.components.layout import User
 from src.components import layout
 from src.data.user import Profile, HouseholdProfile
+from src.metrics import register_metrics
+from src.startup import STARTUP_MODE
 
 
 LOCALE = "pt"
 os.environ["LOCALE"] = LOCALE
 
-load_figure_template("darkly")
-
 
 def main() -> None:
+    # the heavy modules are imported on first use, unless the startup is eager
+    if STARTUP_MODE == "eager":
+        load_template()
+
     # set the locale and load the translations
     i18n.set("locale", LOCALE)  # type: ignore
     locale_path: Path = Path.cwd() / "locale"
@@ -42,6 +46,8 @@ def main() -> None:
     app.layout = layout.render(app, users)
     app.config["suppress_callback_exceptions"] = True
     app.scripts.config.serve_locally = True
+    # callback latencies on /metrics, profiles on /metrics/profile
+    register_metrics(app.server)
     # server = app.server
     app.run(debug=True, port="8050")
 
@@ -0,0 +1,426 @@
+"""
+Benchmarks of the ingestion, aggregation and prediction hot paths, on synthetic ledgers.
+
+Every benchmark runs on ledgers (or bank files) of each size, in a temporary workspace so the
+real database is never read or written. With --save, the results are written to
+benchmarks/<commit>.json; --compare reports the change against such a file and fails when a
+benchmark got slower than the tolerance allows.
+
+Usage:
+    python -m src.benchmarks [--sizes 1k 100k 1m] [--only PATTERN] [--repeat 5]
+                             [--save] [--compare FILE] [--tolerance 0.2]
+
+The benchmarks that clean descriptions need the NLTK data (see src/data/raw/nltk_resources.py)
+and are skipped without it.
+"""
+
+import argparse
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+import fnmatch
+import functools
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Callable, Iterator
+import i18n
+import pandas as pd
+
+from src.data.cube import MonthlyCube
+from src.data.ledger import Ledger
+from src.data.loader import load_data
+from src.data.raw import cleaner
+from src.data.raw.banks import BANKS
+from src.data.raw.cleaner import Bank, clean_descriptions
+from src.data.raw.descriptions_cache import DescriptionsCache
+from src.data.raw.nltk_resources import MissingResourceError
+from src.data.raw.statements import data_url, synthetic_statement
+from src.data.raw.uploader import parse_and_clean
+from src.data.schema import DataSchema
+from src.data.source import DataSource
+from src.data.synthetic import synthetic_ledger
+
+RESULTS_DIR: Path = Path.cwd() / "benchmarks"
+SIZES: dict[str, int] = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+LOCALE = "pt"
+
+
+class Context:
+    """The synthetic data of one size, generated once and shared by the benchmarks."""
+
+    def __init__(self, rows: int, workspace: Path) -> None:
+        self.rows: int = rows
+        self.workspace: Path = workspace
+
+    @functools.cached_property
+    def expenses(self) -> pd.DataFrame:
+        return synthetic_ledger(self.rows)
+
+    @functools.cached_property
+    def incomes(self) -> pd.DataFrame:
+        return synthetic_ledger(max(self.rows // 10, 1), kind="incomes")
+
+    @functools.cached_property
+    def cube_data(self) -> pd.DataFrame:
+        """The expenses and incomes cubes, as the evolution charts combine them."""
+        return pd.concat(
+            [
+                MonthlyCube.from_frame(self.expenses).frame.assign(
+                    **{DataSchema.TYPE: i18n.t("general.expenses")}
+                ),
+                MonthlyCube.from_frame(self.incomes).frame.assign(
+                    **{DataSchema.TYPE: i18n.t("general.incomes")}
+                ),
+            ]
+        )
+
+    @functools.cache
+    def statement(self, bank: Bank) -> bytes:
+        return synthetic_statement(bank, self.rows)
+
+    @functools.cache
+    def parsed_statement(self, bank: Bank) -> pd.DataFrame:
+        return read(bank, self.statement(bank))
+
+    def path(self, name: str) -> Path:
+        return self.workspace / f"{name}-{self.rows}"
+
+
+# a benchmark prepares its input (untimed) and returns the function to time
+Setup = Callable[[Context], Callable[[], Any]]
+BENCHMARKS: dict[str, Setup] = {}
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def read(bank: Bank, content: bytes) -> pd.DataFrame:
+    return bank.reader(io.TextIOWrapper(io.BytesIO(content), encoding=bank.encoding))
+
+
+def register_bank_benchmarks() -> None:
+    for modal, banks in BANKS.items():
+        kind: str = "statement" if "statement" in modal else "ccbill"
+        for name, bank in banks.items():
+            key: str = f"{kind}:{name.lower().replace(' ', '_')}"
+            benchmark(f"read:{key}")(
+                lambda ctx, bank=bank: functools.partial(
+                    read, bank, ctx.statement(bank)
+                )
+            )
+            benchmark(f"clean:{key}")(
+                lambda ctx, bank=bank: functools.partial(
+                    bank.cleaner, ctx.parsed_statement(bank).copy()
+                )
+            )
+            # decoding, reading and cleaning, in chunks when the bank supports it
+            benchmark(f"upload:{key}")(
+                lambda ctx, bank=bank: functools.partial(
+                    parse_and_clean, data_url(ctx.statement(bank)), bank
+                )
+            )
+
+
+register_bank_benchmarks()
+
+
+@benchmark("clean_descriptions:cold")
+def clean_descriptions_cold(ctx: Context) -> Callable[[], Any]:
+    # nothing cleaned before, neither in the persistent cache nor in memory
+    cleaner.DESCRIPTIONS = DescriptionsCache(
+        ctx.path(f"descriptions-{time.perf_counter_ns()}.sqlite")
+    )
+    cleaner.stem.cache_clear()
+    cleaner.remove_accents.cache_clear()
+    df: pd.DataFrame = ctx.expenses[[DataSchema.DESCRIPTION]].copy()
+    return functools.partial(clean_descriptions, [], df)
+
+
+@benchmark("clean_descriptions:warm")
+def clean_descriptions_warm(ctx: Context) -> Callable[[], Any]:
+    df: pd.DataFrame = ctx.expenses[[DataSchema.DESCRIPTION]]
+    clean_descriptions([], df.copy())
+    return functools.partial(clean_descriptions, [], df.copy())
+
+
+def source_benchmark(
+    name: str, aggregate: Callable[[DataSource, Context], Any]
+) -> None:
+    # a new source each time, as its views are memoized
+    benchmark(f"source:{name}")(
+        lambda ctx: functools.partial(aggregate, DataSource(ctx.expenses), ctx)
+    )
+
+
+def latest(ctx: Context) -> tuple[int, int]:
+    row: pd.Series = ctx.expenses.iloc[0]
+    return int(row[DataSchema.YEAR]), int(row[DataSchema.MONTH])
+
+
+source_benchmark(
+    "total_month_amount", lambda source, ctx: source.total_month_amount(*latest(ctx))
+)
+source_benchmark(
+    "month_expense_by_subcat",
+    lambda source, ctx: source.month_expense_by_subcat(*latest(ctx)),
+)
+source_benchmark(
+    "evolution_per_category",
+    lambda source, ctx: source.evolution_per_category(latest(ctx)[0]),
+)
+benchmark("source:month_income_by_category")(
+    lambda ctx: functools.partial(
+        lambda source: source.month_income_by_category(*reversed(latest(ctx))),
+        DataSource(ctx.incomes),
+    )
+)
+benchmark("source:evolution")(
+    lambda ctx: functools.partial(
+        lambda source: source.evolution(latest(ctx)[0]), DataSource(ctx.cube_data)
+    )
+)
+benchmark("source:yearly_evolution")(
+    lambda ctx: functools.partial(
+        lambda source: source.yearly_evolution(), DataSource(ctx.cube_data)
+    )
+)
+benchmark("cube:from_frame")(
+    lambda ctx: functools.partial(MonthlyCube.from_frame, ctx.expenses)
+)
+
+
+@benchmark("predict_subcategories")
+def predict(ctx: Context) -> Callable[[], Any]:
+    from src.data.ml import predictor
+    from src.data.ml.train import save_model
+
+    model_dir: Path = ctx.workspace / Path(predictor.SUBCAT_MODEL_FILE).parent
+    if not model_dir.exists():
+        # trained once, on at most 10k rows
+        train: pd.DataFrame = clean_descriptions([], ctx.expenses.head(10_000).copy())
+        save_model("logistic_regression", train, model_dir)
+    # half the rows were categorized by the user, the others go through the model
+    half: int = len(ctx.expenses) // 2
+    categorized, uncategorized = predictor.separate_data(
+        ctx.expenses.assign(
+            **{
+                DataSchema.SUBCATEGORY: ctx.expenses[DataSchema.SUBCATEGORY]
+                .astype(object)
+                .where(ctx.expenses.index >= half)
+            }
+        )
+    )
+    merchant_index: dict[str, str] = predictor.build_merchant_index(
+        categorized.head(100)
+    )
+    return functools.partial(
+        predictor.predict_subcategories, uncategorized.copy(), merchant_index
+    )
+
+
+@benchmark("ledger:save")
+def ledger_save(ctx: Context) -> Callable[[], Any]:
+    path: Path = ctx.path(f"ledger-{time.perf_counter_ns()}")
+    return functools.partial(Ledger(path).save, ctx.expenses)
+
+
+@benchmark("ledger:load")
+def ledger_load(ctx: Context) -> Callable[[], Any]:
+    ledger = Ledger(ctx.path("ledger"))
+    if not ledger.exists:
+        ledger.save(ctx.expenses)
+    return ledger.load
+
+
+@benchmark("csv:save")
+def csv_save(ctx: Context) -> Callable[[], Any]:
+    return functools.partial(
+        DataSource(ctx.expenses.copy()).save_data, str(ctx.path("expenses.csv"))
+    )
+
+
+@benchmark("csv:load")
+def csv_load(ctx: Context) -> Callable[[], Any]:
+    path: Path = ctx.path("ledger.csv")
+    if not path.exists():
+        DataSource(ctx.expenses.copy()).save_data(str(path))
+    return functools.partial(load_data, path)
+
+
+@dataclass
+class Result:
+    """Timings of one benchmark on one size, in milliseconds."""
+
+    name: str
+    size: str
+    rows: int
+    median_ms: float | None = None
+    best_ms: float | None = None
+    times_ms: list[float] = field(default_factory=list)
+    skipped: str | None = None
+
+
+def time_benchmark(setup: Setup, ctx: Context, repeat: int) -> list[float]:
+    times: list[float] = []
+    for _ in range(repeat):
+        function: Callable[[], Any] = setup(ctx)
+        start: float = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+@contextmanager
+def workspace() -> Iterator[Path]:
+    """
+    A temporary working directory, where the predictor finds its model, with its own
+    descriptions cache.
+    """
+    cwd: Path = Path.cwd()
+    descriptions: DescriptionsCache = cleaner.DESCRIPTIONS
+    with tempfile.TemporaryDirectory(prefix="benchmarks-") as directory:
+        os.chdir(directory)
+        cleaner.DESCRIPTIONS = DescriptionsCache(
+            Path(directory) / "descriptions.sqlite"
+        )
+        try:
+            yield Path(directory)
+        finally:
+            os.chdir(cwd)
+            cleaner.DESCRIPTIONS = descriptions
+
+
+def run(names: list[str], sizes: list[str], repeat: int) -> list[Result]:
+    os.environ.setdefault("LOCALE", LOCALE)
+    i18n.set("locale", LOCALE)  # type: ignore
+    i18n.load_path.append(Path.cwd() / "locale")  # type: ignore
+
+    # the cleaners work on slices of the statements
+    warnings.simplefilter("ignore", pd.errors.SettingWithCopyWarning)
+    results: list[Result] = []
+    with workspace() as directory:
+        for size in sizes:
+            ctx = Context(SIZES[size], directory)
+            for name in names:
+                result = Result(name, size, ctx.rows)
+                try:
+                    result.times_ms = time_benchmark(BENCHMARKS[name], ctx, repeat)
+                except MissingResourceError as e:
+                    result.skipped = str(e)
+                else:
+                    result.median_ms = statistics.median(result.times_ms)
+                    result.best_ms = min(result.times_ms)
+                results.append(result)
+                print(format_result(result), flush=True)
+    return results
+
+
+def format_result(result: Result) -> str:
+    label: str = f"{result.name} [{result.size}]"
+    if result.median_ms is None:
+        return f"{label:<45} skipped: {result.skipped}"
+    return f"{label:<45} {result.median_ms:>10.1f}ms (best {result.best_ms:.1f}ms)"
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(results: list[Result], directory: Path = RESULTS_DIR) -> Path:
+    commit: str = current_commit()
+    directory.mkdir(parents=True, exist_ok=True)
+    path: Path = directory / f"{commit}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "commit": commit,
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "machine": platform.platform(),
+                "results": [asdict(result) for result in results],
+            },
+            f,
+            indent=2,
+        )
+    return path
+
+
+def load_results(path: Path) -> list[Result]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [Result(**result) for result in json.load(f)["results"]]
+
+
+def regressions(
+    results: list[Result], baseline: list[Result], tolerance: float
+) -> list[tuple[Result, float]]:
+    """
+    Compares the median times with the baseline.
+
+    Returns:
+        list[tuple[Result, float]]: The results slower than the baseline by more than the
+        tolerance (e.g. 0.2 for 20%), with their ratio to the baseline.
+    """
+    before: dict[tuple[str, str], Result] = {(r.name, r.size): r for r in baseline}
+    slower: list[tuple[Result, float]] = []
+    for result in results:
+        old: Result | None = before.get((result.name, result.size))
+        if result.median_ms is None or old is None or not old.median_ms:
+            continue
+        ratio: float = result.median_ms / old.median_ms
+        print(f"{result.name} [{result.size}]: {ratio:.2f}x the baseline")
+        if ratio > 1 + tolerance:
+            slower.append((result, ratio))
+    return slower
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks the hot paths of the app.")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--only", help="glob of the benchmarks to run, e.g. 'source:*'")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", action="store_true", help=f"write to {RESULTS_DIR}")
+    parser.add_argument("--compare", type=Path, help="results file to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    names: list[str] = fnmatch.filter(BENCHMARKS, args.only or "*")
+    if not names:
+        parser.exit(1, f"No benchmark matches {args.only!r}\n")
+    baseline: list[Result] = load_results(args.compare) if args.compare else []
+    results: list[Result] = run(names, args.sizes, args.repeat)
+    if args.save:
+        print(f"Saved the results to {save_results(results)}")
+    if args.compare:
+        slower = regressions(results, baseline, args.tolerance)
+        if slower:
+            parser.exit(
+                1,
+                "Slower than the baseline: "
+                + ", ".join(f"{r.name} [{r.size}] {ratio:.2f}x" for r, ratio in slower)
+                + "\n",
+            )
+
+
+if __name__ == "__main__":
+    main()
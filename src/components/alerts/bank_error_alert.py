@@ -8,7 +8,11 @@ from .. import ids
 def render() -> html.Div:
     return html.Div(
         dbc.Alert(
-            [html.I(className="bi bi-x-octagon-fill"), i18n.t("general.bank_error")],
+            [
+                html.I(className="bi bi-x-octagon-fill"),
+                i18n.t("general.bank_error"),
+                html.Ul(id=ids.BANK_ERROR_FILES),
+            ],
             id=ids.BANK_ERROR_ALERT,
             is_open=False,
             duration=4000,
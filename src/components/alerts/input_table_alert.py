@@ -11,6 +11,7 @@ def render() -> html.Div:
             [
                 html.I(className="bi bi-x-octagon-fill"),
                 i18n.t("general.input_table_error"),
+                html.Ul(id=ids.INPUT_TABLE_ERROR_FILES),
             ],
             id=ids.INPUT_TABLE_ALERT,
             is_open=False,
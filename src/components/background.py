@@ -0,0 +1,59 @@
+"""Runs long callbacks as Dash background jobs, so the browser stays responsive meanwhile."""
+
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable
+from dash import callback, DiskcacheManager
+
+BACKGROUND_CACHE_DIR: Path = Path.cwd() / "database" / "background"
+PROGRESS_INTERVAL = 500  # ms between the polls of a running job
+
+SetProgress = Callable[[tuple], None]
+
+
+def background_manager() -> DiskcacheManager | None:
+    """
+    The manager running the background jobs in separate processes, storing their progress and
+    results on disk, or None if diskcache (`pip install dash[diskcache]`) is not installed.
+    """
+    try:
+        import diskcache
+
+        return DiskcacheManager(diskcache.Cache(BACKGROUND_CACHE_DIR))
+    except ImportError:
+        return None
+
+
+MANAGER: DiskcacheManager | None = background_manager()
+
+
+def background_callback(
+    *args: Any, progress: list, running: list | None = None, **kwargs: Any
+) -> Callable[[Callable], Callable]:
+    """
+    Registers a callback as a background job reporting its progress.
+
+    Like the Dash background callbacks, the decorated function takes a `set_progress` function
+    first. Without a manager, the callback runs in the request as a regular callback, and its
+    progress is discarded.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if MANAGER is not None:
+            return callback(
+                *args,
+                background=True,
+                manager=MANAGER,
+                interval=PROGRESS_INTERVAL,
+                progress=progress,
+                running=running,
+                **kwargs,
+            )(func)
+
+        @wraps(func)
+        def run_in_request(*func_args: Any) -> Any:
+            return func(lambda _: None, *func_args)
+
+        return callback(*args, **kwargs)(run_in_request)
+
+    return decorator
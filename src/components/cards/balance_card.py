@@ -1,7 +1,8 @@
-from dash import html, callback, Input, Output, State
+from dash import html, callback, Input, Output
 import dash_bootstrap_components as dbc
 import i18n
 
+from src.data.cache import FRAMES, VersionToken
 from src.data.source import DataSource
 from .. import ids
 
@@ -15,16 +16,12 @@ def render() -> html.Div:
     [
         Input(ids.MONTH_DROPDOWN, "value"),
         Input(ids.YEAR_DROPDOWN, "value"),
-        Input(ids.EXPENSES_TABLE, "cellValueChanged"),
-        Input(ids.INCOMES_TABLE, "cellValueChanged"),
-    ],
-    [
-        State(ids.EXPENSES_TABLE, "rowData"),
-        State(ids.INCOMES_TABLE, "rowData"),
+        Input(ids.EXPENSES_VERSION, "data"),
+        Input(ids.INCOMES_VERSION, "data"),
     ],
 )
 def update_card(
-    month: int, year: int, _, __, expenses: list[dict], incomes: list[dict]
+    month: int, year: int, expenses: VersionToken, incomes: VersionToken
 ) -> html.Div:
     """
     Updates the balance card with the given month, year, expenses, and incomes.
@@ -32,14 +29,14 @@ def update_card(
     Args:
         month (int): The month for which the balance is being calculated.
         year (int): The year for which the balance is being calculated.
-        expenses (list[dict]): The expenses for the given month and year.
-        incomes (list[dict]): The incomes for the given month and year.
+        expenses (VersionToken): The version of the cached expenses data.
+        incomes (VersionToken): The version of the cached incomes data.
 
     Returns:
         html.Div: The updated balance card as an html.Div element.
     """
-    incomes_source = DataSource(incomes)
-    expenses_source = DataSource(expenses)
+    incomes_source = DataSource(FRAMES.cube_from_token(incomes))
+    expenses_source = DataSource(FRAMES.cube_from_token(expenses))
     total_income: float = incomes_source.total_month_amount(year, month)
     total_expense: float = expenses_source.total_month_amount(year, month)
     balance: float = total_income - total_expense
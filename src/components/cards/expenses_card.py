@@ -1,7 +1,8 @@
-from dash import callback, html, Output, Input, State
+from dash import callback, html, Output, Input
 import dash_bootstrap_components as dbc
 import i18n
 
+from src.data.cache import FRAMES, VersionToken
 from src.data.source import DataSource
 from .. import ids
 
@@ -13,28 +14,26 @@ def render() -> html.Div:
 @callback(
     Output(ids.EXP_CARD, "children"),
     [
-        Input(ids.EXPENSES_TABLE, "cellValueChanged"),
+        Input(ids.EXPENSES_VERSION, "data"),
         Input(ids.MONTH_DROPDOWN, "value"),
         Input(ids.YEAR_DROPDOWN, "value"),
     ],
-    State(ids.EXPENSES_TABLE, "rowData"),
 )
-def update_card(_, month: int, year: int, data: list[dict]) -> html.Div:
+def update_card(data: VersionToken, month: int, year: int) -> html.Div:
     """
     Update the card with the total expenses for the given month and year based on the input data.
 
     Args:
-        _: Placeholder for the cell value that has changed, triggering the callback.
+        data (VersionToken): The version of the cached expenses data.
         month (int): The month for which expenses are to be calculated.
         year (int): The year for which expenses are to be calculated.
-        data (list[dict]): The data containing the expenses for each month and year.
 
     Returns:
         html.Div: A Div element containing the updated card with the total expenses.
     """
-    if not data:
+    source = DataSource(FRAMES.cube_from_token(data))
+    if source.is_empty:
         return html.Div(id=ids.EXP_CARD)
-    source = DataSource(data)
     expenses: float = source.total_month_amount(year, month)
 
     return html.Div(
@@ -1,7 +1,8 @@
-from dash import callback, html, Output, Input, State
+from dash import callback, html, Output, Input
 import dash_bootstrap_components as dbc
 import i18n
 
+from src.data.cache import FRAMES, VersionToken
 from src.data.source import DataSource
 from .. import ids
 
@@ -13,28 +14,26 @@ def render() -> html.Div:
 @callback(
     Output(ids.INC_CARD, "children"),
     [
-        Input(ids.INCOMES_TABLE, "cellValueChanged"),
+        Input(ids.INCOMES_VERSION, "data"),
         Input(ids.MONTH_DROPDOWN, "value"),
         Input(ids.YEAR_DROPDOWN, "value"),
     ],
-    State(ids.INCOMES_TABLE, "rowData"),
 )
-def update_card(_, month: int, year: int, data: list[dict]) -> html.Div:
+def update_card(data: VersionToken, month: int, year: int) -> html.Div:
     """
     Update the income card with the total income for a given month and year.
 
     Parameters:
-        _ (Any): Placeholder for the cell value that has changed, triggering the callback.
+        data (VersionToken): The version of the cached incomes data.
         month (int): The month for which the income is calculated.
         year (int): The year for which the income is calculated.
-        data (list[dict]): The row data from the incomes table.
 
     Returns:
         html.Div: The updated income card as a Div element.
     """
-    if not data:
+    source = DataSource(FRAMES.cube_from_token(data))
+    if source.is_empty:
         return html.Div(id=ids.INC_CARD)
-    source = DataSource(data)
     incomes: float = source.total_month_amount(year, month)
 
     return html.Div(
@@ -1,10 +1,13 @@
 import i18n
 from dash import html, Input, Output, State, dcc, callback
 
-from src.data.user import DATABASE_PATH
-from src.data.source import DataSource
+from src.data.journal import compact_in_background
+from src.data.user import user_journal, user_ledger
+from src.startup import lazy_import
 from . import ids
 
+online = lazy_import("src.data.ml.online")
+
 
 def render() -> html.Div:
     return html.Div(
@@ -23,8 +26,6 @@ def render() -> html.Div:
     ],
     [
         State(ids.SAVE_MODAL, "is_open"),
-        State(ids.EXPENSES_TABLE, "rowData"),
-        State(ids.INCOMES_TABLE, "rowData"),
         State(ids.ACTIVE_USER, "data"),
     ],
     prevent_initial_call=True,
@@ -33,22 +34,22 @@ def save(
     n1: int,
     n2: int,
     is_open: bool,
-    expenses: list[dict],
-    incomes: list[dict],
     active_user: str,
 ) -> bool:
     """
-    This function is a callback that handles the opening and closing of the save modal. It takes in three inputs: `n1`, `n2`, and `is_open`. `n1` and `n2` are the submit and close click counts respectively, while `is_open` is a boolean indicating whether the save modal is open or not. The function also takes in two states: `expenses` and `incomes`, which are lists of dictionaries representing expense and income data respectively.
+    This function is a callback that handles the opening and closing of the save modal. It takes in three inputs: `n1`, `n2`, and `is_open`. `n1` and `n2` are the submit and close click counts respectively, while `is_open` is a boolean indicating whether the save modal is open or not. The function also takes in the `active_user` state, whose data is being saved.
 
-    If `n1` is not zero, the function saves the expense and income data to their respective files and returns the negation of `is_open`. If `n2` is not zero, the function also returns the negation of `is_open`. Otherwise, it returns the value of `is_open`.
+    Every edit is already journaled as it happens, so if `n1` is not zero, the function only starts compacting the expenses and incomes journals into their ledgers in the background, updating the online subcategory model with the confirmed expenses, and returns the negation of `is_open`. If `n2` is not zero, the function also returns the negation of `is_open`. Otherwise, it returns the value of `is_open`.
 
     The function returns a boolean indicating whether the save modal should be open or closed.
     """
     if n1:
-        source_exp = DataSource(expenses)
-        source_exp.save_data(f"{DATABASE_PATH}/{active_user.lower()}_expenses.csv")
-        source_inc = DataSource(incomes)
-        source_inc.save_data(f"{DATABASE_PATH}/{active_user.lower()}_incomes.csv")
+        for kind in ["expenses", "incomes"]:
+            compact_in_background(
+                user_ledger(active_user, kind),
+                user_journal(active_user, kind),
+                online.learn if kind == "expenses" else None,
+            )
         return not is_open
     if n2:
         return not is_open
@@ -1,6 +1,7 @@
 from dash import html, callback, Output, Input
 import dash_bootstrap_components as dbc
 
+from src.data.cache import FRAMES, VersionToken
 from .cards import balance_card, expenses_card, incomes_card, dropdowns_card
 
 from . import ids
@@ -19,20 +20,20 @@ def render() -> html.Div:
 
 @callback(
     Output(ids.MONTHLY_TAB, "children"),
-    [Input(ids.EXPENSES_TABLE, "rowData"), Input(ids.INCOMES_TABLE, "rowData")],
+    [Input(ids.EXPENSES_VERSION, "data"), Input(ids.INCOMES_VERSION, "data")],
 )
-def update_tab_content(expenses: list[dict], incomes: list[dict]) -> html.Div:
+def update_tab_content(expenses: VersionToken, incomes: VersionToken) -> html.Div:
     """
     Generates the content for the monthly tab based on the provided expenses and incomes data.
 
     Parameters:
-        expenses (list[dict]): A list of dictionaries representing the expenses data.
-        incomes (list[dict]): A list of dictionaries representing the incomes data.
+        expenses (VersionToken): The version of the cached expenses data.
+        incomes (VersionToken): The version of the cached incomes data.
 
     Returns:
         html.Div: The content for the monthly tab as a Div element.
     """
-    if not expenses and not incomes:
+    if FRAMES.cube_from_token(expenses).empty and FRAMES.cube_from_token(incomes).empty:
         return html.Div("No data.")
     return html.Div(
         dbc.Row(
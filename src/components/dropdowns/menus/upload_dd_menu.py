@@ -3,10 +3,10 @@ from dash import html, Output, Input, State, dcc, callback, no_update
 import dash_bootstrap_components as dbc
 import i18n
 
-from src.data.raw.uploader import upload_bank_data
+from src.data.raw.uploader import UploadError, upload_bank_data
 from src.data.raw.banks import PersonalTable
 from ... import ids
-from ...tables.uploader import upload_data
+from ...tables.uploader import upload_data, upload_failures
 
 
 def render() -> html.Div:
@@ -63,27 +63,39 @@ def render() -> html.Div:
     Output(ids.EXPENSES_TABLE, "rowTransaction", allow_duplicate=True),
     Output(ids.INCOMES_TABLE, "rowTransaction", allow_duplicate=True),
     Output(ids.INPUT_TABLE_ALERT, "is_open"),
+    Output(ids.INPUT_TABLE_ERROR_FILES, "children"),
     Input(ids.INPUT_TABLE_UPLOAD, "contents"),
     [
+        State(ids.INPUT_TABLE_UPLOAD, "filename"),
         State(ids.EXPENSES_TABLE, "rowData"),
         State(ids.INCOMES_TABLE, "rowData"),
     ],
     prevent_initial_call=True,
 )
 def input_table(
-    contents: list[str], old_expenses: list[dict], old_incomes: list[dict]
-) -> tuple[dict[str, Any] | Any, dict[str, Any] | Any, bool]:
+    contents: list[str],
+    filenames: list[str],
+    old_expenses: list[dict],
+    old_incomes: list[dict],
+) -> tuple[dict[str, Any] | Any, dict[str, Any] | Any, bool, list[html.Li]]:
     """
-    A function that processes the input table contents and updates the expenses and incomes tables. It takes the table contents, old expenses, and old incomes as input parameters and returns a tuple of updated expenses, updated incomes, and a boolean indicating if an alert should be shown.
+    A function that processes the input table contents and updates the expenses and incomes tables. It takes the table contents, their file names, old expenses, and old incomes as input parameters and returns a tuple of updated expenses, updated incomes, a boolean indicating if an alert should be shown, and the files that could not be read.
     """
     bank = PersonalTable()
+    failures: list[html.Li] = []
     try:
-        new_expenses, new_incomes = upload_bank_data(bank, contents)
+        new_expenses, new_incomes = upload_bank_data(bank, contents, filenames)
+    except UploadError as e:
+        failures = upload_failures(e.failures)
+        if e.expenses.empty and e.incomes.empty:
+            return no_update, no_update, True, failures
+        new_expenses, new_incomes = e.expenses, e.incomes
     except ValueError:
-        return no_update, no_update, True
+        return no_update, no_update, True, []
 
     return (
         upload_data(old_expenses, new_expenses),
         upload_data(old_incomes, new_incomes),
-        False,
+        bool(failures),
+        failures,
     )
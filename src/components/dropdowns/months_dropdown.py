@@ -1,7 +1,8 @@
-from dash import callback, html, dcc, Output, Input, State
+from dash import callback, html, dcc, Output, Input
 import i18n
 
 from src.components import ids
+from src.data.cache import FRAMES, VersionToken
 from src.data.source import DataSource
 
 
@@ -23,14 +24,13 @@ def render() -> html.Div:
         Output(ids.MONTH_DROPDOWN, "value"),
     ],
     [
-        Input(ids.EXPENSES_TABLE, "cellValueChanged"),
+        Input(ids.EXPENSES_VERSION, "data"),
         Input(ids.YEAR_DROPDOWN, "value"),
     ],
-    State(ids.EXPENSES_TABLE, "rowData"),
 )
-def update_dropdown(_, year: int, data: list[dict]) -> tuple[list[int], int]:
-    if not data:
+def update_dropdown(data: VersionToken, year: int) -> tuple[list[int], int]:
+    source = DataSource(FRAMES.cube_from_token(data))
+    if source.is_empty:
         return [], 1
-    source = DataSource(data)
     months: list[int] = source.unique_months_from_year(year)
     return months, max(months)
@@ -1,6 +1,7 @@
-from dash import callback, html, dcc, Input, Output, State
+from dash import callback, html, dcc, Input, Output
 import i18n
 
+from src.data.cache import FRAMES, VersionToken
 from src.data.source import DataSource
 from src.components import ids
 
@@ -23,12 +24,11 @@ def render() -> html.Div:
         Output(ids.YEAR_DROPDOWN, "options"),
         Output(ids.YEAR_DROPDOWN, "value"),
     ],
-    Input(ids.EXPENSES_TABLE, "cellValueChanged"),
-    State(ids.EXPENSES_TABLE, "rowData"),
+    Input(ids.EXPENSES_VERSION, "data"),
 )
-def update_dropdown(_, data: list[dict]) -> tuple[list[int], int]:
-    if not data:
+def update_dropdown(data: VersionToken) -> tuple[list[int], int]:
+    source = DataSource(FRAMES.cube_from_token(data))
+    if source.is_empty:
         return [], 1
-    source = DataSource(data)
     years: list[int] = source.unique_years
     return years, years[0]
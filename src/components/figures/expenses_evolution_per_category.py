@@ -1,13 +1,17 @@
-from dash import html, callback, Output, Input, State, dcc
+from dash import html, callback, Output, Input, dcc
 import i18n
-import plotly.express as px
 import pandas as pd
 from plotly.graph_objs._figure import Figure
 
 from src.components import ids
+from src.components.figures import styles
+from src.data.cache import FRAMES, VersionToken
 from src.data.source import DataSource
 from src.data.schema import DataSchema
 from src.components.figures.monthly_expenses_sunburst_chart import set_color_palette
+from src.startup import lazy_import
+
+px = lazy_import("plotly.express")
 
 
 def render() -> html.Div:
@@ -17,19 +21,18 @@ def render() -> html.Div:
 @callback(
     Output(ids.EXPENSES_EVOLUTION_PER_CATEGORY, "children"),
     [
-        Input(ids.EXPENSES_TABLE, "cellValueChanged"),
+        Input(ids.EXPENSES_VERSION, "data"),
         Input(ids.YEAR_DROPDOWN, "value"),
     ],
-    [State(ids.EXPENSES_TABLE, "rowData")],
 )
-def update_chart(_, year: int, expenses: list[dict]) -> html.Div:
-    if not expenses:
+def update_chart(expenses: VersionToken, year: int) -> html.Div:
+    source = DataSource(FRAMES.cube_from_token(expenses))
+    if source.is_empty:
         return html.Div(id=ids.EXPENSES_EVOLUTION_PER_CATEGORY)
 
-    data: list[dict] = expenses
-    source = DataSource(data)
     df: pd.DataFrame = source.evolution_per_category(year)
 
+    styles.load_template()
     fig: Figure = px.line(
         df,
         x=DataSchema.MONTH,
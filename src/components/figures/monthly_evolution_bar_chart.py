@@ -1,12 +1,17 @@
-from dash import callback, html, Input, Output, dcc, State
+from dash import callback, html, Input, Output, dcc
+import pandas as pd
 from pandas import DataFrame
-import plotly.express as px
 import i18n
 from plotly.graph_objs._figure import Figure
 
 from src.components import ids
+from src.components.figures import styles
+from src.data.cache import FRAMES, VersionToken
 from src.data.schema import DataSchema
 from src.data.source import DataSource
+from src.startup import lazy_import
+
+px = lazy_import("plotly.express")
 
 
 def render() -> html.Div:
@@ -16,27 +21,26 @@ def render() -> html.Div:
 @callback(
     Output(ids.BAR_CHART, "children"),
     [
-        Input(ids.EXPENSES_TABLE, "cellValueChanged"),
-        Input(ids.INCOMES_TABLE, "cellValueChanged"),
+        Input(ids.EXPENSES_VERSION, "data"),
+        Input(ids.INCOMES_VERSION, "data"),
         Input(ids.YEAR_DROPDOWN, "value"),
     ],
-    [
-        State(ids.EXPENSES_TABLE, "rowData"),
-        State(ids.INCOMES_TABLE, "rowData"),
-    ],
 )
-def update_chart(
-    _, __, year: int, expenses: list[dict], incomes: list[dict]
-) -> html.Div:
-    for e in expenses:
-        e[DataSchema.TYPE] = i18n.t("general.expenses")
-    for i in incomes:
-        i[DataSchema.TYPE] = i18n.t("general.incomes")
-
-    data: list[dict] = expenses + incomes
+def update_chart(expenses: VersionToken, incomes: VersionToken, year: int) -> html.Div:
+    data: DataFrame = pd.concat(
+        [
+            FRAMES.cube_from_token(expenses).assign(
+                **{DataSchema.TYPE: i18n.t("general.expenses")}
+            ),
+            FRAMES.cube_from_token(incomes).assign(
+                **{DataSchema.TYPE: i18n.t("general.incomes")}
+            ),
+        ]
+    )
     source = DataSource(data)
     df: DataFrame = source.evolution(year)
 
+    styles.load_template()
     fig: Figure = px.bar(
         df,
         x=DataSchema.MONTH,
@@ -1,13 +1,16 @@
-from dash import callback, html, dcc, Output, Input, State
+from dash import callback, html, dcc, Output, Input
 from pandas import DataFrame
-import plotly.express as px
 import i18n
 from plotly.graph_objs._figure import Figure
 
 from src.components import ids
 from src.components.figures import styles
+from src.data.cache import FRAMES, VersionToken
 from src.data.schema import DataSchema
 from src.data.source import DataSource
+from src.startup import lazy_import
+
+px = lazy_import("plotly.express")
 
 
 def render() -> html.Div:
@@ -30,16 +33,16 @@ def set_color_palette() -> dict[str, str]:
 @callback(
     Output(ids.SUNBURST_CHART, "children"),
     [
-        Input(ids.EXPENSES_TABLE, "cellValueChanged"),
+        Input(ids.EXPENSES_VERSION, "data"),
         Input(ids.MONTH_DROPDOWN, "value"),
         Input(ids.YEAR_DROPDOWN, "value"),
     ],
-    State(ids.EXPENSES_TABLE, "rowData"),
 )
-def update_chart(_, month: int, year: int, data: list[dict]) -> html.Div:
-    source = DataSource(data)
+def update_chart(expenses: VersionToken, month: int, year: int) -> html.Div:
+    source = DataSource(FRAMES.cube_from_token(expenses))
     df_month_sum: DataFrame = source.month_expense_by_subcat(year, month)
 
+    styles.load_template()
     fig: Figure = px.sunburst(
         df_month_sum,
         path=[DataSchema.CATEGORY, DataSchema.SUBCATEGORY],
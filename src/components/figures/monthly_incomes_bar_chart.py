@@ -1,12 +1,16 @@
-from dash import callback, html, dcc, Output, Input, State
-import plotly.express as px
+from dash import callback, html, dcc, Output, Input
 import pandas as pd
 import i18n
 from plotly.graph_objs._figure import Figure
 
 from src.components import ids
+from src.components.figures import styles
+from src.data.cache import FRAMES, VersionToken
 from src.data.schema import DataSchema
 from src.data.source import DataSource
+from src.startup import lazy_import
+
+px = lazy_import("plotly.express")
 
 
 def render() -> html.Div:
@@ -16,16 +20,16 @@ def render() -> html.Div:
 @callback(
     Output(ids.HORIZONTAL_BAR_CHART, "children"),
     [
-        Input(ids.INCOMES_TABLE, "cellValueChanged"),
+        Input(ids.INCOMES_VERSION, "data"),
         Input(ids.MONTH_DROPDOWN, "value"),
         Input(ids.YEAR_DROPDOWN, "value"),
     ],
-    State(ids.INCOMES_TABLE, "rowData"),
 )
-def update_bar_chart(_, month: int, year: int, data: list[dict]) -> html.Div:
-    source = DataSource(data)
+def update_bar_chart(incomes: VersionToken, month: int, year: int) -> html.Div:
+    source = DataSource(FRAMES.cube_from_token(incomes))
     df: pd.DataFrame = source.month_income_by_category(month, year)
 
+    styles.load_template()
     fig: Figure = px.bar(
         df,
         x=DataSchema.CATEGORY,
@@ -1,3 +1,4 @@
+from functools import cache
 from plotly import graph_objects as go
 
 COLOR_DISCRETE_SEQUENCE: list[str] = [
@@ -14,6 +15,14 @@ COLOR_DISCRETE_SEQUENCE: list[str] = [
 ]
 
 
+@cache
+def load_template() -> None:
+    """Sets the plotly template of the app, before the first figure is built."""
+    from dash_bootstrap_templates import load_figure_template
+
+    load_figure_template("darkly")
+
+
 def standardize(fig: go.Figure) -> None:
     fig.update_xaxes(title_font=dict(size=18), tickfont=dict(size=16))
     fig.update_yaxes(title_font=dict(size=18), tickfont=dict(size=16))
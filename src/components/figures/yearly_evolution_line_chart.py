@@ -1,12 +1,16 @@
-from dash import html, dcc, Output, Input, State, callback
-import plotly.express as px
+from dash import html, dcc, Output, Input, callback
 import pandas as pd
 import i18n
 from plotly.graph_objs._figure import Figure
 
 from src.components import ids
+from src.components.figures import styles
+from src.data.cache import FRAMES, VersionToken
 from src.data.schema import DataSchema
 from src.data.source import DataSource
+from src.startup import lazy_import
+
+px = lazy_import("plotly.express")
 
 
 def render() -> html.Div:
@@ -16,24 +20,25 @@ def render() -> html.Div:
 @callback(
     Output(ids.YEARLY_EVOLUTION_LINE_CHART, "children"),
     [
-        Input(ids.EXPENSES_TABLE, "cellValueChanged"),
-        Input(ids.INCOMES_TABLE, "cellValueChanged"),
-    ],
-    [
-        State(ids.EXPENSES_TABLE, "rowData"),
-        State(ids.INCOMES_TABLE, "rowData"),
+        Input(ids.EXPENSES_VERSION, "data"),
+        Input(ids.INCOMES_VERSION, "data"),
     ],
 )
-def update_chart(_, __, expenses: list[dict], incomes: list[dict]) -> html.Div:
-    for e in expenses:
-        e[DataSchema.TYPE] = i18n.t("general.expenses")
-    for i in incomes:
-        i[DataSchema.TYPE] = i18n.t("general.incomes")
-
-    data: list[dict] = expenses + incomes
+def update_chart(expenses: VersionToken, incomes: VersionToken) -> html.Div:
+    data: pd.DataFrame = pd.concat(
+        [
+            FRAMES.cube_from_token(expenses).assign(
+                **{DataSchema.TYPE: i18n.t("general.expenses")}
+            ),
+            FRAMES.cube_from_token(incomes).assign(
+                **{DataSchema.TYPE: i18n.t("general.incomes")}
+            ),
+        ]
+    )
     source = DataSource(data)
     df: pd.DataFrame = source.yearly_evolution()
 
+    styles.load_template()
     fig: Figure = px.line(
         df,
         x=DataSchema.YEAR,
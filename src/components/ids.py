@@ -11,6 +11,8 @@ USER_HOUSEHOLD_BTN = "user-household-button"
 
 EXPENSES_TABLE = "expenses-table"
 INCOMES_TABLE = "incomes-table"
+EXPENSES_VERSION = "expenses-version"
+INCOMES_VERSION = "incomes-version"
 
 SAVE_BTN = "save-btn"
 CONFIRM_SAVE = "confirm-save"
@@ -42,12 +44,15 @@ BAR_CHART = "bar-chart"
 COLLAPSE_GRAPHS = "collapse-graphs"
 
 PREDICT_BTN = "predict-btn"
+PREDICT_PROGRESS = "predict-progress"
 DELETE_ROWS_BTN = "delete-rows-btn"
 
 BANK_ERROR_ALERT = "bank-error-alert"
 PREDICT_ERROR_ALERT = "prediction-error-alert"
 REMOVE_DATA_ERROR_ALERT = "remove-data-error-alert"
 INPUT_TABLE_ALERT = "input-table-error-alert"
+BANK_ERROR_FILES = "bank-error-files"
+INPUT_TABLE_ERROR_FILES = "input-table-error-files"
 
 YEAR_DROPDOWN_EVOLUTION = "years_dropdown-evolution"
 
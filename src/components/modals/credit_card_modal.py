@@ -36,6 +36,7 @@ def render() -> html.Div:
     Output(ids.EXPENSES_TABLE, "rowTransaction", allow_duplicate=True),
     Output(ids.INCOMES_TABLE, "rowTransaction", allow_duplicate=True),
     Output(ids.BANK_ERROR_ALERT, "is_open", allow_duplicate=True),
+    Output(ids.BANK_ERROR_FILES, "children", allow_duplicate=True),
     [
         Input(ids.OPEN_CCBILL_MODAL, "n_clicks"),
         Input(ids.CLOSE_CCBILL_MODAL, "n_clicks"),
@@ -45,11 +46,17 @@ def render() -> html.Div:
         State(ids.CCBILL_MODAL, "is_open"),
         State(ids.EXPENSES_TABLE, "rowData"),
         State(ids.INCOMES_TABLE, "rowData"),
+        *[State(option, "filename") for option in BANK_OPTIONS.values()],
     ],
     prevent_initial_call=True,
 )
-def toggle_modal_and_upload(*inputs) -> tuple[bool, Any, Any, bool]:
+def toggle_modal_and_upload(*inputs) -> tuple[bool, Any, Any, bool, Any]:
     triggered = ctx.triggered[0]
+    filenames = dict(zip(BANK_OPTIONS.keys(), inputs[-len(BANK_OPTIONS) :]))
     return toggle_and_upload(
-        triggered, inputs, list(BANK_OPTIONS.keys()), BANKS[ids.CCBILL_MODAL]
+        triggered,
+        inputs[: -len(BANK_OPTIONS)],
+        filenames,
+        list(BANK_OPTIONS.keys()),
+        BANKS[ids.CCBILL_MODAL],
     )
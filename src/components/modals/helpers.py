@@ -3,8 +3,8 @@ from dash import html, dcc, no_update
 import dash_bootstrap_components as dbc
 
 from src.data.raw.cleaner import Bank
-from src.data.raw.uploader import upload_bank_data
-from src.components.tables.uploader import upload_data
+from src.data.raw.uploader import UploadError, upload_bank_data
+from src.components.tables.uploader import upload_data, upload_failures
 
 
 def buttons_row(options: dict[str, str], upload: bool = False) -> html.Div:
@@ -37,17 +37,21 @@ def toggle_modal(inputs: tuple) -> bool:
 def toggle_and_upload(
     triggered: dict,
     inputs: tuple,
+    filenames: dict[str, list[str]],
     bank_options: list[str],
     bank_selector: dict[str, Bank],
-) -> tuple[bool, dict | Any, dict | Any, bool]:
-    """Toggle modal and uploads the data to the tables accordingly."""
+) -> tuple[bool, dict | Any, dict | Any, bool, list[html.Li] | Any]:
+    """
+    Toggle modal and uploads the data to the tables accordingly, listing the files that
+    could not be read.
+    """
 
     bank_name: str = triggered["prop_id"].split(".")[0].split("_")[0]
 
     is_open: bool = toggle_modal(inputs[:-2])
 
     if bank_name not in bank_options:
-        return is_open, no_update, no_update, False
+        return is_open, no_update, no_update, False, no_update
 
     uploaded_contents: list[str] = triggered["value"]
     bank: Bank = bank_selector[bank_name]
@@ -55,14 +59,23 @@ def toggle_and_upload(
     old_expenses: list[dict] = inputs[-2]
     old_incomes: list[dict] = inputs[-1]
 
+    failures: list[html.Li] = []
     try:
-        new_expenses, new_incomes = upload_bank_data(bank, uploaded_contents)
+        new_expenses, new_incomes = upload_bank_data(
+            bank, uploaded_contents, filenames[bank_name]
+        )
+    except UploadError as e:
+        failures = upload_failures(e.failures)
+        # the files that could be read are still uploaded
+        if e.expenses.empty and e.incomes.empty:
+            return False, no_update, no_update, True, failures
+        new_expenses, new_incomes = e.expenses, e.incomes
     except ValueError:
-        return False, no_update, no_update, True
+        return False, no_update, no_update, True, []
     add_exp: dict[str, Any] = upload_data(old_expenses, new_expenses)
     add_inc: dict[str, Any] = upload_data(old_incomes, new_incomes)
 
-    return is_open, add_exp, add_inc, False
+    return is_open, add_exp, add_inc, bool(failures), failures
 
 
 def footer(label: str, close_id: str) -> html.Div:
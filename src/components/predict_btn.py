@@ -1,64 +1,124 @@
+from functools import partial
+import os
 from typing import Any
-from dash import html, Output, Input, State, no_update, callback
+from dash import html, Output, Input, State, no_update
 import dash_bootstrap_components as dbc
 import i18n
 import pandas as pd
 
-from src.data.ml.predictor import predict_subcategories, separate_data
+from src.data.cache import FRAMES, VersionToken
+from src.data.journal import changed_rows
 from src.data.source import DataSource
 from src.data.raw.cleaner import Preprocessor, compose
 from src.data.categorize.finder import find_categories, find_recurrences
+from src.startup import lazy_import
+from .background import SetProgress, background_callback
+from .tables.journal import PREVIEW
 from . import ids
 
+predictor = lazy_import("src.data.ml.predictor")
+
+HIDDEN: dict[str, str] = {"visibility": "hidden"}
+VISIBLE: dict[str, str] = {"visibility": "visible"}
+
+
+def predict_batch_size() -> int:
+    """The number of expenses categorized at a time, set by the PREDICT_BATCH_SIZE env var."""
+    return int(os.getenv("PREDICT_BATCH_SIZE") or 500)
+
 
 def render() -> html.Div:
     return html.Div(
-        dbc.Button(
-            [html.I(className="bi bi-star"), i18n.t("general.predict")],
-            id=ids.PREDICT_BTN,
-            class_name="main_buttons",
-        )
+        [
+            dbc.Button(
+                [html.I(className="bi bi-star"), i18n.t("general.predict")],
+                id=ids.PREDICT_BTN,
+                class_name="main_buttons",
+            ),
+            dbc.Progress(
+                id=ids.PREDICT_PROGRESS,
+                value=0,
+                striped=True,
+                animated=True,
+                style=HIDDEN,
+            ),
+        ]
     )
 
 
-@callback(
-    Output(ids.EXPENSES_TABLE, "rowData", allow_duplicate=True),
+@background_callback(
+    Output(ids.EXPENSES_TABLE, "rowTransaction", allow_duplicate=True),
     Output(ids.PREDICT_ERROR_ALERT, "is_open"),
     Input(ids.PREDICT_BTN, "n_clicks"),
-    State(ids.EXPENSES_TABLE, "rowData"),
+    State(ids.EXPENSES_VERSION, "data"),
+    progress=[
+        Output(ids.PREDICT_PROGRESS, "value"),
+        Output(ids.PREDICT_PROGRESS, "max"),
+        Output(ids.EXPENSES_TABLE, "rowTransaction"),
+    ],
+    running=[
+        (Output(ids.PREDICT_BTN, "disabled"), True, False),
+        (Output(ids.PREDICT_PROGRESS, "style"), VISIBLE, HIDDEN),
+    ],
     prevent_initial_call=True,
 )
-def on_click(_, expenses: list[dict]) -> tuple[list[dict] | Any, bool]:
+def on_click(
+    set_progress: SetProgress, _, expenses: VersionToken
+) -> tuple[dict | Any, bool]:
     """
-    A callback function that processes expenses data when the predict button is clicked.
+    A callback function that categorizes the uncategorized expenses when the predict button is
+    clicked.
+
+    It runs as a background job (see background.py) categorizing the expenses in batches. After
+    each batch, it reports its progress and previews the categorized rows in the expenses
+    grid. The previews are not journaled: the final transaction updating every categorized row
+    is, as any other edit of the grid.
+
+    The transactions only hold the rows whose values the prediction changed, in the order of
+    the table, so their size and the cost of applying them scale with the work done.
 
     Parameters:
+        set_progress (SetProgress): Reports the progress of the job.
         _: Placeholder for the button click that triggers the callback.
-        expenses (list[dict]): The list of expenses data to process.
+        expenses (VersionToken): The version of the cached expenses data to process.
 
     Returns:
-        tuple[list[dict] | Any, bool]: A tuple containing the updated expenses data and a flag
-        indicating if an error alert should be shown.
+        tuple[dict | Any, bool]: A tuple containing the rowTransaction updating the categorized
+        expenses and a flag indicating if an error alert should be shown.
 
     If there is no data to be categorized, the function returns `no_update` and `True` to
     indicate that an error alert should be shown.
     """
-    source_expenses = DataSource(expenses)
+    source_expenses = DataSource(FRAMES.from_token(expenses))
     if source_expenses.is_empty:
         return no_update, True
 
-    categorized_df, uncategorized_df = separate_data(source_expenses.dataframe)
+    categorized_df, uncategorized_df = predictor.separate_data(
+        source_expenses.dataframe
+    )
 
     if uncategorized_df.empty:
         return no_update, True
 
     categorizer: Preprocessor = compose(
-        predict_subcategories,
+        partial(
+            predictor.predict_subcategories,
+            merchant_index=predictor.build_merchant_index(categorized_df),
+        ),
         find_categories,
         find_recurrences,
     )
-    newly_categorized_df: pd.DataFrame = categorizer(uncategorized_df)
-
-    df: pd.DataFrame = pd.concat([newly_categorized_df, categorized_df])
+    total: int = len(uncategorized_df)
+    batch_size: int = predict_batch_size()
+    predicted_rows: list[dict] = []
+    for start in range(0, total, batch_size):
+        batch: pd.DataFrame = uncategorized_df.iloc[start : start + batch_size]
+        rows: list[dict] = changed_rows(batch, categorizer(batch.copy())).to_dict(
+            "records"
+        )
+        predicted_rows += rows
+        set_progress((start + len(batch), total, {"update": rows, PREVIEW: True}))
 
-    return df.to_dict("records"), False
+    if not predicted_rows:
+        return no_update, False
+    return {"update": predicted_rows}, False
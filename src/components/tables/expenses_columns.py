@@ -23,6 +23,7 @@ def set_columns() -> list[Column]:
             - recurrent: A dropdown column representing whether the expense is recurrent.
             - category: A dropdown column representing the category of the expense.
             - subcategory: A dropdown column representing the subcategory of the expense.
+            - confidence: A number column with the probability of a predicted subcategory.
             - bank: A column representing the bank of the expense.
             - description: A column representing the description of the expense.
     """
@@ -63,6 +64,13 @@ def set_columns() -> list[Column]:
     subcategory["width"] = 200
     subcategory["minWidth"] = 200
 
+    confidence: Column = set_number_column(DataSchema.CONFIDENCE)
+    confidence["valueFormatter"] = {
+        "function": "params.value == null ? '' : d3.format('.0%')(params.value)"
+    }
+    confidence["width"] = 130
+    confidence["minWidth"] = 130
+
     bank: Column = set_column(DataSchema.BANK)
     bank["width"] = 130
     bank["minWidth"] = 130
@@ -71,7 +79,17 @@ def set_columns() -> list[Column]:
     description["editable"] = True
     description["minWidth"] = 500
 
-    return [year, month, amount, recurrent, category, subcategory, bank, description]
+    return [
+        year,
+        month,
+        amount,
+        recurrent,
+        category,
+        subcategory,
+        confidence,
+        bank,
+        description,
+    ]
 
 
 def categories_according_to_locale() -> dict[str, list[str]]:
@@ -0,0 +1,85 @@
+"""Journals the edits made to the Dash AgGrids and versions the cached table data."""
+
+from typing import Any
+from dash import html, dcc, callback, ctx, Output, Input, State, no_update
+
+from src.data.cache import FRAMES, VersionToken, record_operations
+from src.data.journal import (
+    Operation,
+    cell_changes_to_operations,
+    transaction_to_operations,
+)
+from .. import ids
+
+# rowTransactions only shown in the grid, whose rows a later transaction journals
+PREVIEW = "preview"
+
+
+def render(user_name: str) -> html.Div:
+    return html.Div(
+        [
+            dcc.Store(
+                id=ids.EXPENSES_VERSION, data=FRAMES.token(user_name, "expenses")
+            ),
+            dcc.Store(id=ids.INCOMES_VERSION, data=FRAMES.token(user_name, "incomes")),
+        ]
+    )
+
+
+def record(
+    token: VersionToken, transaction: dict | None, changes: list[dict] | None
+) -> VersionToken | Any:
+    """
+    Journals the triggering rowTransaction or cellValueChanged event and applies it to the
+    cached table data.
+
+    Returns:
+        VersionToken | Any: The new version of the table data, or `no_update` if there was
+        nothing to record (e.g. the grid resetting rowTransaction after applying it, or a
+        preview).
+    """
+    triggered: str = ctx.triggered[0]["prop_id"]
+    operations: list[Operation] = []
+    cell_changes: list[dict] | None = None
+    if (
+        triggered.endswith(".rowTransaction")
+        and transaction
+        and not transaction.get(PREVIEW)
+    ):
+        operations = transaction_to_operations(transaction)
+    elif triggered.endswith(".cellValueChanged") and changes:
+        operations = cell_changes_to_operations(changes)
+        # the old/new values let the chart totals be updated without regrouping
+        cell_changes = changes
+
+    if not operations or not token:
+        return no_update
+    return record_operations(
+        str(token["user"]), str(token["kind"]), operations, cell_changes
+    )
+
+
+@callback(
+    Output(ids.EXPENSES_VERSION, "data"),
+    Input(ids.EXPENSES_TABLE, "rowTransaction"),
+    Input(ids.EXPENSES_TABLE, "cellValueChanged"),
+    State(ids.EXPENSES_VERSION, "data"),
+    prevent_initial_call=True,
+)
+def record_expenses(
+    transaction: dict | None, changes: list[dict] | None, token: VersionToken
+) -> VersionToken | Any:
+    return record(token, transaction, changes)
+
+
+@callback(
+    Output(ids.INCOMES_VERSION, "data"),
+    Input(ids.INCOMES_TABLE, "rowTransaction"),
+    Input(ids.INCOMES_TABLE, "cellValueChanged"),
+    State(ids.INCOMES_VERSION, "data"),
+    prevent_initial_call=True,
+)
+def record_incomes(
+    transaction: dict | None, changes: list[dict] | None, token: VersionToken
+) -> VersionToken | Any:
+    return record(token, transaction, changes)
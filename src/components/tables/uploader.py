@@ -1,6 +1,7 @@
 """Uploads the data to the Dash AgGrids."""
 
 from typing import Any
+from dash import html
 import pandas as pd
 
 
@@ -37,3 +38,8 @@ def upload_data(old_data: list[dict], new_df: pd.DataFrame) -> dict[str, Any]:
     new_df["id"] = range(old_data_id, old_data_id + len(new_df))
 
     return {"add": new_df.to_dict("records"), "addIndex": 0}
+
+
+def upload_failures(failures: dict[str, str]) -> list[html.Li]:
+    """Lists the uploaded files that could not be read, with their error."""
+    return [html.Li(f"{name}: {error}") for name, error in failures.items()]
@@ -2,7 +2,7 @@ from dash import html
 import dash_bootstrap_components as dbc
 import i18n
 
-from .tables import expenses_aggrid, incomes_aggrid
+from .tables import expenses_aggrid, incomes_aggrid, journal
 from .alerts import (
     input_table_alert,
     bank_error_alert,
@@ -13,7 +13,7 @@ from . import confirm_dialog, predict_btn, remove_rows_btn, save_btn
 from .dropdowns.menus import upload_dd_menu
 
 
-def render(expenses: list[dict], incomes: list[dict]) -> dbc.Container:
+def render(user_name: str, expenses: list[dict], incomes: list[dict]) -> dbc.Container:
     return dbc.Container(
         [
             input_table_alert.render(),
@@ -21,6 +21,7 @@ def render(expenses: list[dict], incomes: list[dict]) -> dbc.Container:
             prediction_alert.render(),
             remove_rows_alert.render(),
             confirm_dialog.render(),
+            journal.render(user_name),
             dbc.Row(
                 [
                     dbc.Col(upload_dd_menu.render(), width="auto"),
@@ -1,12 +1,16 @@
 import dash_mantine_components as dmc
 import i18n
 
+from src.data.cache import FRAMES
 from . import dashboard_tab
 
 from ..components import tables_tab
 
 
 def render(user) -> dmc.Tabs:
+    # the cached frames already hold the edits made since the profile was loaded
+    expenses = FRAMES.get_or_put(user.name, "expenses", user.expenses)
+    incomes = FRAMES.get_or_put(user.name, "incomes", user.incomes)
     return dmc.Tabs(
         [
             dmc.TabsList(
@@ -25,7 +29,7 @@ def render(user) -> dmc.Tabs:
             ),
             dmc.TabsPanel(
                 tables_tab.render(
-                    user.expenses.to_dict("records"), user.incomes.to_dict("records")
+                    user.name, expenses.to_dict("records"), incomes.to_dict("records")
                 ),
                 value="tables",
             ),
@@ -0,0 +1,182 @@
+"""Server-side cache of the DataFrames shown in the tables, keyed by a version token."""
+
+import threading
+from typing import Callable
+from dash.exceptions import PreventUpdate
+import pandas as pd
+
+from src.data.cube import MonthlyCube
+from src.data.journal import Operation, apply_operations
+from src.data.ledger import with_ledger_dtypes
+from src.data.user import load_user_data, user_journal
+
+# {"user": "Lucas", "kind": "expenses", "version": 3}
+VersionToken = dict[str, str | int]
+
+
+class FrameCache:
+    """
+    Holds the current expenses and incomes DataFrames of each active user.
+
+    Every change bumps the version of the (user, kind) entry. Callbacks receive that small
+    version token instead of the full table rowData, and fetch the already parsed frame from
+    here. The cached frames are shared, so callers must treat them as read-only.
+
+    A token older than the cached version is not served: the callbacks of the newer version
+    are already on their way. A newer token comes from another server process, or from before
+    a restart, and the frame is then reloaded from the ledger and its journal, which every
+    version was written to.
+
+    Alongside each frame it keeps the monthly cube the charts aggregate, built on first use
+    and then updated with the rows each table operation touches.
+
+    `on_read` is called with every frame the callbacks fetch from a token, e.g. to measure
+    them (see metrics.py).
+    """
+
+    def __init__(self) -> None:
+        self._frames: dict[tuple[str, str], pd.DataFrame] = {}
+        self._cubes: dict[tuple[str, str], MonthlyCube] = {}
+        self._versions: dict[tuple[str, str], int] = {}
+        self._lock = threading.RLock()
+        self.on_read: Callable[[pd.DataFrame], None] | None = None
+
+    def token(self, user: str, kind: str) -> VersionToken:
+        return {
+            "user": user,
+            "kind": kind,
+            "version": self._versions.get((user, kind), 0),
+        }
+
+    def get_or_put(self, user: str, kind: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Returns the cached frame, caching the given one if there is none yet."""
+        with self._lock:
+            return self._frames.setdefault((user, kind), with_ledger_dtypes(df))
+
+    def get(self, user: str, kind: str) -> pd.DataFrame:
+        """Returns the cached frame, loading it from disk if it is not cached."""
+        with self._lock:
+            if (user, kind) not in self._frames:
+                self._frames[(user, kind)] = load_user_data(user, kind)
+            return self._frames[(user, kind)]
+
+    def sync(self, token: VersionToken) -> tuple[str, str]:
+        """
+        Brings the cached frame to the token's version, returning its (user, kind).
+
+        Raises:
+            PreventUpdate: If the token is older than the cached frame.
+        """
+        user, kind, version = (
+            str(token["user"]),
+            str(token["kind"]),
+            int(token["version"]),
+        )
+        with self._lock:
+            cached: int = self._versions.get((user, kind), 0)
+            if version < cached:
+                raise PreventUpdate
+            if version > cached:
+                self._frames[(user, kind)] = load_user_data(user, kind)
+                self._cubes.pop((user, kind), None)
+                self._versions[(user, kind)] = version
+        return user, kind
+
+    def from_token(self, token: VersionToken | None) -> pd.DataFrame:
+        if not token:
+            return pd.DataFrame()
+        return self.observe(self.get(*self.sync(token)))
+
+    def cube(self, user: str, kind: str) -> MonthlyCube:
+        with self._lock:
+            if (user, kind) not in self._cubes:
+                self._cubes[(user, kind)] = MonthlyCube.from_frame(self.get(user, kind))
+            return self._cubes[(user, kind)]
+
+    def cube_from_token(self, token: VersionToken | None) -> pd.DataFrame:
+        """The monthly cube of the token's table, as a DataFrame."""
+        if not token:
+            return pd.DataFrame()
+        return self.observe(self.cube(*self.sync(token)).frame)
+
+    def observe(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.on_read is not None:
+            self.on_read(df)
+        return df
+
+    def put(self, user: str, kind: str, df: pd.DataFrame) -> VersionToken:
+        with self._lock:
+            self._frames[(user, kind)] = with_ledger_dtypes(df)
+            self._cubes.pop((user, kind), None)
+            self._versions[(user, kind)] = self._versions.get((user, kind), 0) + 1
+        return self.token(user, kind)
+
+    def apply(
+        self,
+        user: str,
+        kind: str,
+        operations: list[Operation],
+        changes: list[dict] | None = None,
+    ) -> VersionToken:
+        """
+        Applies row-level table operations to the cached frame and its cube.
+
+        Args:
+            user (str): The user name.
+            kind (str): "expenses" or "incomes".
+            operations (list[Operation]): The row-level operations.
+            changes (list[dict] | None, optional): The AgGrid cellValueChanged events the
+                operations came from. When given, the cube is updated from their old and new
+                values alone.
+        """
+        with self._lock:
+            old_df: pd.DataFrame = self.get(user, kind)
+            df: pd.DataFrame = apply_operations(old_df, operations)
+            cube: MonthlyCube | None = self._cubes.get((user, kind))
+            token: VersionToken = self.put(user, kind, df)
+            if cube is None:
+                return token
+            if changes is not None and single_cell_changes(changes):
+                if all(
+                    cube.apply_cell_change(
+                        change["data"],
+                        change["colId"],
+                        change.get("oldValue"),
+                        change.get("newValue"),
+                    )
+                    for change in changes
+                ):
+                    self._cubes[(user, kind)] = cube
+                return token
+            ids: list[int] = [operation["row"]["id"] for operation in operations]
+            if not old_df.empty:
+                cube.remove(old_df.loc[old_df["id"].isin(ids)])
+            if not df.empty:
+                cube.add(df.loc[df["id"].isin(ids)])
+            self._cubes[(user, kind)] = cube
+            return token
+
+
+def single_cell_changes(changes: list[dict]) -> bool:
+    """
+    Whether every event edits a different row, so that each one can be applied as a delta.
+
+    The row data of an event holds the row after all the edits of the batch, so several edits
+    of the same row cannot be told apart.
+    """
+    row_ids: list = [change["data"]["id"] for change in changes]
+    return len(set(row_ids)) == len(row_ids)
+
+
+FRAMES = FrameCache()
+
+
+def record_operations(
+    user: str,
+    kind: str,
+    operations: list[Operation],
+    changes: list[dict] | None = None,
+) -> VersionToken:
+    """Journals the table operations and applies them to the cached frame."""
+    user_journal(user, kind).append(operations)
+    return FRAMES.apply(user, kind, operations, changes)
@@ -7,56 +7,81 @@ import i18n
 from .expenses_categories import CATEGORIES, RECURRENT_SUBCATEGORIES
 from ..schema import DataSchema
 
-PATH: Path = Path.cwd() / "locale" / "subcategory.pt.yml"
+LOCALE_PATH: Path = Path.cwd() / "locale"
+
+
+def current_locale() -> str:
+    return i18n.get("locale")  # type: ignore
 
 
 @functools.lru_cache
-def set_subcategories_from_yaml() -> dict[str, str]:
+def set_subcategories_from_yaml(locale: str = "pt") -> dict[str, str]:
     """
     A function to set subcategories from a YAML file and return them as a dictionary.
     """
-    with open(PATH, "r", encoding="utf-8") as f:
+    with open(LOCALE_PATH / f"subcategory.{locale}.yml", "r", encoding="utf-8") as f:
         subcategories_yaml: dict[str, dict[str, str]] = yaml.safe_load(f)
-    subcategories_pt: dict[str, str] = subcategories_yaml["pt"]
-    return {v: k for k, v in subcategories_pt.items()}
+    subcategories: dict[str, str] = subcategories_yaml[locale]
+    return {v: k for k, v in subcategories.items()}
 
 
 @functools.lru_cache
-def get_subcategory(subcategory_label: str) -> str | None:
-    subcategories: dict[str, str] = set_subcategories_from_yaml()
-
-    return subcategories.get(subcategory_label)
+def category_table(locale: str) -> dict[str, str]:
+    """Maps each subcategory label of the locale to its translated category."""
+    category_of: dict[str, str] = {
+        subcategory: category
+        for category, subcategories in CATEGORIES.items()
+        for subcategory in subcategories
+    }
+    return {
+        label: i18n.t(f"category.{category_of[subcategory]}", locale=locale)
+        for label, subcategory in set_subcategories_from_yaml(locale).items()
+        if subcategory in category_of
+    }
 
 
 @functools.lru_cache
+def recurrence_table(locale: str) -> dict[str, str]:
+    """Maps each subcategory label of the locale to its translated recurrence."""
+    recurrent: str = i18n.t("general.recurrent_yes", locale=locale)
+    not_recurrent: str = i18n.t("general.recurrent_no", locale=locale)
+    return {
+        label: recurrent if subcategory in RECURRENT_SUBCATEGORIES else not_recurrent
+        for label, subcategory in set_subcategories_from_yaml(locale).items()
+    }
+
+
+def get_subcategory(subcategory_label: str) -> str | None:
+    return set_subcategories_from_yaml(current_locale()).get(subcategory_label)
+
+
 def find_category(subcategory_label: str) -> str | None:
-    subcategory: str | None = get_subcategory(subcategory_label)
+    return category_table(current_locale()).get(subcategory_label)
 
-    if not subcategory:
-        return None
 
-    category: str = list(
-        filter(lambda c: subcategory in CATEGORIES[c], CATEGORIES.keys())
-    )[0]
-    return i18n.t(f"category.{category}")
+def map_categories(subcategories: pd.Series) -> pd.Series:
+    """The translated categories of the subcategory labels, NaN for unknown labels."""
+    return subcategories.map(category_table(current_locale()))
 
 
 def find_categories(df: pd.DataFrame) -> pd.DataFrame:
-    df.loc[:, DataSchema.CATEGORY] = df[DataSchema.SUBCATEGORY].apply(find_category)
+    df.loc[:, DataSchema.CATEGORY] = map_categories(df[DataSchema.SUBCATEGORY])
     return df
 
 
-@functools.lru_cache
 def find_recurrency(subcategory_label: str) -> str:
-    is_recurrent: str = "no"
-
-    subcategory: str | None = get_subcategory(subcategory_label)
-
-    if subcategory in RECURRENT_SUBCATEGORIES:
-        is_recurrent: str = "yes"
-    return i18n.t(f"general.recurrent_{is_recurrent}")
+    return recurrence_table(current_locale()).get(
+        subcategory_label, i18n.t("general.recurrent_no")
+    )
 
 
 def find_recurrences(df: pd.DataFrame) -> pd.DataFrame:
-    df.loc[:, DataSchema.RECURRENT] = df[DataSchema.SUBCATEGORY].apply(find_recurrency)
+    recurrences: pd.Series = (
+        df[DataSchema.SUBCATEGORY]
+        .map(recurrence_table(current_locale()))
+        .astype(object)
+    )
+    df.loc[:, DataSchema.RECURRENT] = recurrences.where(
+        recurrences.notna(), i18n.t("general.recurrent_no")
+    )
     return df
@@ -0,0 +1,164 @@
+"""
+Locale-independent integer codes of the categorical columns of the ledger.
+
+Each ledger keeps a code table per column, mapping every code to an entry: the translation
+key of the value (e.g. "subcategory.groceries"), or the value itself when it has none (e.g. a
+bank name). Only the codes are stored in the partitions, and they are translated to the labels
+of the current locale when the ledger is loaded, so switching the locale does not rewrite any
+data. The tables only ever grow, so the codes of the rows already stored never change.
+"""
+
+import functools
+import json
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import yaml
+
+from .categorize.expenses_categories import CATEGORIES
+from .categorize.incomes_categories import INC_CATEGORIES
+from .categorize.finder import LOCALE_PATH, current_locale
+from .schema import DataSchema
+
+CODED_COLUMNS: tuple[str, ...] = (
+    DataSchema.CATEGORY,
+    DataSchema.SUBCATEGORY,
+    DataSchema.RECURRENT,
+    DataSchema.BANK,
+)
+CODE_DTYPE = "int16"
+MISSING = -1
+
+CodeTables = dict[str, list[str]]
+
+# the translation keys each column may hold, by locale file
+NAMESPACES: dict[str, tuple[str, ...]] = {
+    DataSchema.CATEGORY: ("category", "inc_category"),
+    DataSchema.SUBCATEGORY: ("subcategory",),
+    DataSchema.RECURRENT: ("general",),
+    DataSchema.BANK: (),
+}
+RECURRENT_KEYS: tuple[str, ...] = ("general.recurrent_no", "general.recurrent_yes")
+
+
+def initial_code_tables() -> CodeTables:
+    """The code tables of a new ledger, so that known values get the same codes everywhere."""
+    return {
+        DataSchema.CATEGORY: [f"category.{c}" for c in CATEGORIES]
+        + [f"inc_category.{c}" for c in INC_CATEGORIES],
+        DataSchema.SUBCATEGORY: [
+            f"subcategory.{s}" for subs in CATEGORIES.values() for s in subs
+        ],
+        DataSchema.RECURRENT: list(RECURRENT_KEYS),
+        DataSchema.BANK: [],
+    }
+
+
+@functools.lru_cache
+def locale_file(namespace: str, locale: str) -> dict[str, str]:
+    path: Path = LOCALE_PATH / f"{namespace}.{locale}.yml"
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        # labels like Yes/No are strings, not booleans
+        return yaml.load(f, Loader=yaml.BaseLoader)[locale]
+
+
+@functools.lru_cache
+def available_locales() -> tuple[str, ...]:
+    return tuple(sorted({path.suffixes[0][1:] for path in LOCALE_PATH.glob("*.*.yml")}))
+
+
+@functools.lru_cache
+def labels(column: str, locale: str) -> dict[str, str]:
+    """Maps the translation keys of the column to their labels in the locale."""
+    translated: dict[str, str] = {
+        f"{namespace}.{name}": label
+        for namespace in NAMESPACES[column]
+        for name, label in locale_file(namespace, locale).items()
+    }
+    if column == DataSchema.RECURRENT:
+        return {key: translated.get(key, key) for key in RECURRENT_KEYS}
+    return translated
+
+
+@functools.lru_cache
+def keys(column: str, locale: str) -> dict[str, str]:
+    """Maps the labels of the column, in any locale, to their translation keys."""
+    found: dict[str, str] = {}
+    for other in (*available_locales(), locale):  # the given locale wins
+        found.update({label: key for key, label in labels(column, other).items()})
+    return found
+
+
+def encode_column(values: pd.Series, table: list[str]) -> np.ndarray:
+    """
+    The codes of the values, adding the new entries to the code table.
+
+    Returns:
+        np.ndarray: The codes, MISSING where the values are NaN.
+    """
+    codes, uniques = pd.factorize(values.astype(object))
+    by_label: dict[str, str] = keys(values.name, current_locale())
+    positions: dict[str, int] = {entry: i for i, entry in enumerate(table)}
+    unique_codes: list[int] = []
+    for label in uniques:
+        entry: str = by_label.get(str(label), str(label))
+        if entry not in positions:
+            positions[entry] = len(table)
+            table.append(entry)
+        unique_codes.append(positions[entry])
+    return np.append(unique_codes, MISSING).astype(CODE_DTYPE)[codes]
+
+
+def decode_column(codes: pd.Series, table: list[str]) -> pd.Categorical:
+    """The labels of the codes in the current locale, only translating the code table."""
+    by_key: dict[str, str] = labels(str(codes.name), current_locale())
+    entry_labels = np.array([by_key.get(entry, entry) for entry in table], dtype=object)
+    # different entries may have the same label, e.g. a value and its translation key
+    label_codes, categories = pd.factorize(entry_labels)
+    remap: np.ndarray = np.append(label_codes, MISSING)
+    return pd.Categorical.from_codes(
+        remap[codes.to_numpy()], categories=categories
+    ).remove_unused_categories()
+
+
+def is_encoded(df: pd.DataFrame) -> bool:
+    """Whether the coded columns of the DataFrame hold codes rather than labels."""
+    return all(
+        pd.api.types.is_integer_dtype(df[column])
+        for column in CODED_COLUMNS
+        if column in df.columns
+    )
+
+
+def encode(df: pd.DataFrame, tables: CodeTables) -> pd.DataFrame:
+    df = df.copy()
+    for column in CODED_COLUMNS:
+        if column in df.columns:
+            df[column] = encode_column(df[column], tables.setdefault(column, []))
+    return df
+
+
+def decode(df: pd.DataFrame, tables: CodeTables) -> pd.DataFrame:
+    df = df.copy()
+    for column in CODED_COLUMNS:
+        if column in df.columns:
+            df[column] = decode_column(df[column], tables.get(column, []))
+    return df
+
+
+def read_code_tables(path: Path) -> CodeTables:
+    if not path.exists():
+        return initial_code_tables()
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_code_tables(path: Path, tables: CodeTables) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path: Path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(tables, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
@@ -0,0 +1,124 @@
+"""Pre-aggregated monthly amounts shared by the dashboard charts."""
+
+from typing import Any
+import pandas as pd
+
+from src.data.schema import DataSchema
+
+CUBE_DIMENSIONS: list[str] = [
+    DataSchema.YEAR,
+    DataSchema.MONTH,
+    DataSchema.CATEGORY,
+    DataSchema.SUBCATEGORY,
+    DataSchema.RECURRENT,
+    DataSchema.BANK,
+]
+COUNT = "count"
+
+Cell = tuple  # one value per CUBE_DIMENSIONS entry
+
+
+class MonthlyCube:
+    """
+    Total amount (and number of rows) per (year, month, category, subcategory, recurrent,
+    bank) of one user's expenses or incomes.
+
+    Sums are additive, so every chart aggregation gives the same result over the cube as over
+    the raw rows, while the cube has at most one row per month and label combination. Added,
+    edited and removed rows are applied as deltas instead of regrouping the whole ledger.
+    """
+
+    def __init__(self) -> None:
+        self._cells: dict[Cell, list[float]] = {}
+        self._frame: pd.DataFrame | None = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "MonthlyCube":
+        cube = cls()
+        cube.add(df)
+        return cube
+
+    def add(self, rows: pd.DataFrame, sign: int = 1) -> None:
+        """Adds (or, with sign=-1, subtracts) the amounts of the given rows."""
+        if rows.empty:
+            return
+        rows = rows.reindex(columns=CUBE_DIMENSIONS + [DataSchema.AMOUNT])
+        grouped: pd.DataFrame = rows.groupby(
+            CUBE_DIMENSIONS, dropna=False, observed=True
+        )[DataSchema.AMOUNT].agg(["sum", "size"])
+        for key, (amount, count) in zip(grouped.index, grouped.to_numpy()):
+            cell: Cell = tuple(_label(value) for value in key)
+            totals: list[float] = self._cells.setdefault(cell, [0.0, 0])
+            totals[0] += sign * amount
+            totals[1] += sign * count
+            if totals[1] <= 0:
+                del self._cells[cell]
+        self._frame = None
+
+    def remove(self, rows: pd.DataFrame) -> None:
+        self.add(rows, sign=-1)
+
+    def apply_cell_change(
+        self, row: dict, column: str, old_value: Any, new_value: Any
+    ) -> bool:
+        """
+        Applies one edited AgGrid cell as a delta on the totals, without regrouping any rows.
+
+        Args:
+            row (dict): The edited row, already holding the new value.
+            column (str): The edited column.
+            old_value (Any): The value of the cell before the edit.
+            new_value (Any): The value of the cell after the edit.
+
+        Returns:
+            bool: False if the row's previous cell is not in the cube, i.e. the cube is out of
+            sync with the row and must be rebuilt.
+        """
+        if column == DataSchema.AMOUNT:
+            totals: list[float] | None = self._cells.get(cell_of(row))
+            if totals is None:
+                return False
+            totals[0] += to_amount(new_value) - to_amount(old_value)
+        elif column in CUBE_DIMENSIONS:
+            old_cell: Cell = cell_of({**row, column: old_value})
+            old_totals: list[float] | None = self._cells.get(old_cell)
+            if old_totals is None:
+                return False
+            amount: float = to_amount(row.get(DataSchema.AMOUNT))
+            old_totals[0] -= amount
+            old_totals[1] -= 1
+            if old_totals[1] <= 0:
+                del self._cells[old_cell]
+            new_totals: list[float] = self._cells.setdefault(cell_of(row), [0.0, 0])
+            new_totals[0] += amount
+            new_totals[1] += 1
+        else:
+            return True
+        self._frame = None
+        return True
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """The cube as a DataFrame with the dimensions, amount and count columns."""
+        if self._frame is None:
+            self._frame = pd.DataFrame(
+                [cell + tuple(totals) for cell, totals in self._cells.items()],
+                columns=CUBE_DIMENSIONS + [DataSchema.AMOUNT, COUNT],
+            ).sort_values(
+                by=[DataSchema.YEAR, DataSchema.MONTH],
+                ascending=False,
+                ignore_index=True,
+            )
+        return self._frame
+
+
+def cell_of(row: dict) -> Cell:
+    return tuple(_label(row.get(dimension)) for dimension in CUBE_DIMENSIONS)
+
+
+def to_amount(value: Any) -> float:
+    return 0.0 if _label(value) is None else float(value)
+
+
+def _label(value: Any) -> Any:
+    return None if pd.isna(value) else value
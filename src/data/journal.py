@@ -0,0 +1,234 @@
+"""Append-only journal of row-level edits made to the expenses and incomes tables."""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable
+import numpy as np
+import pandas as pd
+
+from src.data.ledger import LEDGER_DTYPES, Ledger, Partition
+from src.data.schema import DataSchema
+
+Operation = dict  # {"op": "add" | "update" | "remove", "row": {...}}
+CompactionHook = Callable[[Ledger, list[Operation]], object]
+
+TRANSACTION_OPERATIONS: tuple[str, ...] = ("add", "update", "remove")
+
+_LOCK = threading.Lock()
+COMPACTION_LOCK = threading.Lock()
+
+
+class Journal:
+    """
+    Append-only log of table edits, keyed by the AgGrid row id.
+
+    Edits are appended (and flushed to disk) as they happen, so nothing is lost between
+    saves. Compaction seals the current log and folds it into the base ledger.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = path
+
+    @property
+    def sealed_path(self) -> Path:
+        return self.path.with_suffix(".compacting")
+
+    def append(self, operations: list[Operation]) -> None:
+        if not operations:
+            return
+        lines: str = "".join(json.dumps(op, default=str) + "\n" for op in operations)
+        with _LOCK:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def read(self) -> list[Operation]:
+        """Operations not yet folded into the ledger, in the order they were made."""
+        return read_operations(self.sealed_path) + read_operations(self.path)
+
+    def seal(self) -> None:
+        """Moves the current log to the segment that is being compacted."""
+        with _LOCK:
+            if not self.path.exists():
+                return
+            if not self.sealed_path.exists():
+                self.path.replace(self.sealed_path)
+                return
+            with open(self.sealed_path, "a", encoding="utf-8") as f:
+                f.write(self.path.read_text(encoding="utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+            self.path.unlink()
+
+    def read_sealed(self) -> list[Operation]:
+        return read_operations(self.sealed_path)
+
+    def discard_sealed(self) -> None:
+        self.sealed_path.unlink(missing_ok=True)
+
+
+def read_operations(path: Path) -> list[Operation]:
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        # a crash while appending can leave a truncated last line behind
+        return [json.loads(line) for line in f if line.endswith("\n")]
+
+
+def transaction_to_operations(transaction: dict) -> list[Operation]:
+    """Converts an AgGrid rowTransaction into journal operations."""
+    return [
+        {"op": op, "row": row}
+        for op in TRANSACTION_OPERATIONS
+        for row in transaction.get(op) or []
+    ]
+
+
+def cell_changes_to_operations(changes: list[dict]) -> list[Operation]:
+    """
+    Converts AgGrid cellValueChanged events into journal operations.
+
+    A subcategory set by hand is confirmed by the user, so it drops the confidence of the
+    model's prediction.
+    """
+    operations: list[Operation] = []
+    for change in changes:
+        row: dict = change["data"]
+        if change.get("colId") == DataSchema.SUBCATEGORY:
+            row = {**row, DataSchema.CONFIDENCE: None}
+        operations.append({"op": "update", "row": row})
+    return operations
+
+
+def apply_operations(df: pd.DataFrame, operations: list[Operation]) -> pd.DataFrame:
+    """
+    Replays the journal operations on top of the given rows.
+
+    Only the last operation of each row id matters, so every row is touched once no matter
+    how many times it was edited. Updated rows keep their position, and added rows come
+    first.
+    """
+    latest: dict[int, dict | None] = {}
+    for operation in operations:
+        row: dict = operation["row"]
+        latest[row["id"]] = None if operation["op"] == "remove" else row
+
+    if not latest:
+        return df
+
+    kept: pd.DataFrame = df
+    if not df.empty:
+        kept = df.loc[~df["id"].isin(latest.keys())]
+
+    rows: list[dict] = [row for row in latest.values() if row is not None]
+    changed = pd.DataFrame.from_records(rows)
+    frames: list[pd.DataFrame] = [f for f in [changed, kept] if not f.empty]
+    if not frames:
+        return pd.DataFrame()
+
+    result: pd.DataFrame = pd.concat(frames, ignore_index=True)
+    if not df.empty:
+        # added rows are not in the given ones (-1), so they come first
+        positions: np.ndarray = pd.Index(df["id"]).get_indexer(result["id"])
+        result = result.iloc[np.argsort(positions, kind="stable")]
+    return result.sort_values(
+        by=[DataSchema.YEAR, DataSchema.MONTH],
+        ascending=False,
+        kind="stable",
+        ignore_index=True,
+    )
+
+
+def changed_rows(old_df: pd.DataFrame, new_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The rows of `new_df` that differ from the rows of `old_df` with the same index, in the
+    order of `old_df`. They have the columns of `old_df`, then the ledger columns only
+    `new_df` has (e.g. the confidence of a first prediction), which are missing in `old_df`.
+    """
+    added: pd.Index = new_df.columns.intersection(list(LEDGER_DTYPES)).difference(
+        old_df.columns
+    )
+    columns: pd.Index = old_df.columns.append(added)
+    old_df = old_df.reindex(columns=columns)
+    new_df = new_df.loc[old_df.index, columns]
+    old_values: pd.DataFrame = old_df.astype(object)
+    new_values: pd.DataFrame = new_df.astype(object)
+    equal: pd.DataFrame = (old_values == new_values) | (
+        old_values.isna() & new_values.isna()
+    )
+    return new_df.loc[~equal.all(axis=1)]
+
+
+def operation_partitions(operations: list[Operation]) -> list[Partition]:
+    """The (year, month) partitions of the rows of the operations, most recent first."""
+    return sorted(
+        {
+            (
+                int(operation["row"][DataSchema.YEAR]),
+                int(operation["row"][DataSchema.MONTH]),
+            )
+            for operation in operations
+        },
+        reverse=True,
+    )
+
+
+def load_touched_rows(
+    ledger: Ledger, operations: list[Operation]
+) -> tuple[pd.DataFrame, list[Partition] | None]:
+    """
+    Loads the partitions the operations touch, or the whole ledger if a row they update or
+    remove is not in those partitions (e.g. it was moved to another month).
+
+    Returns:
+        tuple[pd.DataFrame, list[Partition] | None]: The rows, and their partitions (None
+        for the whole ledger).
+    """
+    partitions: list[Partition] = operation_partitions(operations)
+    df: pd.DataFrame = ledger.load_partitions(partitions)
+    added: set[int] = {op["row"]["id"] for op in operations if op["op"] == "add"}
+    edited: set[int] = {op["row"]["id"] for op in operations} - added
+    if edited and (df.empty or not edited.issubset(df["id"])):
+        return ledger.load(), None
+    return df, partitions
+
+
+def compact(
+    ledger: Ledger, journal: Journal, on_compact: CompactionHook | None = None
+) -> list[Partition]:
+    """
+    Folds the journal into the ledger, only reading and rewriting the partitions the
+    operations touch.
+
+    Args:
+        ledger (Ledger): The ledger to save the operations to.
+        journal (Journal): The journal of the operations.
+        on_compact (CompactionHook | None, optional): Called with the ledger and the
+            operations once they are saved, e.g. to learn from them.
+
+    Returns:
+        list[Partition]: The (year, month) partitions of the ledger that were rewritten.
+    """
+    with COMPACTION_LOCK:
+        journal.seal()
+        operations: list[Operation] = journal.read_sealed()
+        touched: list[Partition] = []
+        if operations:
+            df, partitions = load_touched_rows(ledger, operations)
+            touched = ledger.save(apply_operations(df, operations), partitions)
+            if on_compact is not None:
+                on_compact(ledger, operations)
+        journal.discard_sealed()
+        return touched
+
+
+def compact_in_background(
+    ledger: Ledger, journal: Journal, on_compact: CompactionHook | None = None
+) -> threading.Thread:
+    thread = threading.Thread(target=compact, args=(ledger, journal, on_compact))
+    thread.start()
+    return thread
@@ -0,0 +1,262 @@
+"""Columnar on-disk store for the expenses and incomes ledgers."""
+
+import functools
+import hashlib
+import json
+from pathlib import Path
+import pandas as pd
+
+from src.data.codes import (
+    CODE_DTYPE,
+    CodeTables,
+    decode,
+    encode,
+    is_encoded,
+    read_code_tables,
+    write_code_tables,
+)
+from src.data.schema import DataSchema
+
+LEDGER_DTYPES: dict[str, str] = {
+    DataSchema.YEAR: "int16",
+    DataSchema.MONTH: "int8",
+    DataSchema.AMOUNT: "float64",
+    DataSchema.BANK: "category",
+    DataSchema.CATEGORY: "category",
+    DataSchema.SUBCATEGORY: "category",
+    DataSchema.RECURRENT: "category",
+    DataSchema.DESCRIPTION: "object",
+    DataSchema.CONFIDENCE: "float64",
+    "id": "int64",
+}
+
+MANIFEST_FILE = "_manifest.json"
+CODES_FILE = "_codes.json"
+
+Partition = tuple[int, int]
+
+
+def to_ledger_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keeps only the ledger columns and casts them to their dtypes.
+
+    Rows without an "id" (e.g. coming from a CSV file) are numbered after the highest
+    existing id, so every row can be addressed by the tables.
+    """
+    df = df.reindex(columns=list(LEDGER_DTYPES.keys()))
+    if df["id"].isna().any():
+        missing: pd.Series = df["id"].isna()
+        start: int = int(df["id"].max()) + 1 if not missing.all() else 0
+        df.loc[missing, "id"] = list(range(start, start + int(missing.sum())))
+    return df.astype(LEDGER_DTYPES)
+
+
+def with_ledger_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Casts the ledger columns present in the DataFrame, keeping any other column as is."""
+    dtypes: dict[str, str] = {
+        column: dtype for column, dtype in LEDGER_DTYPES.items() if column in df.columns
+    }
+    return df.astype(dtypes, copy=False)
+
+
+class Ledger:
+    """
+    Year/month partitioned Parquet store for one user's expenses or incomes.
+
+    Each (year, month) lives in its own file, so the dashboard can load only the years it
+    needs and a save only rewrites the months whose rows actually changed.
+
+    The category, subcategory, recurrent and bank columns are stored as integer codes (see
+    codes.py) and loaded as categoricals labeled in the current locale.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root: Path = root
+
+    @property
+    def exists(self) -> bool:
+        return (self.root / MANIFEST_FILE).exists()
+
+    def partition_path(self, year: int, month: int) -> Path:
+        return self.root / f"year={year}" / f"month={month:02d}.parquet"
+
+    def read_manifest(self) -> dict[str, str]:
+        if not self.exists:
+            return {}
+        with open(self.root / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def write_manifest(self, manifest: dict[str, str]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path: Path = self.root / f"{MANIFEST_FILE}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        tmp_path.replace(self.root / MANIFEST_FILE)
+
+    def read_code_tables(self) -> CodeTables:
+        return read_code_tables(self.root / CODES_FILE)
+
+    @property
+    def partitions(self) -> list[Partition]:
+        """Stored partitions, most recent first."""
+        keys: list[Partition] = [
+            (int(year), int(month))
+            for year, month in (key.split("-") for key in self.read_manifest())
+        ]
+        return sorted(keys, reverse=True)
+
+    @property
+    def years(self) -> list[int]:
+        return sorted({year for year, _ in self.partitions}, reverse=True)
+
+    def load(self, years: list[int] | None = None) -> pd.DataFrame:
+        """
+        Load the stored rows, optionally restricted to the given years.
+
+        Returns:
+            pd.DataFrame: The rows sorted by date (most recent first) with the ledger dtypes.
+            If nothing is stored, an empty DataFrame is returned.
+        """
+        return self.load_partitions(
+            [
+                (year, month)
+                for year, month in self.partitions
+                if years is None or year in years
+            ]
+        )
+
+    def load_partitions(self, partitions: list[Partition]) -> pd.DataFrame:
+        """
+        Load the rows of the given (year, month) partitions, in their order, with a single
+        scan of their files. Partitions that are not stored are skipped.
+        """
+        stored: set[str] = set(self.read_manifest())
+        paths: list[str] = [
+            str(self.partition_path(year, month))
+            for year, month in partitions
+            if f"{year}-{month:02d}" in stored
+        ]
+        if not paths:
+            return pd.DataFrame()
+        tables: CodeTables = self.read_code_tables()
+        return to_ledger_dtypes(decode(read_partitions(paths, tables), tables))
+
+    def save(
+        self, df: pd.DataFrame, partitions: list[Partition] | None = None
+    ) -> list[Partition]:
+        """
+        Store the given rows, rewriting only the partitions whose content changed.
+
+        Partitions that no longer have any row are deleted.
+
+        Args:
+            df (pd.DataFrame): The rows of the whole ledger, or of the given partitions.
+            partitions (list[Partition] | None, optional): The only partitions the rows
+                replace, the others being kept as they are. Defaults to all of them.
+
+        Returns:
+            list[Partition]: The (year, month) partitions that were written or deleted.
+        """
+        old_manifest: dict[str, str] = self.read_manifest()
+        new_manifest: dict[str, str] = {}
+        touched: list[Partition] = []
+        if partitions is not None:
+            replaced: set[str] = {f"{year}-{month:02d}" for year, month in partitions}
+            new_manifest = {
+                key: digest
+                for key, digest in old_manifest.items()
+                if key not in replaced
+            }
+
+        if not df.empty:
+            tables: CodeTables = self.read_code_tables()
+            sizes: list[int] = [len(table) for table in tables.values()]
+            df = encode(to_ledger_dtypes(df), tables)
+            # the codes are saved before the partitions that use them
+            codes_path: Path = self.root / CODES_FILE
+            if (
+                sizes != [len(table) for table in tables.values()]
+                or not codes_path.exists()
+            ):
+                write_code_tables(codes_path, tables)
+            for (year, month), part in df.groupby(
+                [DataSchema.YEAR, DataSchema.MONTH], sort=False, observed=True
+            ):
+                key: str = f"{year}-{month:02d}"
+                digest: str = partition_digest(part)
+                new_manifest[key] = digest
+                if old_manifest.get(key) == digest:
+                    continue
+                self.write_partition(int(year), int(month), part)
+                touched.append((int(year), int(month)))
+
+        for key in old_manifest.keys() - new_manifest.keys():
+            year, month = (int(v) for v in key.split("-"))
+            self.partition_path(year, month).unlink(missing_ok=True)
+            touched.append((year, month))
+
+        if touched or not self.exists:
+            self.write_manifest(new_manifest)
+        return touched
+
+    def write_partition(self, year: int, month: int, part: pd.DataFrame) -> None:
+        path: Path = self.partition_path(year, month)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path: Path = path.with_suffix(".tmp")
+        part.to_parquet(tmp_path, index=False)
+        tmp_path.replace(path)
+
+    def import_csv(self, file_path: Path) -> list[Partition]:
+        """Store the rows of a CSV file written by previous versions of the app."""
+        df: pd.DataFrame = pd.read_csv(file_path)
+        return self.save(df)
+
+    def export_csv(self, file_path: Path) -> None:
+        """Write the whole ledger as a CSV file compatible with previous versions."""
+        df: pd.DataFrame = self.load()
+        df.drop(columns=["id", DataSchema.CONFIDENCE], errors="ignore").to_csv(
+            file_path, index=False, float_format="%.2f"
+        )
+
+
+@functools.cache
+def stored_schema() -> "pa.Schema":
+    """The Arrow schema of the partitions, with the coded columns as integers."""
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            (
+                column,
+                (
+                    pa.string()
+                    if dtype == "object"
+                    else pa.from_numpy_dtype(
+                        CODE_DTYPE if dtype == "category" else dtype
+                    )
+                ),
+            )
+            for column, dtype in LEDGER_DTYPES.items()
+        ]
+    )
+
+
+def read_partitions(paths: list[str], tables: CodeTables) -> pd.DataFrame:
+    """Reads the partition files as one coded DataFrame, in the order of the paths."""
+    # pyarrow is only imported once a ledger is read
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    try:
+        dataset = ds.dataset(paths, schema=stored_schema(), format="parquet")
+        return dataset.to_table().to_pandas()
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+        # partitions written by previous versions of the app hold the labels themselves
+        frames: list[pd.DataFrame] = [pd.read_parquet(path) for path in paths]
+        frames = [df if is_encoded(df) else encode(df, tables) for df in frames]
+        return pd.concat(frames, ignore_index=True)
+
+
+def partition_digest(part: pd.DataFrame) -> str:
+    hashes = pd.util.hash_pandas_object(part, index=False)
+    return hashlib.sha1(hashes.to_numpy().tobytes()).hexdigest()
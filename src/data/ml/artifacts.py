@@ -0,0 +1,210 @@
+"""
+Numpy artifact format of the subcategory model, memory-mapped read-only by every process.
+
+An artifact is a directory holding the vectorizer vocabulary, the IDF weights and the linear
+classifier coefficients as .npy files, plus a small meta.json. Loading it with mmap_mode="r"
+does not unpickle nor copy anything: all the processes serving the app share the same pages
+of the files.
+"""
+
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any
+import numpy as np
+from scipy.sparse import csr_matrix, spmatrix
+from sklearn.preprocessing import normalize
+
+META_FILE = "meta.json"
+ARRAYS: tuple[str, ...] = ("terms", "columns", "idf", "coef", "intercept", "classes")
+
+
+@dataclass(frozen=True)
+class LinearArtifact:
+    """
+    A text vectorizer and a linear classifier backed by (memory-mapped) numpy arrays.
+
+    It implements both the Vectorizer and the MLModel protocols of the predictor.
+    """
+
+    meta: dict[str, Any]
+    terms: np.ndarray  # sorted vocabulary
+    columns: np.ndarray  # feature column of each term of `terms`
+    idf: np.ndarray | None
+    coef: np.ndarray
+    intercept: np.ndarray
+    classes: np.ndarray
+
+    @property
+    def version(self) -> str:
+        return self.meta["version"]
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return self.classes
+
+    @property
+    def has_proba(self) -> bool:
+        """Whether predict_proba is supported (not by LinearSVC artifacts)."""
+        return self.meta["proba"] is not None
+
+    def analyze(self, document: str) -> list[str]:
+        """Splits a document into terms the way the original vectorizer did."""
+        if self.meta["lowercase"]:
+            document = document.lower()
+        tokens: list[str] = re.findall(self.meta["token_pattern"], document)
+        min_n, max_n = self.meta["ngram_range"]
+        if max_n == 1:
+            return tokens
+        return [
+            " ".join(tokens[i : i + n])
+            for n in range(min_n, max_n + 1)
+            for i in range(len(tokens) - n + 1)
+        ]
+
+    def transform(self, X: np.ndarray) -> spmatrix:
+        documents: list[list[str]] = [self.analyze(str(document)) for document in X]
+        tokens = np.array([t for terms in documents for t in terms], dtype=str)
+        rows: np.ndarray = np.repeat(
+            np.arange(len(documents)), [len(terms) for terms in documents]
+        )
+
+        positions: np.ndarray = np.searchsorted(self.terms, tokens)
+        positions = np.minimum(positions, len(self.terms) - 1)
+        known: np.ndarray = self.terms[positions] == tokens
+        counts = csr_matrix(
+            (
+                np.ones(known.sum(), dtype=np.float64),
+                (rows[known], self.columns[positions[known]]),
+            ),
+            shape=(len(documents), self.coef.shape[1]),
+        )
+        counts.sum_duplicates()
+
+        if self.meta["binary"]:
+            counts.data[:] = 1.0
+        if self.meta["sublinear_tf"]:
+            np.log(counts.data, out=counts.data)
+            counts.data += 1.0
+        if self.idf is not None:
+            counts = counts.multiply(self.idf).tocsr()
+        if self.meta["norm"]:
+            counts = normalize(counts, norm=self.meta["norm"], copy=False)
+        return counts
+
+    def decision_function(self, X: spmatrix) -> np.ndarray:
+        return np.asarray(X @ self.coef.T) + self.intercept
+
+    def predict(self, X: np.ndarray | spmatrix) -> np.ndarray:
+        scores: np.ndarray = self.decision_function(X)
+        if scores.shape[1] == 1:
+            return self.classes[(scores[:, 0] > 0).astype(int)]
+        return self.classes[scores.argmax(axis=1)]
+
+    def predict_proba(self, X: np.ndarray | spmatrix) -> np.ndarray:
+        scores: np.ndarray = self.decision_function(X)
+        if self.meta["proba"] == "softmax":
+            scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+            return scores / scores.sum(axis=1, keepdims=True)
+        if self.meta["proba"] != "ovr":
+            raise AttributeError("The model does not predict probabilities.")
+        probabilities: np.ndarray = 1.0 / (1.0 + np.exp(-scores))
+        if probabilities.shape[1] == 1:
+            return np.hstack([1.0 - probabilities, probabilities])
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+
+def probability_kind(model: Any) -> str | None:
+    """How the classifier turns its decision function into probabilities."""
+    name: str = type(model).__name__
+    if name == "LogisticRegression":
+        multi_class: str = model.multi_class
+        if multi_class == "auto":
+            binary: bool = len(model.classes_) == 2
+            multi_class = (
+                "ovr" if binary or model.solver == "liblinear" else "multinomial"
+            )
+        return "ovr" if multi_class == "ovr" else "softmax"
+    if name == "SGDClassifier" and model.loss in ("log_loss", "modified_huber"):
+        return "ovr"
+    return None
+
+
+def save_linear_artifact(directory: Path, vectorizer: Any, model: Any) -> str:
+    """
+    Writes a fitted Count/TfidfVectorizer and a fitted linear classifier (any model with
+    `coef_` and `intercept_`, e.g. LogisticRegression, LinearSVC or SGDClassifier) as a numpy
+    artifact.
+
+    Returns:
+        str: The version of the artifact, a digest of its arrays.
+    """
+    if vectorizer.analyzer != "word" or vectorizer.tokenizer or vectorizer.preprocessor:
+        raise ValueError(
+            "Only word vectorizers with the default tokenizer are supported."
+        )
+    if not hasattr(model, "coef_"):
+        raise ValueError(f"{type(model).__name__} is not a linear model.")
+
+    vocabulary: dict[str, int] = vectorizer.vocabulary_
+    terms: np.ndarray = np.array(sorted(vocabulary), dtype=str)
+    arrays: dict[str, np.ndarray | None] = {
+        "terms": terms,
+        "columns": np.array([vocabulary[t] for t in terms], dtype=np.int64),
+        "idf": getattr(vectorizer, "idf_", None),
+        "coef": np.asarray(
+            model.coef_.toarray() if hasattr(model.coef_, "toarray") else model.coef_,
+            dtype=np.float64,
+        ),
+        "intercept": np.asarray(model.intercept_, dtype=np.float64),
+        "classes": np.asarray(model.classes_).astype(str),
+    }
+
+    directory.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha1()
+    for name, array in arrays.items():
+        path: Path = directory / f"{name}.npy"
+        if array is None:
+            path.unlink(missing_ok=True)
+            continue
+        # replaced, not overwritten, so processes mapping the old file keep reading it
+        tmp_path: Path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, np.ascontiguousarray(array))
+        os.replace(tmp_path, path)
+        digest.update(array.tobytes())
+
+    meta: dict[str, Any] = {
+        "version": digest.hexdigest()[:12],
+        "model": type(model).__name__,
+        "lowercase": vectorizer.lowercase,
+        "token_pattern": vectorizer.token_pattern,
+        "ngram_range": list(vectorizer.ngram_range),
+        "binary": vectorizer.binary,
+        "sublinear_tf": getattr(vectorizer, "sublinear_tf", False),
+        "norm": getattr(vectorizer, "norm", None),
+        "proba": probability_kind(model),
+    }
+    # the metadata is written last, so a complete meta.json means a complete artifact
+    meta_path: Path = directory / f"{META_FILE}.tmp"
+    meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    os.replace(meta_path, directory / META_FILE)
+    return meta["version"]
+
+
+def load_linear_artifact(
+    directory: Path, mmap_mode: str | None = "r"
+) -> LinearArtifact:
+    meta: dict[str, Any] = json.loads((directory / META_FILE).read_text("utf-8"))
+    arrays: dict[str, np.ndarray | None] = {
+        name: (
+            np.load(directory / f"{name}.npy", mmap_mode=mmap_mode)
+            if (directory / f"{name}.npy").exists()
+            else None
+        )
+        for name in ARRAYS
+    }
+    return LinearArtifact(meta=meta, **arrays)  # type: ignore
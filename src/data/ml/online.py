@@ -0,0 +1,154 @@
+"""Subcategory model that keeps learning from the subcategories users confirm."""
+
+from datetime import datetime
+import os
+from pathlib import Path
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.sparse import spmatrix
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+
+from ..categorize.finder import current_locale
+from ..codes import keys, labels
+from ..journal import Operation, apply_operations
+from ..ledger import Ledger
+from ..raw.cleaner import clean_descriptions
+from ..schema import DataSchema
+
+ONLINE_MODEL_FILE = "./database/ml/subcat_online.joblib"
+ONLINE_MIN_SAMPLES = 200  # before it is preferred over the offline model
+
+
+class OnlineModel:
+    """
+    A hashing vectorizer and an SGD logistic regression updated with partial_fit.
+
+    The hashing vectorizer has no vocabulary to fit, so new (cleaned description,
+    subcategory) pairs are learned in milliseconds, without retraining on the whole history.
+    It implements both the Vectorizer and the MLModel protocols of the predictor.
+
+    Its classes are the translation keys of the subcategories (e.g. "subcategory.groceries"),
+    so that it predicts and learns the labels of the current locale whichever locale it was
+    trained in.
+    """
+
+    def __init__(self, classes: list[str]) -> None:
+        self.vectorizer = HashingVectorizer(n_features=2**18, alternate_sign=False)
+        self.model = SGDClassifier(loss="log_loss", alpha=1e-5, random_state=0)
+        self.classes: np.ndarray = np.array(sorted(classes))
+        self.version: int = 0
+        self.n_samples: int = 0
+        self.updated_at: datetime | None = None
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return self.to_labels(self.model.classes_)
+
+    @staticmethod
+    def to_labels(subcategory_keys: np.ndarray) -> np.ndarray:
+        by_key: dict[str, str] = labels(DataSchema.SUBCATEGORY, current_locale())
+        return np.array(
+            [by_key.get(key, key) for key in subcategory_keys], dtype=object
+        )
+
+    @staticmethod
+    def to_keys(subcategories: np.ndarray) -> np.ndarray:
+        by_label: dict[str, str] = keys(DataSchema.SUBCATEGORY, current_locale())
+        return np.array(
+            [by_label.get(label, label) for label in subcategories], dtype=object
+        )
+
+    def transform(self, X: np.ndarray) -> spmatrix:
+        return self.vectorizer.transform(X)
+
+    def predict(self, X: np.ndarray | spmatrix) -> np.ndarray:
+        return self.to_labels(self.model.predict(X))
+
+    def predict_proba(self, X: np.ndarray | spmatrix) -> np.ndarray:
+        return self.model.predict_proba(X)
+
+    def partial_fit(self, descriptions: np.ndarray, subcategories: np.ndarray) -> int:
+        """
+        Learns the given pairs, ignoring the subcategories the model does not know.
+
+        Args:
+            descriptions (np.ndarray): The cleaned descriptions.
+            subcategories (np.ndarray): Their subcategories, labeled in any locale.
+
+        Returns:
+            int: The number of pairs learned.
+        """
+        subcategory_keys: np.ndarray = self.to_keys(subcategories)
+        known: np.ndarray = np.isin(subcategory_keys, self.classes)
+        if not known.any():
+            return 0
+        self.model.partial_fit(
+            self.transform(descriptions[known]),
+            subcategory_keys[known],
+            classes=self.classes,
+        )
+        self.version += 1
+        self.n_samples += int(known.sum())
+        self.updated_at = datetime.now()
+        return int(known.sum())
+
+
+def confirmed_subcategories(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The categorized rows whose subcategory was set by the user, i.e. not predicted (see
+    predict_subcategories, which always sets the confidence).
+    """
+    confirmed: pd.Series = df[DataSchema.SUBCATEGORY].notna()
+    if DataSchema.CONFIDENCE in df.columns:
+        confirmed &= df[DataSchema.CONFIDENCE].isna()
+    return df.loc[confirmed]
+
+
+def save_online_model(model: OnlineModel, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path: Path = path.with_suffix(".tmp")
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def learn(ledger: Ledger, operations: list[Operation]) -> OnlineModel | None:
+    """
+    Updates the online model with the subcategories confirmed in the given operations.
+
+    The first time, the model is trained on every confirmed row of the ledger instead. Each
+    update is saved as a new version of the model file, which the model registry reloads.
+
+    Args:
+        ledger (Ledger): The expenses ledger the operations were just saved to.
+        operations (list[Operation]): The saved journal operations.
+
+    Returns:
+        OnlineModel | None: The updated model, or None if there was nothing to learn.
+    """
+    path = Path(ONLINE_MODEL_FILE)
+    if path.exists():
+        model: OnlineModel = joblib.load(path)
+        rows: pd.DataFrame = apply_operations(pd.DataFrame(), operations)
+    else:
+        model = OnlineModel(list(labels(DataSchema.SUBCATEGORY, current_locale())))
+        rows = ledger.load()
+
+    if rows.empty:
+        return None
+    rows = confirmed_subcategories(rows)
+    if rows.empty:
+        return None
+
+    df: pd.DataFrame = clean_descriptions(
+        [], rows[[DataSchema.DESCRIPTION, DataSchema.SUBCATEGORY]].copy()
+    )
+    learned: int = model.partial_fit(
+        df[DataSchema.CLEANED_DESCRIPTION].to_numpy(dtype=str),
+        df[DataSchema.SUBCATEGORY].astype(str).to_numpy(),
+    )
+    if not learned:
+        return None
+    save_online_model(model, path)
+    return model
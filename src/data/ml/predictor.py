@@ -1,14 +1,18 @@
+from pathlib import Path
 from typing import Protocol
-import joblib
 import numpy as np
 import pandas as pd
 from scipy.sparse import spmatrix
 
 from ..raw.cleaner import clean_descriptions
 from ..schema import DataSchema
+from .artifacts import LinearArtifact
+from .online import ONLINE_MIN_SAMPLES, ONLINE_MODEL_FILE, OnlineModel
+from .registry import MODELS
 
 SUBCAT_MODEL_FILE = "./database/ml/subcat_model.joblib"
 SUBCAT_VECTORIZER_FILE = "./database/ml/subcat_vectorizer.joblib"
+SUBCAT_ARTIFACT_DIR = "./database/ml/subcat_model"
 
 
 class MLModel(Protocol):
@@ -19,30 +23,152 @@ class Vectorizer(Protocol):
     def transform(self, X: np.ndarray) -> spmatrix: ...
 
 
+class ProbabilisticModel(MLModel, Protocol):
+    classes_: np.ndarray
+
+    def predict_proba(self, X: np.ndarray | spmatrix) -> np.ndarray: ...
+
+
 def separate_data(df: pd.DataFrame) -> list[pd.DataFrame]:
     categorized_df: pd.DataFrame = df.loc[df[DataSchema.SUBCATEGORY].notna(), :]
     uncategorized_df: pd.DataFrame = df.loc[df[DataSchema.SUBCATEGORY].isna(), :]
     return [categorized_df, uncategorized_df]
 
 
-def predict_subcategories(uncategorized_df: pd.DataFrame) -> pd.DataFrame:
+def load_subcat_model() -> tuple[Vectorizer, MLModel]:
+    """
+    Returns the subcategory vectorizer and model.
+
+    The online model, which learns from the users' corrections, is used once it has seen
+    enough of them or when there is no offline model. Otherwise the offline model comes from
+    the memory-mapped numpy artifact when there is one, or else from the joblib files.
+    """
+    offline: bool = (
+        Path(SUBCAT_ARTIFACT_DIR).is_dir() or Path(SUBCAT_MODEL_FILE).exists()
+    )
+    if Path(ONLINE_MODEL_FILE).exists():
+        online: OnlineModel = MODELS.get(ONLINE_MODEL_FILE)
+        if online.n_samples >= ONLINE_MIN_SAMPLES or not offline:
+            return online, online
+    if Path(SUBCAT_ARTIFACT_DIR).is_dir():
+        artifact: LinearArtifact = MODELS.get(SUBCAT_ARTIFACT_DIR)
+        return artifact, artifact
+    return MODELS.get(SUBCAT_VECTORIZER_FILE), MODELS.get(SUBCAT_MODEL_FILE)
+
+
+def predicts_probabilities(model: MLModel) -> bool:
+    """Whether the model scores every class, and not only its single prediction."""
+    if isinstance(model, LinearArtifact):
+        return model.has_proba
+    return hasattr(model, "predict_proba")
+
+
+def predict_top_k(
+    vectorizer: Vectorizer, model: MLModel, descriptions: np.ndarray, k: int = 3
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Predicts the k most likely subcategories of each description in one batch.
+
+    The descriptions are vectorized into a single sparse matrix, scored in one pass, and the
+    top k classes of every row are selected with a partial sort.
+
+    Args:
+        vectorizer (Vectorizer): The fitted vectorizer.
+        model (MLModel): The fitted model.
+        descriptions (np.ndarray): The cleaned descriptions.
+        k (int, optional): The number of subcategories per description. Defaults to 3.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The (n, k) subcategories and their probabilities, most
+        likely first. Models that do not predict probabilities give their single prediction
+        with a NaN probability.
+    """
+    X_vectorized: spmatrix = vectorizer.transform(descriptions)
+    if not predicts_probabilities(model):
+        labels: np.ndarray = model.predict(X_vectorized)[:, np.newaxis]
+        return labels, np.full(labels.shape, np.nan)
+
+    probabilistic_model: ProbabilisticModel = model  # type: ignore
+    probabilities: np.ndarray = probabilistic_model.predict_proba(X_vectorized)
+    k = min(k, probabilities.shape[1])
+    top: np.ndarray = np.argpartition(-probabilities, k - 1, axis=1)[:, :k]
+    top_probabilities: np.ndarray = np.take_along_axis(probabilities, top, axis=1)
+    order: np.ndarray = np.argsort(-top_probabilities, axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    return (
+        np.asarray(probabilistic_model.classes_)[top],
+        np.take_along_axis(top_probabilities, order, axis=1),
+    )
+
+
+def build_merchant_index(categorized_df: pd.DataFrame) -> dict[str, str]:
+    """
+    Maps each cleaned description the user already categorized to its most recent
+    subcategory.
+
+    Args:
+        categorized_df (pd.DataFrame): The categorized rows returned by separate_data, most
+            recent first.
+
+    Returns:
+        dict[str, str]: The subcategory of each non-empty cleaned description.
+    """
+    if categorized_df.empty:
+        return {}
+    df: pd.DataFrame = clean_descriptions(
+        [], categorized_df[[DataSchema.DESCRIPTION, DataSchema.SUBCATEGORY]].copy()
+    )
+    df = df.loc[df[DataSchema.CLEANED_DESCRIPTION] != ""]
+    latest: pd.DataFrame = df.drop_duplicates(DataSchema.CLEANED_DESCRIPTION)
+    return dict(
+        zip(
+            latest[DataSchema.CLEANED_DESCRIPTION],
+            latest[DataSchema.SUBCATEGORY].astype(str),
+        )
+    )
+
+
+def predict_subcategories(
+    uncategorized_df: pd.DataFrame, merchant_index: dict[str, str] | None = None
+) -> pd.DataFrame:
     """
     Perform subcategory prediction on the given DataFrame using a pre-trained ML model.
 
+    Descriptions found in the merchant index get the subcategory the user already gave them,
+    with full confidence, and only the others go through the model. The model and the
+    vectorizer come from the model registry, so they are only read from disk on the first
+    prediction and after they are retrained.
+
     Parameters:
     - uncategorized_df: pd.DataFrame, the DataFrame containing uncategorized data to predict
     subcategories for.
+    - merchant_index: dict[str, str] | None, the subcategory of the cleaned descriptions
+    that were already categorized (see build_merchant_index).
 
     Returns:
-    - pd.DataFrame, the DataFrame with predicted subcategories.
+    - pd.DataFrame, the DataFrame with predicted subcategories and the probability of each
+    prediction in the confidence column.
     """
     df: pd.DataFrame = clean_descriptions([], uncategorized_df)
+    # the ledger's categorical column only accepts the subcategories it already holds
+    df[DataSchema.SUBCATEGORY] = df[DataSchema.SUBCATEGORY].astype(object)
+
+    known: pd.Series = df[DataSchema.CLEANED_DESCRIPTION].map(merchant_index or {})
+    hits: pd.Series = known.notna()
+    df.loc[hits, DataSchema.SUBCATEGORY] = known[hits]
+    df.loc[hits, DataSchema.CONFIDENCE] = 1.0
+    if hits.all():
+        return df
 
-    model: MLModel = joblib.load(SUBCAT_MODEL_FILE)
-    vectorizer: Vectorizer = joblib.load(SUBCAT_VECTORIZER_FILE)
-    X_vectorized: spmatrix = vectorizer.transform(
-        df[DataSchema.CLEANED_DESCRIPTION].to_numpy(dtype="<U50")
+    misses: pd.DataFrame = df.loc[~hits]
+    vectorizer, model = load_subcat_model()
+    subcategories, probabilities = predict_top_k(
+        vectorizer,
+        model,
+        misses[DataSchema.CLEANED_DESCRIPTION].to_numpy(dtype="<U50"),
+        k=1,
     )
-    df.loc[:, DataSchema.SUBCATEGORY] = model.predict(X_vectorized)
+    df.loc[~hits, DataSchema.SUBCATEGORY] = subcategories[:, 0]
+    df.loc[~hits, DataSchema.CONFIDENCE] = probabilities[:, 0]
 
     return df
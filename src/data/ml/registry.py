@@ -0,0 +1,114 @@
+"""Process-wide registry of the trained ML artifacts, loaded once and reloaded on change."""
+
+from dataclasses import dataclass
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+import joblib
+
+from .artifacts import META_FILE, load_linear_artifact
+
+
+@dataclass(frozen=True)
+class Artifact:
+    """A loaded joblib artifact and where it came from."""
+
+    obj: Any
+    path: Path
+    stat: tuple[int, int]  # (mtime in ns, size in bytes)
+    version: str  # short sha1 of the file contents
+    loaded_at: float
+    load_seconds: float
+
+
+def watched_file(path: Path) -> Path:
+    """The file whose changes mean that the artifact at the given path changed."""
+    # the metadata of a numpy artifact is written last, once all its arrays are saved
+    return path / META_FILE if path.is_dir() else path
+
+
+def file_stat(path: Path) -> tuple[int, int]:
+    stat: os.stat_result = watched_file(path).stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_version(path: Path) -> str:
+    digest = hashlib.sha1()
+    with open(watched_file(path), "rb") as f:
+        for block in iter(lambda: f.read(2**20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+class ModelRegistry:
+    """
+    Loads each artifact once per process and keeps it in memory.
+
+    Every access only stats the file. When its mtime or size changed, the file is hashed, and
+    it is loaded again only if its contents changed. With `mmap_mode`, joblib memory-maps the
+    numpy arrays of the artifacts instead of reading them into memory.
+
+    Directories are numpy artifacts (see artifacts.py), which are always memory-mapped
+    read-only, so that the processes serving the app share a single copy of them.
+    """
+
+    def __init__(self, mmap_mode: str | None = None) -> None:
+        self.mmap_mode: str | None = mmap_mode
+        self._artifacts: dict[Path, Artifact] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str | Path) -> Any:
+        return self.artifact(path).obj
+
+    def artifact(self, path: str | Path) -> Artifact:
+        path = Path(path).resolve()
+        with self._lock:
+            artifact: Artifact | None = self._artifacts.get(path)
+            stat: tuple[int, int] = file_stat(path)
+            if artifact is not None and artifact.stat == stat:
+                return artifact
+
+            version: str = file_version(path)
+            if artifact is not None and artifact.version == version:
+                artifact = Artifact(
+                    artifact.obj,
+                    path,
+                    stat,
+                    version,
+                    artifact.loaded_at,
+                    artifact.load_seconds,
+                )
+            else:
+                start: float = time.perf_counter()
+                obj: Any = (
+                    load_linear_artifact(path)
+                    if path.is_dir()
+                    else joblib.load(path, mmap_mode=self.mmap_mode)
+                )
+                artifact = Artifact(
+                    obj, path, stat, version, time.time(), time.perf_counter() - start
+                )
+            self._artifacts[path] = artifact
+            return artifact
+
+    def info(self) -> dict[str, dict[str, str | float]]:
+        """The version, load time and load duration of every loaded artifact."""
+        with self._lock:
+            return {
+                path.name: {
+                    "version": artifact.version,
+                    "loaded_at": artifact.loaded_at,
+                    "load_seconds": artifact.load_seconds,
+                }
+                for path, artifact in self._artifacts.items()
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._artifacts.clear()
+
+
+MODELS = ModelRegistry(mmap_mode=os.getenv("MODEL_MMAP_MODE") or None)
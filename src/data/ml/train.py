@@ -0,0 +1,241 @@
+"""
+Trains and compares the subcategory model candidates on the saved expenses.
+
+Usage:
+    python -m src.data.ml.train [--models NAME ...] [--csv FILE ...] [--save NAME|best]
+
+Every candidate is a TF-IDF vectorizer followed by a classifier. Each one is reported with its
+accuracy on a held-out split, fit time, single-row and batch inference latency, and the size
+of its artifact, so models can be picked on the latency/accuracy tradeoff. With --save, the
+chosen candidate is refit on all the data and written to database/ml/.
+"""
+
+import argparse
+from dataclasses import asdict, dataclass
+import io
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Callable
+import i18n
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+from sklearn.neural_network import MLPClassifier
+from sklearn.svm import SVC, LinearSVC
+
+from ..ledger import Ledger
+from ..raw.cleaner import clean_descriptions
+from ..schema import DataSchema
+from ..user import DATABASE_PATH
+from .artifacts import save_linear_artifact
+from .online import confirmed_subcategories
+from .predictor import SUBCAT_ARTIFACT_DIR, SUBCAT_MODEL_FILE, SUBCAT_VECTORIZER_FILE
+
+CANDIDATES: dict[str, Callable[[], Any]] = {
+    "logistic_regression": lambda: LogisticRegression(
+        max_iter=1000, class_weight="balanced"
+    ),
+    "linear_svc": lambda: LinearSVC(class_weight="balanced", dual="auto"),
+    "sgd": lambda: SGDClassifier(loss="log_loss", random_state=0),
+    "random_forest": lambda: RandomForestClassifier(
+        class_weight="balanced", random_state=0
+    ),
+    "svc": lambda: SVC(class_weight="balanced"),
+    "mlp": lambda: MLPClassifier(max_iter=500, random_state=0),
+}
+
+LATENCY_REPEATS = 50
+
+
+@dataclass
+class Report:
+    """Evaluation of one candidate."""
+
+    name: str
+    accuracy: float
+    fit_seconds: float
+    single_row_ms: float  # median latency of predicting one description
+    batch_row_ms: float  # latency per description when predicting the test set at once
+    artifact_bytes: int
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name:<20} {self.accuracy:>8.2%} {self.fit_seconds:>9.3f}s "
+            f"{self.single_row_ms:>10.3f}ms {self.batch_row_ms:>10.4f}ms "
+            f"{self.artifact_bytes / 1024:>10.1f}KiB"
+        )
+
+
+REPORT_HEADER: str = (
+    f"{'model':<20} {'accuracy':>8} {'fit':>10} {'1 row':>12} "
+    f"{'per row':>12} {'artifact':>13}"
+)
+
+
+def load_training_data(csv_files: list[Path]) -> pd.DataFrame:
+    """
+    The confirmed expenses of every user's ledger and of the given CSV files, with their
+    cleaned descriptions.
+    """
+    frames: list[pd.DataFrame] = [
+        Ledger(path).load()
+        for path in sorted(DATABASE_PATH.glob("*_expenses"))
+        if Ledger(path).exists
+    ]
+    frames += [pd.read_csv(path) for path in csv_files]
+    frames = [confirmed_subcategories(df) for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame(
+            columns=[DataSchema.CLEANED_DESCRIPTION, DataSchema.SUBCATEGORY]
+        )
+
+    df: pd.DataFrame = pd.concat(
+        [f[[DataSchema.DESCRIPTION, DataSchema.SUBCATEGORY]] for f in frames],
+        ignore_index=True,
+    )
+    df = clean_descriptions([], df)
+    df[DataSchema.SUBCATEGORY] = df[DataSchema.SUBCATEGORY].astype(str)
+    return df
+
+
+def artifact_size(vectorizer: Any, model: Any) -> int:
+    buffer = io.BytesIO()
+    joblib.dump((vectorizer, model), buffer)
+    return buffer.getbuffer().nbytes
+
+
+def evaluate(
+    name: str,
+    X_train: np.ndarray,
+    X_test: np.ndarray,
+    y_train: np.ndarray,
+    y_test: np.ndarray,
+) -> Report:
+    vectorizer = TfidfVectorizer()
+    model: Any = CANDIDATES[name]()
+
+    start: float = time.perf_counter()
+    model.fit(vectorizer.fit_transform(X_train), y_train)
+    fit_seconds: float = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred: np.ndarray = model.predict(vectorizer.transform(X_test))
+    batch_seconds: float = time.perf_counter() - start
+
+    single_row: list[float] = []
+    for description in X_test[:LATENCY_REPEATS]:
+        start = time.perf_counter()
+        model.predict(vectorizer.transform([description]))
+        single_row.append(time.perf_counter() - start)
+
+    return Report(
+        name=name,
+        accuracy=float(accuracy_score(y_test, y_pred)),
+        fit_seconds=fit_seconds,
+        single_row_ms=float(np.median(single_row)) * 1000,
+        batch_row_ms=batch_seconds / len(X_test) * 1000,
+        artifact_bytes=artifact_size(vectorizer, model),
+    )
+
+
+def compare_models(
+    df: pd.DataFrame, names: list[str], test_size: float = 0.3, seed: int = 42
+) -> list[Report]:
+    """
+    Evaluates the candidates on the same stratified train/test split.
+
+    Subcategories with a single example cannot be split, so they are left out.
+    """
+    counts: pd.Series = df[DataSchema.SUBCATEGORY].value_counts()
+    df = df.loc[df[DataSchema.SUBCATEGORY].isin(counts[counts >= 2].index)]
+    X_train, X_test, y_train, y_test = train_test_split(
+        df[DataSchema.CLEANED_DESCRIPTION].to_numpy(dtype=str),
+        df[DataSchema.SUBCATEGORY].to_numpy(dtype=str),
+        test_size=test_size,
+        random_state=seed,
+        stratify=df[DataSchema.SUBCATEGORY],
+    )
+    return [evaluate(name, X_train, X_test, y_train, y_test) for name in names]
+
+
+def save_model(name: str, df: pd.DataFrame, directory: Path) -> None:
+    """
+    Refits the candidate on all the data and writes it where the predictor loads it from:
+    the joblib files and, for linear models, the memory-mapped numpy artifact. The artifact
+    of a previous linear model is removed otherwise, since the predictor would prefer it.
+    """
+    vectorizer = TfidfVectorizer()
+    model: Any = CANDIDATES[name]()
+    model.fit(
+        vectorizer.fit_transform(
+            df[DataSchema.CLEANED_DESCRIPTION].to_numpy(dtype=str)
+        ),
+        df[DataSchema.SUBCATEGORY].to_numpy(dtype=str),
+    )
+
+    directory.mkdir(parents=True, exist_ok=True)
+    joblib.dump(model, directory / Path(SUBCAT_MODEL_FILE).name)
+    joblib.dump(vectorizer, directory / Path(SUBCAT_VECTORIZER_FILE).name)
+    artifact_dir: Path = directory / Path(SUBCAT_ARTIFACT_DIR).name
+    if hasattr(model, "coef_"):
+        save_linear_artifact(artifact_dir, vectorizer, model)
+    elif artifact_dir.is_dir():
+        shutil.rmtree(artifact_dir)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--models", nargs="+", choices=list(CANDIDATES), default=list(CANDIDATES)
+    )
+    parser.add_argument(
+        "--csv", nargs="*", type=Path, default=[], help="extra CSV files of expenses"
+    )
+    parser.add_argument("--test-size", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", type=Path, help="also write the reports to this file")
+    parser.add_argument(
+        "--save", help="candidate to write to --output, or 'best' for the most accurate"
+    )
+    parser.add_argument("--output", type=Path, default=Path(SUBCAT_MODEL_FILE).parent)
+    parser.add_argument(
+        "--locale",
+        default=os.getenv("LOCALE") or "pt",
+        help="locale of the subcategory labels the model predicts",
+    )
+    args = parser.parse_args(argv)
+    # the ledgers are loaded with the labels of the locale (see codes.py)
+    i18n.set("locale", args.locale)  # type: ignore
+
+    df: pd.DataFrame = load_training_data(args.csv)
+    if df.empty:
+        parser.error("there are no categorized expenses to train on")
+    print(f"{len(df)} expenses, {df[DataSchema.SUBCATEGORY].nunique()} subcategories")
+
+    reports: list[Report] = compare_models(df, args.models, args.test_size, args.seed)
+    print(REPORT_HEADER)
+    for report in sorted(reports, key=lambda r: r.accuracy, reverse=True):
+        print(report)
+    if args.json:
+        args.json.write_text(json.dumps([asdict(r) for r in reports], indent=2))
+
+    if args.save:
+        name: str = args.save
+        if name == "best":
+            name = max(reports, key=lambda r: r.accuracy).name
+        if name not in CANDIDATES:
+            parser.error(f"unknown model {name}")
+        save_model(name, df, args.output)
+        print(f"Saved {name} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
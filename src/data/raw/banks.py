@@ -1,6 +1,6 @@
 from functools import partial
 import io
-from typing import Any
+from typing import Any, Iterable, Iterator
 import pandas as pd
 
 from ...components import ids
@@ -29,10 +29,13 @@ class BBStatement:
     def columns(self) -> Columns:
         return Columns(description="Histórico")
 
-    def reader(self, data: io.StringIO) -> pd.DataFrame:
+    def reader(
+        self, data: io.TextIOBase, chunksize: int | None = None
+    ) -> pd.DataFrame | Iterator[pd.DataFrame]:
         columns: Columns = self.columns
         return pd.read_csv(
             data,
+            chunksize=chunksize,
             encoding=self.encoding,
             encoding_errors="replace",
             parse_dates=[columns.date],
@@ -47,8 +50,11 @@ class BBStatement:
 
     @property
     def cleaner(self) -> Preprocessor:
+        return compose(self.drop_1st_and_last_row, self.chunk_cleaner)
+
+    @property
+    def chunk_cleaner(self) -> Preprocessor:
         return compose(
-            self.drop_1st_and_last_row,
             partial(rename_columns, self.columns),
             *create_columns(),
             partial(create_bank_column, "Banco do Brasil"),
@@ -58,6 +64,10 @@ class BBStatement:
             ),
         )
 
+    def merge_chunks(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        # the balance rows are only at the start and the end of the whole statement
+        return self.drop_1st_and_last_row(pd.concat(chunks))
+
 
 class BradescoStatement:
     """Statement manager for Bradesco."""
@@ -72,7 +82,7 @@ class BradescoStatement:
     def encoding(self) -> str:
         return "latin-1"
 
-    def reader(self, data: io.StringIO) -> pd.DataFrame:
+    def reader(self, data: io.TextIOBase) -> pd.DataFrame:
         return pd.read_csv(
             data,
             encoding=self.encoding,
@@ -134,10 +144,13 @@ class NuStatement:
     def columns(self) -> Columns:
         return Columns()
 
-    def reader(self, data: io.StringIO) -> pd.DataFrame:
+    def reader(
+        self, data: io.TextIOBase, chunksize: int | None = None
+    ) -> pd.DataFrame | Iterator[pd.DataFrame]:
         columns: Columns = self.columns
         return pd.read_csv(
             data,
+            chunksize=chunksize,
             parse_dates=[columns.date],
             usecols=[columns.date, columns.amount, columns.description],
             dtype=columns.dtype(),
@@ -146,6 +159,10 @@ class NuStatement:
 
     @property
     def cleaner(self) -> Preprocessor:
+        return self.chunk_cleaner
+
+    @property
+    def chunk_cleaner(self) -> Preprocessor:
         return compose(
             partial(rename_columns, self.columns),
             *create_columns(),
@@ -154,6 +171,9 @@ class NuStatement:
             partial(remove_ccbill_payment, "Pagamento de fatura"),
         )
 
+    def merge_chunks(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        return pd.concat(chunks)
+
 
 class InterStatement:
     """Statement manager for Inter."""
@@ -170,10 +190,13 @@ class InterStatement:
     def columns(self) -> Columns:
         return Columns(date="Data Lançamento")
 
-    def reader(self, data: io.StringIO) -> pd.DataFrame:
+    def reader(
+        self, data: io.TextIOBase, chunksize: int | None = None
+    ) -> pd.DataFrame | Iterator[pd.DataFrame]:
         columns: Columns = self.columns
         return pd.read_csv(
             data,
+            chunksize=chunksize,
             sep=";",
             skiprows=4,
             decimal=",",
@@ -190,6 +213,10 @@ class InterStatement:
 
     @property
     def cleaner(self) -> Preprocessor:
+        return self.chunk_cleaner
+
+    @property
+    def chunk_cleaner(self) -> Preprocessor:
         return compose(
             partial(rename_columns, self.columns),
             *create_columns(),
@@ -197,6 +224,9 @@ class InterStatement:
             partial(create_bank_column, "Inter"),
         )
 
+    def merge_chunks(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        return pd.concat(chunks)
+
 
 class CoraStatement:
     """Statement manager for Cora."""
@@ -209,10 +239,13 @@ class CoraStatement:
     def encoding(self) -> str:
         return "utf-8"
 
-    def reader(self, data: io.StringIO) -> pd.DataFrame:
+    def reader(
+        self, data: io.TextIOBase, chunksize: int | None = None
+    ) -> pd.DataFrame | Iterator[pd.DataFrame]:
         columns: Columns = self.columns
         return pd.read_csv(
             data,
+            chunksize=chunksize,
             parse_dates=[columns.date],
             usecols=[columns.date, columns.amount, columns.description],
             dtype=columns.dtype(),
@@ -221,6 +254,10 @@ class CoraStatement:
 
     @property
     def cleaner(self) -> Preprocessor:
+        return self.chunk_cleaner
+
+    @property
+    def chunk_cleaner(self) -> Preprocessor:
         return compose(
             partial(rename_columns, self.columns),
             *create_columns(),
@@ -228,6 +265,9 @@ class CoraStatement:
             partial(create_bank_column, "Cora"),
         )
 
+    def merge_chunks(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        return pd.concat(chunks)
+
 
 class C6CreditCard:
     """Credit card bill manager for C6."""
@@ -238,7 +278,7 @@ class C6CreditCard:
     def columns(self) -> Columns:
         return Columns(date="Data de Compra", amount="Valor (em R$)")
 
-    def reader(self, data: io.StringIO) -> pd.DataFrame:
+    def reader(self, data: io.TextIOBase) -> pd.DataFrame:
         columns: Columns = self.columns
         return pd.read_csv(
             data,
@@ -288,7 +328,7 @@ class NuCreditCard:
     def encoding(self) -> str:
         return "utf-8"
 
-    def reader(self, data: io.StringIO) -> pd.DataFrame:
+    def reader(self, data: io.TextIOBase) -> pd.DataFrame:
         columns: Columns = self.columns
         return pd.read_csv(
             data,
@@ -324,7 +364,7 @@ class SicrediCreditCard:
             description=" Estabelecimento ",
         )
 
-    def reader(self, data: io.StringIO) -> pd.DataFrame:
+    def reader(self, data: io.TextIOBase) -> pd.DataFrame:
         columns: Columns = self.columns
         return pd.read_csv(
             data,
@@ -380,23 +420,33 @@ class PersonalTable:
 
     @property
     def cleaner(self) -> Preprocessor:
+        return self.chunk_cleaner
+
+    @property
+    def chunk_cleaner(self) -> Preprocessor:
         return compose(
             partial(rename_columns, self.columns),
             *create_columns(),
         )
 
-    def reader(self, data: io.StringIO) -> pd.DataFrame:
+    def reader(
+        self, data: io.TextIOBase, chunksize: int | None = None
+    ) -> pd.DataFrame | Iterator[pd.DataFrame]:
         columns: Columns = self.columns
         dtype: dict[str, type] = columns.dtype()
         dtype[columns.bank] = str  # type: ignore
         return pd.read_csv(
             data,
+            chunksize=chunksize,
             dayfirst=True,
             parse_dates=[columns.date],
             usecols=[columns.date, columns.amount, columns.description, columns.bank],
             dtype=dtype,
         )
 
+    def merge_chunks(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        return pd.concat(chunks)
+
 
 # class BradescoCreditCard():
 #     @property
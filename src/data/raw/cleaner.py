@@ -1,18 +1,27 @@
 from dataclasses import dataclass
 import io
-from functools import reduce, partial
-from typing import Callable, Optional, Protocol
+from functools import cache, lru_cache, reduce, partial
+import re
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Protocol,
+    runtime_checkable,
+)
 from unidecode import unidecode
 import i18n
+import numpy as np
 import pandas as pd
-import nltk
-from nltk.stem import RSLPStemmer
 
 from ..schema import DataSchema
+from .descriptions_cache import DESCRIPTIONS, signature
+from .nltk_resources import NLTK_RESOURCES
 
-nltk.download("punkt")
-nltk.download("stopwords")
-nltk.download("rslp")
+if TYPE_CHECKING:
+    from nltk.stem import RSLPStemmer
 
 
 @dataclass
@@ -44,12 +53,32 @@ class Bank(Protocol):
     @property
     def columns(self) -> Columns: ...
 
-    def reader(self, data: io.StringIO) -> pd.DataFrame: ...
+    def reader(self, data: io.TextIOBase) -> pd.DataFrame: ...
 
     @property
     def cleaner(self) -> Preprocessor: ...
 
 
+@runtime_checkable
+class ChunkedBank(Protocol):
+    """
+    Protocol interface for Bank classes whose files can be read and cleaned in chunks,
+    i.e. whose cleaning only looks at one row at a time.
+    """
+
+    @property
+    def encoding(self) -> str: ...
+
+    def reader(
+        self, data: io.TextIOBase, chunksize: int | None = None
+    ) -> pd.DataFrame | Iterator[pd.DataFrame]: ...
+
+    @property
+    def chunk_cleaner(self) -> Preprocessor: ...
+
+    def merge_chunks(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame: ...
+
+
 def compose(*functions: Preprocessor) -> Preprocessor:
     """
     Composes multiple preprocessing functions into a single preprocessing function.
@@ -64,49 +93,99 @@ def compose(*functions: Preprocessor) -> Preprocessor:
     return reduce(lambda f, g: lambda x: g(f(x)), functions)
 
 
+UNIMPORTANT_WORDS: tuple[str, ...] = (
+    "pix",
+    "enviado",
+    "enviada",
+    "transferencia",
+    "cobranca",
+    "referente",
+    "pacote",
+    "servicos",
+    "pagamento",
+    "banco",
+    "bol",
+    "ltda",
+    "conta",
+    "compra",
+    "cartao",
+    "pagto",
+    "pgto",
+    "estabelecimento",
+    "cp",
+    "bra",
+    "sa",
+    "pag",
+    "pelotas",
+    "ifd",
+    "marketplace",
+    "6produto",
+    "br",
+)
+
+GENERAL_PATTERNS: tuple[str, ...] = (
+    "\\b\\d{1,2}[-/.]\\d{1,2}[-/.]\\d{2,4}\\b",  # Remove dates
+    "[^a-z0-9 ]+",  # Remove punctuation
+    "[ ]{2,}",  # Remove extra whitespaces
+    "\\b\\w{1}\\b",  # Remove single letters
+    "\\b\\d+\\b",  # Remove isolated numbers
+    "\\s{0,}\\d{3,}\\s{0,}",  # Remove long numbers (like transaction IDs)
+    "\\b(r\\$|usd|brl)\\b",  # Remove currency symbols
+    "([\\w|\\W]+:)\\d+",
+    "\\d{2}[\\w|\\W]+\\s{1}\\d{2}h\\d{2}min",
+    "^.*?estabelecimento\\s{1}",
+    "^Pix .*-",
+    "-.*$",
+    "\\d{1,}gb mensal",
+    "redes sociais",
+)
+
+Substitution = tuple[re.Pattern, str]
+
+# bump it when tokenize, stem or the stopwords change the cleaned descriptions, so that the
+# ones in the descriptions cache are cleaned again
+CLEANING_VERSION: int = 1
+
+
+# NLTK is only imported, and its resources loaded, the first time a description is tokenized
+
+
+@cache
+def stopwords() -> frozenset[str]:
+    NLTK_RESOURCES.require("stopwords")
+    from nltk.corpus import stopwords as nltk_stopwords
+
+    return frozenset(UNIMPORTANT_WORDS + tuple(nltk_stopwords.words("portuguese")))
+
+
+@cache
+def stemmer() -> "RSLPStemmer":
+    NLTK_RESOURCES.require("rslp")
+    from nltk.stem import RSLPStemmer
+
+    return RSLPStemmer()
+
+
+@cache
+def word_tokenizer() -> Callable[[str], list[str]]:
+    NLTK_RESOURCES.require("punkt")
+    from nltk import word_tokenize
+
+    return word_tokenize
+
+
+@lru_cache(maxsize=2**16)
+def stem(word: str) -> str:
+    return stemmer().stem(word)
+
+
 def tokenize(text: str) -> str:
     """Tokenizes, stems, and cleans text into a list of tokens (words)."""
 
-    stemmer = RSLPStemmer()
-
-    words: list[str] = nltk.word_tokenize(text)
-
-    unimportant_words = set(
-        [
-            "pix",
-            "enviado",
-            "enviada",
-            "transferencia",
-            "cobranca",
-            "referente",
-            "pacote",
-            "servicos",
-            "pagamento",
-            "banco",
-            "bol",
-            "ltda",
-            "conta",
-            "compra",
-            "cartao",
-            "pagto",
-            "pgto",
-            "estabelecimento",
-            "cp",
-            "bra",
-            "sa",
-            "pag",
-            "pelotas",
-            "ifd",
-            "marketplace",
-            "6produto",
-            "br",
-        ]
-        + nltk.corpus.stopwords.words("portuguese")
-    )
+    words: list[str] = word_tokenizer()(text)
 
-    stemmed_words = [
-        stemmer.stem(word) for word in words if word not in unimportant_words
-    ]
+    unimportant_words: frozenset[str] = stopwords()
+    stemmed_words = [stem(word) for word in words if word not in unimportant_words]
 
     # Remove duplicates while preserving order
     unique_words = list(dict.fromkeys(stemmed_words))
@@ -114,64 +193,79 @@ def tokenize(text: str) -> str:
     return " ".join(unique_words)
 
 
+@lru_cache(maxsize=64)
+def compile_patterns(patterns: tuple[str, ...]) -> tuple[Substitution, ...]:
+    """
+    Compiles the bank's patterns (removed, case insensitive) followed by the general ones
+    (replaced by a whitespace), in the order they are applied.
+    """
+    return tuple(
+        [(re.compile(p, flags=re.IGNORECASE), "") for p in patterns]
+        + [(re.compile(gp), " ") for gp in GENERAL_PATTERNS]
+    )
+
+
+@lru_cache(maxsize=2**16)
+def remove_accents(word: str) -> str:
+    return word if word.isascii() else unidecode(word)
+
+
+def substitute(description: str, substitutions: tuple[Substitution, ...]) -> str:
+    """Removes the accents and the patterns from one lowercased and stripped description."""
+    # unidecode maps each character on its own, so it can be cached word by word
+    description = " ".join(remove_accents(word) for word in description.split(" "))
+    for pattern, replacement in substitutions:
+        description = pattern.sub(replacement, description)
+    return description.strip()
+
+
 def clean_descriptions(patterns: list[str], df: pd.DataFrame) -> pd.DataFrame:
     """
     Cleans the descriptions in the DataFrame by lowercasing, stripping, removing accents,
     applying specific patterns, removing punctuation, whitespaces, single letters,
     numbers, and then tokenizing the text.
-    """
 
-    def create_cleaned_description_column(descriptions: pd.Series) -> pd.Series:
-        return descriptions.str.lower().str.strip().astype(str)
-
-    def remove_accents(descriptions: pd.Series) -> pd.Series:
-        return descriptions.apply(unidecode)
-
-    def apply_user_defined_regex_patterns(
-        patterns: list[str], descriptions: pd.Series
-    ) -> pd.Series:
-        for p in patterns:
-            descriptions = descriptions.str.replace(p, "", regex=True, case=False)
-        return descriptions
-
-    def apply_general_regex_patterns(descriptions: pd.Series) -> pd.Series:
-        general_patterns = [
-            "\\b\\d{1,2}[-/.]\\d{1,2}[-/.]\\d{2,4}\\b",  # Remove dates
-            "[^a-z0-9 ]+",  # Remove punctuation
-            "[ ]{2,}",  # Remove extra whitespaces
-            "\\b\\w{1}\\b",  # Remove single letters
-            "\\b\\d+\\b",  # Remove isolated numbers
-            "\\s{0,}\\d{3,}\\s{0,}",  # Remove long numbers (like transaction IDs)
-            "\\b(r\$|usd|brl)\\b",  # Remove currency symbols
-            "([\\w|\\W]+:)\\d+",
-            "\\d{2}[\\w|\\W]+\\s{1}\\d{2}h\\d{2}min",
-            "^.*?estabelecimento\\s{1}",
-            "^Pix .*-",
-            "-.*$",
-            "\\d{1,}gb mensal",
-            "redes sociais",
-        ]
-        for gp in general_patterns:
-            descriptions = descriptions.str.replace(gp, " ", regex=True)
-        return descriptions
-
-    def tokenize_(descriptions: pd.Series) -> pd.Series:
-        return descriptions.str.strip().apply(tokenize)
-
-    clean_descriptions_preprocessor = compose(
-        create_cleaned_description_column,
-        remove_accents,
-        partial(apply_user_defined_regex_patterns, patterns),
-        apply_general_regex_patterns,
-        tokenize_,
-    )
-    df[DataSchema.CLEANED_DESCRIPTION] = clean_descriptions_preprocessor(
-        df[DataSchema.DESCRIPTION]
+    Each distinct description is cleaned only once, as statements repeat the same merchants,
+    and so is each distinct text left to tokenize (e.g. once the transaction ids are removed).
+    Descriptions cleaned before, in this or a previous session, are read from the persistent
+    descriptions cache.
+    """
+    descriptions: pd.Series = df[DataSchema.DESCRIPTION].str.lower().str.strip()
+    codes, uniques = pd.factorize(descriptions.astype(str))
+    cleaned: dict[str, str] = clean_unique_descriptions(patterns, uniques.tolist())
+    df[DataSchema.CLEANED_DESCRIPTION] = pd.Series(
+        np.array([cleaned[d] for d in uniques], dtype=object)[codes],
+        index=df.index,
+        dtype=object,
     )
 
     return df
 
 
+def cleaning_signature(patterns: list[str]) -> str:
+    """Identifies how descriptions are cleaned with the bank's patterns, in the cache."""
+    return signature(
+        patterns, GENERAL_PATTERNS, UNIMPORTANT_WORDS, [str(CLEANING_VERSION)]
+    )
+
+
+def clean_unique_descriptions(
+    patterns: list[str], descriptions: list[str]
+) -> dict[str, str]:
+    """Cleans the distinct, lowercased and stripped descriptions, going through the cache."""
+    key: str = cleaning_signature(patterns)
+    cleaned: dict[str, str] = DESCRIPTIONS.get_many(key, descriptions)
+
+    missing: list[str] = [d for d in descriptions if d not in cleaned]
+    substitutions: tuple[Substitution, ...] = compile_patterns(tuple(patterns))
+    texts: list[str] = [substitute(d, substitutions) for d in missing]
+    tokens: dict[str, str] = {text: tokenize(text) for text in dict.fromkeys(texts)}
+    new: dict[str, str] = {d: tokens[text] for d, text in zip(missing, texts)}
+
+    DESCRIPTIONS.put_many(key, new)
+    return cleaned | new
+
+
 def correct_amount_sign(df: pd.DataFrame) -> pd.DataFrame:
     """Correct amount sign for credit cards."""
     df.loc[:, DataSchema.AMOUNT] *= -1
@@ -0,0 +1,104 @@
+"""Persistent cache of cleaned descriptions, shared by the uploads and the predictor."""
+
+from collections.abc import Iterable
+from contextlib import closing
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+DESCRIPTIONS_CACHE_FILE: Path = Path.cwd() / "database" / "descriptions_cache.sqlite"
+MAX_ENTRIES: int = 200_000
+
+_BATCH_SIZE = 500  # below SQLite's limit of variables per statement
+
+
+def signature(*settings: Iterable[str]) -> str:
+    """Identifies the settings (patterns, stopwords...) a description was cleaned with."""
+    return hashlib.sha1(
+        json.dumps([list(s) for s in settings]).encode("utf-8")
+    ).hexdigest()
+
+
+class DescriptionsCache:
+    """
+    On-disk map of (settings signature, raw description) to the cleaned description.
+
+    Entries keep the time they were last used, and the least recently used ones are evicted
+    once there are more than `max_entries`. The cache only ever saves work: if the database
+    cannot be read or written, descriptions are simply cleaned again.
+    """
+
+    def __init__(self, path: Path, max_entries: int = MAX_ENTRIES) -> None:
+        self.path: Path = path
+        self.max_entries: int = max_entries
+
+    def connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=10)
+        try:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS descriptions ("
+                "signature TEXT, raw TEXT, cleaned TEXT, used REAL, "
+                "PRIMARY KEY (signature, raw))"
+            )
+        except BaseException:
+            connection.close()
+            raise
+        return connection
+
+    def get_many(self, signature: str, descriptions: list[str]) -> dict[str, str]:
+        """Returns the cached cleaned descriptions, marking them as just used."""
+        found: dict[str, str] = {}
+        try:
+            # the connection context only commits, closing it is left to `closing`
+            with closing(self.connect()) as connection, connection:
+                for i in range(0, len(descriptions), _BATCH_SIZE):
+                    batch: list[str] = descriptions[i : i + _BATCH_SIZE]
+                    rows = connection.execute(
+                        "SELECT raw, cleaned FROM descriptions WHERE signature = ? "
+                        f"AND raw IN ({', '.join('?' * len(batch))})",
+                        [signature, *batch],
+                    )
+                    found.update(rows)
+                connection.executemany(
+                    "UPDATE descriptions SET used = ? WHERE signature = ? AND raw = ?",
+                    [(time.time(), signature, raw) for raw in found],
+                )
+        except sqlite3.Error:
+            return {}
+        return found
+
+    def put_many(self, signature: str, cleaned: dict[str, str]) -> None:
+        if not cleaned:
+            return
+        try:
+            with closing(self.connect()) as connection, connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO descriptions VALUES (?, ?, ?, ?)",
+                    [(signature, raw, c, time.time()) for raw, c in cleaned.items()],
+                )
+                self.evict(connection)
+        except sqlite3.Error:
+            pass
+
+    def evict(self, connection: sqlite3.Connection) -> None:
+        (count,) = connection.execute("SELECT COUNT(*) FROM descriptions").fetchone()
+        if count <= self.max_entries:
+            return
+        connection.execute(
+            "DELETE FROM descriptions WHERE rowid IN "
+            "(SELECT rowid FROM descriptions ORDER BY used LIMIT ?)",
+            [count - self.max_entries],
+        )
+
+    def __len__(self) -> int:
+        with closing(self.connect()) as connection:
+            (count,) = connection.execute(
+                "SELECT COUNT(*) FROM descriptions"
+            ).fetchone()
+        return count
+
+
+DESCRIPTIONS = DescriptionsCache(DESCRIPTIONS_CACHE_FILE)
@@ -0,0 +1,97 @@
+"""
+Offline manager of the NLTK resources the cleaner needs, loaded on first use.
+
+Usage (to vendor the resources, e.g. before deploying to a host without network):
+    python -m src.data.raw.nltk_resources [--dir DIR]
+"""
+
+import argparse
+import os
+import threading
+from pathlib import Path
+
+NLTK_DATA_DIR: Path = Path.cwd() / "nltk_data"
+
+# name: path of the resource in an NLTK data directory
+RESOURCES: dict[str, str] = {
+    "punkt": "tokenizers/punkt",
+    "stopwords": "corpora/stopwords",
+    "rslp": "stemmers/rslp",
+}
+
+
+class MissingResourceError(LookupError):
+    def __init__(self, name: str, data_dir: Path) -> None:
+        super().__init__(
+            f"The NLTK resource {name!r} is not installed. Vendor it into {data_dir} with "
+            "`python -m src.data.raw.nltk_resources`."
+        )
+
+
+class NLTKResources:
+    """
+    Finds the NLTK resources in the local data directory first, then in NLTK's own ones.
+
+    Nothing is looked up, let alone downloaded, until a resource is first required. A missing
+    resource is then downloaded into the local data directory, unless `download` is False
+    (set NLTK_OFFLINE=1 on hosts without network), in which case it must be vendored first.
+    """
+
+    def __init__(self, data_dir: Path, download: bool = True) -> None:
+        self.data_dir: Path = data_dir
+        self.download: bool = download
+        self._found: set[str] = set()
+        self._lock = threading.Lock()
+
+    def require(self, name: str) -> None:
+        """Makes sure the resource can be loaded by NLTK, raising MissingResourceError if not."""
+        if name in self._found:
+            return
+        import nltk
+
+        with self._lock:
+            if str(self.data_dir) not in nltk.data.path:
+                nltk.data.path.insert(0, str(self.data_dir))
+            try:
+                nltk.data.find(RESOURCES[name])
+            except LookupError:
+                if not self.download or not self.fetch(name):
+                    raise MissingResourceError(name, self.data_dir) from None
+            self._found.add(name)
+
+    def fetch(self, name: str) -> bool:
+        """Downloads the resource into the local data directory."""
+        import nltk
+
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            return bool(nltk.download(name, download_dir=self.data_dir, quiet=True))
+        except (OSError, ValueError):
+            return False
+
+    def vendor(self) -> list[str]:
+        """
+        Downloads every resource into the local data directory.
+
+        Returns:
+            list[str]: The resources that could not be downloaded.
+        """
+        return [name for name in RESOURCES if not self.fetch(name)]
+
+
+NLTK_RESOURCES = NLTKResources(NLTK_DATA_DIR, download=not os.getenv("NLTK_OFFLINE"))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Vendors the NLTK resources.")
+    parser.add_argument("--dir", type=Path, default=NLTK_DATA_DIR)
+    args = parser.parse_args(argv)
+
+    failed: list[str] = NLTKResources(args.dir).vendor()
+    if failed:
+        parser.exit(1, f"Could not download {', '.join(failed)}\n")
+    print(f"Vendored {', '.join(RESOURCES)} into {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""
+Synthetic bank statements and credit card bills, in the formats of the BANKS registry.
+
+Every writer lays out synthetic transactions the way the bank exports them (encoding,
+separator, decimal and thousands marks, lines before the header, balance rows...), with the
+description noise the bank's patterns remove, so the files go through the bank's reader and
+cleaner like real uploads. Statements mix expenses and incomes; bills have installments of
+older purchases and the payment of the previous bill.
+
+Usage (to load-test the uploads, the cleaning and the predictions offline):
+    python -m src.data.raw.statements [--rows 10000] [--merchants 1000] [--seed 0]
+                                      [--bank NAME ...] [--output DIR]
+"""
+
+import argparse
+import base64
+import csv
+from pathlib import Path
+from typing import Callable
+import numpy as np
+import pandas as pd
+
+from ..schema import DataSchema
+from ..synthetic import synthetic_ledger
+from .banks import (
+    BANKS,
+    BBStatement,
+    C6CreditCard,
+    CoraStatement,
+    InterStatement,
+    NuCreditCard,
+    NuStatement,
+    SicrediCreditCard,
+)
+from .cleaner import Bank
+
+INCOME_SHARE = 0.1  # of the statement rows
+INSTALLMENT_SHARE = 0.15  # of the bill rows
+BILL_CLOSING = pd.Timestamp(2024, 12, 5)
+OUTPUT_DIR: Path = Path.cwd() / "synthetic_statements"
+
+# lays out the transactions: date, description, amount (negative for expenses on statements,
+# positive for purchases on bills), income (statements) or installment (bills)
+Writer = Callable[[pd.DataFrame], str]
+
+
+def random_days(rng: np.random.Generator, df: pd.DataFrame) -> pd.Series:
+    """A date in the year and month of each ledger row."""
+    return pd.to_datetime(
+        pd.DataFrame(
+            {
+                "year": df[DataSchema.YEAR],
+                "month": df[DataSchema.MONTH],
+                "day": rng.integers(1, 29, len(df)),
+            }
+        )
+    )
+
+
+def account_transactions(
+    rows: int, merchants: int = 1_000, seed: int = 0
+) -> pd.DataFrame:
+    """The expenses and incomes of a bank account, in chronological order."""
+    rng: np.random.Generator = np.random.default_rng(seed)
+    n_incomes: int = int(rows * INCOME_SHARE)
+    expenses: pd.DataFrame = synthetic_ledger(
+        rows - n_incomes, merchants=merchants, seed=seed
+    )
+    incomes: pd.DataFrame = synthetic_ledger(
+        n_incomes, kind="incomes", merchants=max(merchants // 10, 1), seed=seed + 1
+    )
+    df = pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    DataSchema.DATE: random_days(rng, expenses),
+                    DataSchema.DESCRIPTION: expenses[DataSchema.DESCRIPTION],
+                    DataSchema.AMOUNT: -expenses[DataSchema.AMOUNT],
+                    "income": False,
+                }
+            ),
+            pd.DataFrame(
+                {
+                    DataSchema.DATE: random_days(rng, incomes),
+                    DataSchema.DESCRIPTION: incomes[DataSchema.DESCRIPTION],
+                    DataSchema.AMOUNT: incomes[DataSchema.AMOUNT],
+                    "income": True,
+                }
+            ),
+        ]
+    )
+    return df.sort_values(DataSchema.DATE, kind="stable", ignore_index=True)
+
+
+def bill_transactions(
+    rows: int,
+    payment_description: str,
+    merchants: int = 1_000,
+    seed: int = 0,
+    closing: pd.Timestamp = BILL_CLOSING,
+) -> pd.DataFrame:
+    """
+    The purchases of a credit card bill closing on the given date, in chronological order.
+
+    Installments ("k/n") keep the date of their purchase, k - 1 months earlier. The first row
+    is the payment of the previous bill, described as the bank describes it.
+    """
+    rng: np.random.Generator = np.random.default_rng(seed)
+    purchases: pd.DataFrame = synthetic_ledger(rows, merchants=merchants, seed=seed)
+    dates: pd.Series = closing - pd.to_timedelta(rng.integers(1, 31, rows), unit="D")
+
+    is_installment: np.ndarray = rng.random(rows) < INSTALLMENT_SHARE
+    count: np.ndarray = rng.integers(2, 13, rows)
+    number: np.ndarray = rng.integers(1, count + 1)
+    installment = pd.Series(
+        np.char.add(np.char.add(number.astype(str), "/"), count.astype(str)),
+        dtype=object,
+    ).where(is_installment, "")
+    dates = dates - pd.to_timedelta(
+        np.where(is_installment, number - 1, 0) * 30, unit="D"
+    )
+
+    df = pd.DataFrame(
+        {
+            DataSchema.DATE: dates,
+            DataSchema.DESCRIPTION: purchases[DataSchema.DESCRIPTION],
+            DataSchema.AMOUNT: purchases[DataSchema.AMOUNT],
+            "installment": installment,
+        }
+    ).sort_values(DataSchema.DATE, kind="stable", ignore_index=True)
+    payment = pd.DataFrame(
+        {
+            DataSchema.DATE: [closing - pd.Timedelta(days=25)],
+            DataSchema.DESCRIPTION: [payment_description],
+            DataSchema.AMOUNT: [-round(float(df[DataSchema.AMOUNT].sum()), 2)],
+            "installment": [""],
+        }
+    )
+    return pd.concat([payment, df], ignore_index=True)
+
+
+def brazilian(amounts: pd.Series) -> pd.Series:
+    """Formats the amounts as 1.234,56."""
+    return amounts.map("{:,.2f}".format).str.translate(str.maketrans(",.", ".,"))
+
+
+def day_first(dates: pd.Series) -> pd.Series:
+    return dates.dt.strftime("%d/%m/%Y")
+
+
+def document_numbers(df: pd.DataFrame, seed: int = 0) -> pd.Series:
+    return pd.Series(
+        np.random.default_rng(seed).integers(10**5, 10**9, len(df)), index=df.index
+    ).astype(str)
+
+
+def write_bb(df: pd.DataFrame) -> str:
+    times: pd.Series = df[DataSchema.DATE].dt.strftime("%d/%m ") + "12:00"
+    descriptions: pd.Series = ("Compra com Cartão - " + times + " ").where(
+        ~df["income"], "Pix - Recebido - " + times + " "
+    ) + df[DataSchema.DESCRIPTION]
+    balance: float = 1_000.0
+    first, last = df[DataSchema.DATE].iloc[0], df[DataSchema.DATE].iloc[-1]
+    rows = pd.DataFrame(
+        {
+            "Data": pd.concat(
+                [
+                    pd.Series([first.strftime("%d/%m/%Y")]),
+                    day_first(df[DataSchema.DATE]),
+                    pd.Series([last.strftime("%d/%m/%Y")]),
+                ],
+                ignore_index=True,
+            ),
+            "Dependencia Origem": "",
+            # the first and last rows are the balances of the account
+            "Histórico": ["Saldo Anterior", *descriptions, "S A L D O"],
+            "Data do Balancete": "",
+            "Número do documento": ["0", *document_numbers(df), "0"],
+            "Valor": [
+                balance,
+                *df[DataSchema.AMOUNT],
+                round(balance + df[DataSchema.AMOUNT].sum(), 2),
+            ],
+        }
+    )
+    return rows.to_csv(index=False, quoting=csv.QUOTE_ALL, float_format="%.2f")
+
+
+def write_nubank(df: pd.DataFrame) -> str:
+    pix: pd.Series = pd.Series(np.arange(len(df)) % 3 == 0, index=df.index)
+    descriptions: pd.Series = (
+        ("Compra no débito - " + df[DataSchema.DESCRIPTION])
+        .where(
+            ~pix,
+            "Transferência enviada pelo Pix - "
+            + df[DataSchema.DESCRIPTION]
+            + " - •••.123.456-•• - BCO DO BRASIL S.A. (0001) Agência: 1 Conta: 12345-6",
+        )
+        .where(
+            ~df["income"],
+            "Transferência recebida pelo Pix - "
+            + df[DataSchema.DESCRIPTION]
+            + " - •••.654.321-•• - NU PAGAMENTOS - IP (0260)",
+        )
+    )
+    return pd.DataFrame(
+        {
+            "Data": day_first(df[DataSchema.DATE]),
+            "Valor": df[DataSchema.AMOUNT],
+            "Identificador": df.index.map("{:032x}".format),
+            "Descrição": descriptions,
+        }
+    ).to_csv(index=False, float_format="%.2f")
+
+
+def write_inter(df: pd.DataFrame) -> str:
+    df = df.iloc[::-1]  # most recent first
+    balance: pd.Series = 1_000.0 + df[DataSchema.AMOUNT][::-1].cumsum()[::-1]
+    descriptions: pd.Series = (
+        "Compra no debito No estabelecimento " + df[DataSchema.DESCRIPTION]
+    ).where(~df["income"], "Pix recebido: Cp :00000000-" + df[DataSchema.DESCRIPTION])
+    first, last = df[DataSchema.DATE].iloc[-1], df[DataSchema.DATE].iloc[0]
+    preamble: str = (
+        "Extrato Conta Corrente \n"
+        "Conta ;12345678\n"
+        f"Período ;{first:%d/%m/%Y} a {last:%d/%m/%Y}\n"
+        f"Saldo ;{brazilian(balance.iloc[:1]).iloc[0]}\n"
+    )
+    return preamble + pd.DataFrame(
+        {
+            "Data Lançamento": day_first(df[DataSchema.DATE]),
+            "Descrição": descriptions,
+            "Valor": brazilian(df[DataSchema.AMOUNT]),
+            "Saldo": brazilian(balance),
+        }
+    ).to_csv(index=False, sep=";")
+
+
+def write_cora(df: pd.DataFrame) -> str:
+    return pd.DataFrame(
+        {
+            "Data": day_first(df[DataSchema.DATE]),
+            "Transação": df["income"].map({False: "Compra", True: "Pix recebido"}),
+            "Tipo Transação": df["income"].map({False: "Débito", True: "Crédito"}),
+            "Identificação": df[DataSchema.DESCRIPTION],
+            "Valor": df[DataSchema.AMOUNT],
+        }
+    ).to_csv(index=False, float_format="%.2f")
+
+
+def write_c6(df: pd.DataFrame) -> str:
+    return pd.DataFrame(
+        {
+            "Data de Compra": day_first(df[DataSchema.DATE]),
+            "Nome no Cartão": "TITULAR",
+            "Final do Cartão": "1234",
+            "Categoria": "",
+            "Descrição": df[DataSchema.DESCRIPTION],
+            "Parcela": df["installment"].where(df["installment"] != "", "Única"),
+            "Valor (em US$)": "0",
+            "Cotação (em R$)": "0",
+            "Valor (em R$)": df[DataSchema.AMOUNT],
+        }
+    ).to_csv(index=False, sep=";", float_format="%.2f")
+
+
+def write_nubank_card(df: pd.DataFrame) -> str:
+    titles: pd.Series = df[DataSchema.DESCRIPTION].where(
+        np.arange(len(df)) % 5 != 1, "Pg *" + df[DataSchema.DESCRIPTION]
+    )
+    titles = titles.where(
+        df["installment"] == "", titles + " - Parcela " + df["installment"]
+    )
+    return pd.DataFrame(
+        {
+            "date": df[DataSchema.DATE].dt.strftime("%Y-%m-%d"),
+            "category": "",
+            "title": titles,
+            "amount": df[DataSchema.AMOUNT],
+        }
+    ).to_csv(index=False, float_format="%.2f")
+
+
+def write_sicredi(df: pd.DataFrame) -> str:
+    amounts: pd.Series = df[DataSchema.AMOUNT]
+    values: pd.Series = ("R$ " + brazilian(amounts)).where(
+        amounts >= 0, "-R$ " + brazilian(-amounts)
+    )
+    descriptions: pd.Series = df[DataSchema.DESCRIPTION].where(
+        df["installment"] == "", df[DataSchema.DESCRIPTION] + " " + df["installment"]
+    )
+    preamble: str = (
+        "Sicredi - Fatura do cartão de crédito\n"
+        "Associado: TITULAR\n"
+        "Cartão: 1234 XXXX XXXX 5678\n"
+        f"Vencimento: {BILL_CLOSING + pd.Timedelta(days=10):%d/%m/%Y}\n"
+    ) + ";\n" * 14
+    return preamble + pd.DataFrame(
+        {
+            " Data ": day_first(df[DataSchema.DATE]),
+            " Estabelecimento ": descriptions,
+            " Portador ": "TITULAR",
+            " Valor ": values,
+            " Valor em US$ ": "US$ 0,00",
+        }
+    ).to_csv(index=False, sep=";")
+
+
+WRITERS: dict[type, Writer] = {
+    BBStatement: write_bb,
+    NuStatement: write_nubank,
+    InterStatement: write_inter,
+    CoraStatement: write_cora,
+    C6CreditCard: write_c6,
+    NuCreditCard: write_nubank_card,
+    SicrediCreditCard: write_sicredi,
+}
+
+
+def synthetic_statement(
+    bank: Bank, rows: int, merchants: int = 1_000, seed: int = 0
+) -> bytes:
+    """
+    A statement (or a bill, for credit cards) of the bank, encoded like the bank's files.
+
+    Args:
+        bank (Bank): A bank of the BANKS registry.
+        rows (int): The number of transactions, besides the balance and payment rows.
+        merchants (int, optional): The number of distinct merchants. Defaults to 1_000.
+        seed (int, optional): The seed of the random transactions. Defaults to 0.
+
+    Raises:
+        ValueError: If there is no transaction, as the statements state their period.
+    """
+    if rows < 1:
+        raise ValueError(f"A statement needs at least one transaction, not {rows}.")
+    payment_description: str | None = getattr(bank, "payment_description", None)
+    df: pd.DataFrame = (
+        account_transactions(rows, merchants, seed)
+        if payment_description is None
+        else bill_transactions(rows, payment_description, merchants, seed)
+    )
+    return WRITERS[type(bank)](df).encode(bank.encoding)
+
+
+def data_url(content: bytes) -> str:
+    """The content as the upload components send it to the callbacks."""
+    return "data:text/csv;base64," + base64.b64encode(content).decode("ascii")
+
+
+def main(argv: list[str] | None = None) -> None:
+    names: list[str] = sorted({name for banks in BANKS.values() for name in banks})
+    parser = argparse.ArgumentParser(description="Writes synthetic bank statements.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--merchants", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bank", nargs="+", choices=names, default=names)
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR)
+    args = parser.parse_args(argv)
+    if args.rows < 1:
+        parser.error("--rows must be at least 1")
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    for modal, banks in BANKS.items():
+        for name, bank in banks.items():
+            if name not in args.bank:
+                continue
+            path: Path = args.output / f"{modal}-{name.lower().replace(' ', '_')}.csv"
+            path.write_bytes(
+                synthetic_statement(bank, args.rows, args.merchants, args.seed)
+            )
+            print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
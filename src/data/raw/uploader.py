@@ -1,13 +1,44 @@
 import base64
+from concurrent.futures import ProcessPoolExecutor
 import io
+from itertools import repeat
+import multiprocessing
+import os
+from pathlib import Path
+import i18n
 import pandas as pd
 
 from src.data.raw.cleaner import (
     Bank,
+    ChunkedBank,
     extract_expenses,
     extract_incomes,
 )
 
+DECODE_BLOCK_SIZE: int = 4 * 2**18  # base64 characters decoded at a time (1 MiB)
+
+
+def decode(content: str, encoding: str) -> io.TextIOWrapper:
+    """
+    Decodes a base64 upload incrementally into a byte buffer.
+
+    The upload is never copied as a whole: each block of the base64 string is decoded into
+    the buffer, which is then read as text in the given encoding while it is parsed.
+
+    Args:
+        content (str): The data URL of the upload ("data:<type>;base64,<data>").
+        encoding (str): The encoding of the uploaded file.
+
+    Returns:
+        io.TextIOWrapper: The decoded file.
+    """
+    buffer = io.BytesIO()
+    start: int = content.index(",") + 1
+    for i in range(start, len(content), DECODE_BLOCK_SIZE):
+        buffer.write(base64.b64decode(content[i : i + DECODE_BLOCK_SIZE]))
+    buffer.seek(0)
+    return io.TextIOWrapper(buffer, encoding=encoding)
+
 
 def parse(content: str, bank: Bank) -> pd.DataFrame:
     """
@@ -20,24 +51,149 @@ def parse(content: str, bank: Bank) -> pd.DataFrame:
     Returns:
         pd.DataFrame: The parsed data as a pandas DataFrame.
     """
-    _, content_string = content.split(",")
-    decoded_data: str = base64.b64decode(content_string).decode(bank.encoding)
-    df: pd.DataFrame = bank.reader(io.StringIO(decoded_data))
-    return df
+    return bank.reader(decode(content, bank.encoding))
+
+
+def upload_chunksize() -> int:
+    """Number of rows read and cleaned at a time, set by UPLOAD_CHUNKSIZE."""
+    return int(os.getenv("UPLOAD_CHUNKSIZE", 50_000))
+
+
+def parse_and_clean(content: str, bank: Bank) -> pd.DataFrame:
+    """
+    Reads and cleans the uploaded file, chunk by chunk when the bank supports it, so that
+    only one chunk of raw rows is held in memory at a time.
+    """
+    if not isinstance(bank, ChunkedBank):
+        return bank.cleaner(parse(content, bank))
+    chunks = bank.reader(decode(content, bank.encoding), chunksize=upload_chunksize())
+    return bank.merge_chunks(bank.chunk_cleaner(chunk) for chunk in chunks)
+
+
+class UploadError(ValueError):
+    """
+    Raised when some of the uploaded files could not be read.
+
+    Attributes:
+        failures (dict[str, str]): The error message of each file that failed.
+        expenses (pd.DataFrame): The expenses of the files that were read.
+        incomes (pd.DataFrame): The incomes of the files that were read.
+    """
+
+    def __init__(
+        self,
+        failures: dict[str, str],
+        expenses: pd.DataFrame,
+        incomes: pd.DataFrame,
+    ) -> None:
+        super().__init__(
+            "; ".join(f"{name}: {error}" for name, error in failures.items())
+        )
+        self.failures: dict[str, str] = failures
+        self.expenses: pd.DataFrame = expenses
+        self.incomes: pd.DataFrame = incomes
+
+
+def upload_workers() -> int:
+    """Number of processes used to read the uploaded files, set by UPLOAD_WORKERS."""
+    return int(os.getenv("UPLOAD_WORKERS", os.cpu_count() or 1))
+
+
+def pool_context() -> multiprocessing.context.BaseContext:
+    """The forkserver start method where it is available (not on Windows), else spawn."""
+    methods: list[str] = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+
+
+def init_worker(locale: str, load_path: list[Path]) -> None:
+    """
+    Sets up the translations of a reading process like in the server, since the processes
+    are not forked from it (the cleaners write translated labels).
+    """
+    i18n.set("locale", locale)  # type: ignore
+    i18n.set("load_path", load_path)  # type: ignore
 
 
-def upload_bank_data(bank: Bank, contents: list[str]) -> tuple[pd.DataFrame, ...]:
+def read_bank_file(bank: Bank, content: str) -> pd.DataFrame | str:
+    """
+    Decodes, reads and cleans one uploaded file.
+
+    Returns:
+        pd.DataFrame | str: The cleaned data, or the error message if the file could not be
+        read with the given bank.
+    """
+    try:
+        return parse_and_clean(content, bank)
+    except Exception as e:  # a malformed file must not fail the other ones
+        return f"{type(e).__name__}: {e}"
+
+
+def read_bank_files(
+    bank: Bank, contents: list[str], workers: int | None = None
+) -> list[pd.DataFrame | str]:
+    """
+    Reads the uploaded files, in parallel processes when there are several of them.
+
+    The processes are not forked from the server, whose threads could hold locks that would
+    never be released in the children.
+
+    Args:
+        bank (Bank): The bank object used to read every file.
+        contents (list[str]): The contents of the uploaded files.
+        workers (int | None, optional): The number of processes. Defaults to upload_workers().
+
+    Returns:
+        list[pd.DataFrame | str]: The result of read_bank_file for each file, in the order
+        of the contents.
+    """
+    workers = min(upload_workers() if workers is None else workers, len(contents))
+    if workers <= 1:
+        return [read_bank_file(bank, content) for content in contents]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=pool_context(),
+        initializer=init_worker,
+        initargs=(i18n.get("locale"), list(i18n.get("load_path"))),
+    ) as executor:
+        return list(executor.map(read_bank_file, repeat(bank), contents))
+
+
+def upload_bank_data(
+    bank: Bank,
+    contents: list[str],
+    filenames: list[str] | None = None,
+    workers: int | None = None,
+) -> tuple[pd.DataFrame, ...]:
     """
     Uploads bank data as a tuple of pandas DataFrames containing expenses and incomes.
 
     Args:
         bank (Bank): The bank object representing the bank from which the data is being uploaded.
         contents (list[str]): A list of strings containing the contents of the bank data.
+        filenames (list[str] | None, optional): The names of the uploaded files, used to report
+            the files that failed. Defaults to their position in the upload.
+        workers (int | None, optional): The number of processes reading the files.
 
     Returns:
         tuple[pd.DataFrame, ...]: A tuple containing two pandas DataFrames: one for expenses and one for incomes.
+
+    Raises:
+        UploadError: If any of the files could not be read. It holds the data of the other files.
     """
-    df: pd.DataFrame = pd.concat(
-        [bank.cleaner(parse(content, bank)) for content in contents]
-    )
-    return extract_expenses(df), extract_incomes(df)
+    names: list[str] = filenames or [f"#{i}" for i in range(1, len(contents) + 1)]
+    results: list[pd.DataFrame | str] = read_bank_files(bank, contents, workers)
+
+    frames: list[pd.DataFrame] = [r for r in results if isinstance(r, pd.DataFrame)]
+    failures: dict[str, str] = {
+        name: result for name, result in zip(names, results) if isinstance(result, str)
+    }
+    if not frames:
+        raise UploadError(failures, pd.DataFrame(), pd.DataFrame())
+
+    df: pd.DataFrame = pd.concat(frames)
+    expenses, incomes = extract_expenses(df), extract_incomes(df)
+    if failures:
+        raise UploadError(failures, expenses, incomes)
+    return expenses, incomes
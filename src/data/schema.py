@@ -12,3 +12,4 @@ class DataSchema:
     RECURRENT = "recurrent"
     CLEANED_DESCRIPTION = "cleaned_description"
     TYPE = "type"
+    CONFIDENCE = "confidence"
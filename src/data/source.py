@@ -1,31 +1,47 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 import os
 import babel.dates
 import pandas as pd
 
+from .ledger import with_ledger_dtypes
 from .schema import DataSchema
-from .categorize.finder import find_category
+from .categorize.finder import map_categories
 
 
 @dataclass
 class DataSource:
-    """Group of functions related to managing data during callbacks."""
+    """
+    Group of functions related to managing data during callbacks.
 
-    _data: list[dict]
+    The DataFrame is materialized (with the ledger dtypes) only once, on first use, and the
+    year/month views derived from it are memoized. Both are shared between calls, so they
+    must be treated as read-only.
+    """
+
+    _data: list[dict] | pd.DataFrame
+    _views: dict[tuple, pd.DataFrame] = field(
+        default_factory=dict, init=False, repr=False
+    )
 
     @property
     def table_data(self) -> list[dict]:
+        if isinstance(self._data, pd.DataFrame):
+            return self._data.to_dict("records")
         return self._data
 
-    @property
+    @cached_property
     def dataframe(self) -> pd.DataFrame:
-        return pd.DataFrame.from_records(self.table_data)
+        if isinstance(self._data, pd.DataFrame):
+            return with_ledger_dtypes(self._data)
+        return with_ledger_dtypes(pd.DataFrame.from_records(self._data))
 
     def drop_columns(self) -> None:
         columns_to_drop: list[str] = [DataSchema.DATE, DataSchema.CLEANED_DESCRIPTION]
-        self.dataframe.drop(columns=columns_to_drop, inplace=True, errors="ignore")
+        self.dataframe = self.dataframe.drop(columns=columns_to_drop, errors="ignore")
+        self._views.clear()
 
     def save_data(self, file_path: str) -> None:
         self.drop_columns()
@@ -40,20 +56,25 @@ class DataSource:
     def is_empty(self) -> bool:
         return self.dataframe.empty
 
-    @property
+    @cached_property
     def unique_years(self) -> list[int]:
         return self.dataframe[DataSchema.YEAR].unique().tolist()
 
     def filter_year(self, year: int) -> pd.DataFrame:
-        return self.dataframe.query("year == @year")
+        if (year,) not in self._views:
+            df: pd.DataFrame = self.dataframe
+            self._views[(year,)] = df.loc[df[DataSchema.YEAR] == year]
+        return self._views[(year,)]
 
     def unique_months_from_year(self, year: int) -> list[int]:
         df: pd.DataFrame = self.filter_year(year)
         return df[DataSchema.MONTH].unique().tolist()
 
     def filter_month_and_year(self, year: int, month: int) -> pd.DataFrame:
-        df: pd.DataFrame = self.filter_year(year)
-        return df.query("month == @month")
+        if (year, month) not in self._views:
+            df: pd.DataFrame = self.filter_year(year)
+            self._views[(year, month)] = df.loc[df[DataSchema.MONTH] == month]
+        return self._views[(year, month)]
 
     def total_month_amount(self, year: int, month: int) -> float:
         df: pd.DataFrame = self.filter_month_and_year(year, month)
@@ -61,22 +82,22 @@ class DataSource:
 
     def month_expense_by_subcat(self, year: int, month: int) -> pd.DataFrame:
         df_month: pd.DataFrame = self.filter_month_and_year(year, month)
-        df_month_sum: pd.DataFrame = df_month.groupby(by=DataSchema.SUBCATEGORY).sum(
-            numeric_only=True
-        )
-        df_month_sum.reset_index(inplace=True)
+        df_month_sum: pd.DataFrame = df_month.groupby(
+            by=DataSchema.SUBCATEGORY, observed=True
+        ).sum(numeric_only=True)
+        df_month_sum = decategorize(df_month_sum.reset_index())
         df_month_sum.sort_values(by=DataSchema.AMOUNT, inplace=True)
-        df_month_sum.loc[:, DataSchema.CATEGORY] = df_month_sum[
-            DataSchema.SUBCATEGORY
-        ].apply(find_category)
+        df_month_sum.loc[:, DataSchema.CATEGORY] = map_categories(
+            df_month_sum[DataSchema.SUBCATEGORY]
+        )
         return df_month_sum
 
     def evolution(self, year: int) -> pd.DataFrame:
         df: pd.DataFrame = self.filter_year(year)
         dff: pd.DataFrame = df.groupby(
-            [DataSchema.MONTH, DataSchema.RECURRENT, DataSchema.TYPE]
+            [DataSchema.MONTH, DataSchema.RECURRENT, DataSchema.TYPE], observed=True
         ).sum(numeric_only=True)
-        dff.reset_index(inplace=True)
+        dff = decategorize(dff.reset_index())
         dff[DataSchema.MONTH] = dff[DataSchema.MONTH].apply(self.convert_month_locale)
         return dff
 
@@ -88,25 +109,33 @@ class DataSource:
 
     def month_income_by_category(self, month: int, year: int) -> pd.DataFrame:
         df: pd.DataFrame = self.filter_month_and_year(year, month)
-        df_cat: pd.DataFrame = df.groupby(by=DataSchema.CATEGORY).sum(numeric_only=True)
-        df_cat.reset_index(inplace=True)
+        df_cat: pd.DataFrame = df.groupby(by=DataSchema.CATEGORY, observed=True).sum(
+            numeric_only=True
+        )
+        df_cat = decategorize(df_cat.reset_index())
         df_cat.sort_values(DataSchema.AMOUNT, inplace=True)
         return df_cat
 
     def evolution_per_category(self, year: int) -> pd.DataFrame:
         df: pd.DataFrame = self.filter_year(year)
-        dff: pd.DataFrame = df.groupby(by=[DataSchema.MONTH, DataSchema.CATEGORY]).sum(
-            numeric_only=True
-        )
-        dff.reset_index(inplace=True)
+        dff: pd.DataFrame = df.groupby(
+            by=[DataSchema.MONTH, DataSchema.CATEGORY], observed=True
+        ).sum(numeric_only=True)
+        dff = decategorize(dff.reset_index())
         dff.loc[:, DataSchema.AMOUNT] = dff[DataSchema.AMOUNT].round(2)
         dff[DataSchema.MONTH] = dff[DataSchema.MONTH].apply(self.convert_month_locale)
         return dff
 
     def yearly_evolution(self) -> pd.DataFrame:
         dff: pd.DataFrame = self.dataframe.groupby(
-            by=[DataSchema.YEAR, DataSchema.TYPE]
+            by=[DataSchema.YEAR, DataSchema.TYPE], observed=True
         ).sum(numeric_only=True)
-        dff.reset_index(inplace=True)
+        dff = decategorize(dff.reset_index())
         dff.loc[:, DataSchema.AMOUNT] = dff[DataSchema.AMOUNT].round(2)
         return dff
+
+
+def decategorize(df: pd.DataFrame) -> pd.DataFrame:
+    """Turns the categorical group keys of an aggregation back into plain labels for plotting."""
+    categorical: list[str] = df.select_dtypes("category").columns.tolist()
+    return df.astype({column: object for column in categorical})
@@ -0,0 +1,175 @@
+"""
+Synthetic ledgers, to benchmark and load-test the app without real bank data.
+
+The same arguments always give the same rows. Each merchant has a fixed subcategory, so the
+subcategory model can learn them, and merchants come up with a long-tailed frequency, as in
+real statements where a few of them make most of the transactions.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .categorize.expenses_categories import CATEGORIES, RECURRENT_SUBCATEGORIES
+from .codes import RECURRENT_KEYS, labels
+from .ledger import to_ledger_dtypes
+from .schema import DataSchema
+
+BANK_NAMES: tuple[str, ...] = (
+    "Banco do Brasil",
+    "Nubank",
+    "Inter",
+    "Cora",
+    "C6",
+    "Sicredi",
+)
+
+# (merchant prefix, subcategory or income category, typical amount)
+EXPENSE_KINDS: tuple[tuple[str, str, float], ...] = (
+    ("Supermercado", "groceries", 180.0),
+    ("Mercado", "groceries", 60.0),
+    ("Padaria", "dining_out", 25.0),
+    ("Restaurante", "dining_out", 70.0),
+    ("Posto", "gas", 200.0),
+    ("Drogaria", "medications", 60.0),
+    ("Academia", "fitness", 120.0),
+    ("Loja", "clothing", 150.0),
+    ("Uber", "ride_sharing", 25.0),
+    ("Cinema", "movies_and_shows", 40.0),
+    ("Bar", "bars_pubs", 80.0),
+    ("Pet Shop", "pets", 90.0),
+    ("Livraria", "studies", 70.0),
+    ("Hotel", "lodging_travel", 500.0),
+    ("Energia", "electricity", 180.0),
+    ("Telefonia", "mobile_cell_phone", 60.0),
+    ("Streaming", "subscriptions", 40.0),
+    ("Oficina", "auto_maintenance", 400.0),
+)
+INCOME_KINDS: tuple[tuple[str, str, float], ...] = (
+    ("Salario", "salary", 8000.0),
+    ("Pix Recebido", "freelance", 1500.0),
+    ("Cashback", "cashback", 30.0),
+    ("Rendimento", "return_on_investments", 200.0),
+    ("Aluguel Recebido", "rental", 2000.0),
+)
+
+NAMES: tuple[str, ...] = (
+    "Bom Preco",
+    "Sao Jorge",
+    "Central",
+    "Boa Vista",
+    "Estrela",
+    "Primavera",
+    "Aurora",
+    "Do Bairro",
+    "Paulista",
+    "Sol Nascente",
+    "Imperial",
+    "Nova Era",
+)
+CITIES: tuple[str, ...] = (
+    "Sao Paulo",
+    "Curitiba",
+    "Recife",
+    "Porto Alegre",
+    "Salvador",
+    "Belo Horizonte",
+    "Florianopolis",
+    "Fortaleza",
+)
+
+
+def merchant_names(count: int, prefixes: list[str]) -> list[str]:
+    """Distinct merchant names, the i-th one starting with the (i mod len)-th prefix."""
+    names: list[str] = []
+    for i in range(count):
+        j: int = i // len(prefixes)
+        name: str = NAMES[j % len(NAMES)]
+        city: str = CITIES[j // len(NAMES) % len(CITIES)]
+        serial: int = j // (len(NAMES) * len(CITIES))
+        names.append(
+            f"{prefixes[i % len(prefixes)]} {name} {city}"
+            + (f" {serial}" if serial else "")
+        )
+    return names
+
+
+def merchant_draws(rng: np.random.Generator, rows: int, merchants: int) -> np.ndarray:
+    """The merchant of each row, the k-th merchant being drawn with a weight of 1/k."""
+    weights: np.ndarray = 1 / np.arange(1, merchants + 1)
+    return rng.choice(merchants, size=rows, p=weights / weights.sum())
+
+
+def synthetic_ledger(
+    rows: int,
+    kind: str = "expenses",
+    merchants: int = 1_000,
+    start_year: int = 2020,
+    years: int = 5,
+    locale: str = "pt",
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    A ledger of expenses or incomes (kind), labeled in the given locale.
+
+    Args:
+        rows (int): The number of rows.
+        kind (str, optional): "expenses" or "incomes". Defaults to "expenses".
+        merchants (int, optional): The number of distinct descriptions. Defaults to 1_000.
+        start_year (int, optional): The first year of the rows. Defaults to 2020.
+        years (int, optional): The number of years the rows are spread over. Defaults to 5.
+        locale (str, optional): The locale of the labels. Defaults to "pt".
+        seed (int, optional): The seed of the random rows. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: The rows sorted by date (most recent first) with the ledger dtypes.
+    """
+    rng: np.random.Generator = np.random.default_rng(seed)
+    kinds = EXPENSE_KINDS if kind == "expenses" else INCOME_KINDS
+    names: np.ndarray = np.array(merchant_names(merchants, [k[0] for k in kinds]))
+    merchant: np.ndarray = merchant_draws(rng, rows, merchants)
+    kind_index: np.ndarray = merchant % len(kinds)
+    typical: np.ndarray = np.array([k[2] for k in kinds])[kind_index]
+
+    df = pd.DataFrame(
+        {
+            DataSchema.YEAR: start_year + rng.integers(0, years, rows),
+            DataSchema.MONTH: rng.integers(1, 13, rows),
+            DataSchema.AMOUNT: (typical * rng.lognormal(0, 0.5, rows)).round(2),
+            DataSchema.BANK: np.array(BANK_NAMES)[
+                rng.integers(0, len(BANK_NAMES), rows)
+            ],
+            DataSchema.DESCRIPTION: names[merchant],
+        }
+    )
+
+    if kind == "expenses":
+        category_of: dict[str, str] = {
+            sub: category for category, subs in CATEGORIES.items() for sub in subs
+        }
+        subcategories: list[str] = [k[1] for k in kinds]
+        sub_labels: dict[str, str] = labels(DataSchema.SUBCATEGORY, locale)
+        cat_labels: dict[str, str] = labels(DataSchema.CATEGORY, locale)
+        rec_labels: dict[str, str] = labels(DataSchema.RECURRENT, locale)
+        df[DataSchema.SUBCATEGORY] = np.array(
+            [sub_labels[f"subcategory.{s}"] for s in subcategories]
+        )[kind_index]
+        df[DataSchema.CATEGORY] = np.array(
+            [cat_labels[f"category.{category_of[s]}"] for s in subcategories]
+        )[kind_index]
+        df[DataSchema.RECURRENT] = np.array(
+            [
+                rec_labels[RECURRENT_KEYS[s in RECURRENT_SUBCATEGORIES]]
+                for s in subcategories
+            ]
+        )[kind_index]
+    else:
+        cat_labels = labels(DataSchema.CATEGORY, locale)
+        df[DataSchema.CATEGORY] = np.array(
+            [cat_labels[f"inc_category.{k[1]}"] for k in kinds]
+        )[kind_index]
+
+    df = df.sort_values(
+        by=[DataSchema.YEAR, DataSchema.MONTH], ascending=False, ignore_index=True
+    )
+    df["id"] = df.index
+    return to_ledger_dtypes(df)
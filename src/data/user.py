@@ -1,69 +1,47 @@
 from pathlib import Path
 import pandas as pd
 
+from src.data.journal import Journal, apply_operations
+from src.data.ledger import Ledger
+from src.data.loader import load_data
 from src.data.schema import DataSchema
 
 DATABASE_PATH: Path = Path.cwd() / "database"
 
 
-class Profile:
-    def __init__(self, name: str, icon: str) -> None:
-        self.name: str = name
-        self.icon: str = icon
-        self.expenses = self.load_data(DATABASE_PATH / f"{name.lower()}_expenses.csv")
-        self.incomes = self.load_data(DATABASE_PATH / f"{name.lower()}_incomes.csv")
-
-    def load_data(self, file_path: Path) -> pd.DataFrame:
-        """
-        Load data from a file and return it as a pandas DataFrame.
+def user_ledger(name: str, kind: str) -> Ledger:
+    """Returns the columnar ledger of a user's expenses or incomes (kind)."""
+    return Ledger(DATABASE_PATH / f"{name.lower()}_{kind}")
 
-        Parameters:
-            file_path (Path): The path to the file to be loaded.
 
-        Returns:
-            pd.DataFrame: The loaded data as a pandas DataFrame. If the file does not exist, an empty DataFrame is returned.
+def user_journal(name: str, kind: str) -> Journal:
+    """Returns the journal of edits not yet compacted into the user's ledger."""
+    return Journal(DATABASE_PATH / f"{name.lower()}_{kind}.journal")
 
-        Examples:
-            >>> file_path = Path("data.csv")
-            >>> load_data(file_path)
-                YEAR  MONTH  AMOUNT  BANK  CATEGORY  SUBCATEGORY  RECURRENT  DESCRIPTION  id
-            0   2021      1   100.0    A         B             C         D        E1        0
-            1   2021      2   200.0    A         B             C         D        E2        1
-            2   2021      3   300.0    A         B             C         D        E3        2
 
-        Notes:
-            - The DataFrame returned has an additional column 'id' which contains the index of each row.
-            - The DataFrame is sorted by date before being returned.
-        """
+def load_user_data(name: str, kind: str) -> pd.DataFrame:
+    """
+    Load the user's expenses or incomes (kind) from the columnar ledger.
 
-        if not file_path.exists():
-            return pd.DataFrame()
+    The first time a user is loaded, the CSV file written by previous versions of the
+    app (if any) is imported into the ledger; the CSV file itself is left untouched.
+    Edits journaled since the last compaction are replayed on top of the ledger.
+    """
+    ledger: Ledger = user_ledger(name, kind)
+    if not ledger.exists:
+        csv_path: Path = DATABASE_PATH / f"{name.lower()}_{kind}.csv"
+        if csv_path.exists():
+            ledger.save(load_data(csv_path))
+    journal: Journal = user_journal(name, kind)
+    return apply_operations(ledger.load(), journal.read())
 
-        dtype: dict[str, type] = {
-            DataSchema.YEAR: int,
-            DataSchema.MONTH: int,
-            DataSchema.AMOUNT: float,
-            DataSchema.BANK: str,
-            DataSchema.CATEGORY: str,
-            DataSchema.SUBCATEGORY: str,
-            DataSchema.RECURRENT: str,
-            DataSchema.DESCRIPTION: str,
-        }
-        df: pd.DataFrame = pd.read_csv(
-            file_path,
-            dtype=dtype,
-            usecols=list(dtype.keys()),
-        )
-        df["id"] = df.index
-        return self.sort_by_date(df)
 
-    def sort_by_date(self, df: pd.DataFrame) -> pd.DataFrame:
-        df.sort_values(
-            by=[DataSchema.YEAR, DataSchema.MONTH],
-            ascending=False,
-            inplace=True,
-        )
-        return df
+class Profile:
+    def __init__(self, name: str, icon: str) -> None:
+        self.name: str = name
+        self.icon: str = icon
+        self.expenses = load_user_data(name, "expenses")
+        self.incomes = load_user_data(name, "incomes")
 
 
 class HouseholdProfile:
@@ -0,0 +1,232 @@
+"""
+Latency metrics of the Dash callbacks, exposed in the Prometheus text format on /metrics.
+
+Every request to a callback records its wall time, the sizes of its request and response, and
+the number and rows of the cached DataFrames it read. Each callback is identified by its
+outputs, e.g. "sunburst-chart.children".
+
+A single invocation of a callback can also be profiled with cProfile:
+    GET /metrics/profile?callback=<outputs>  profiles the next invocation of the callback
+    GET /metrics/profile                     shows the last profile
+The profiles are also saved in database/profiles/, to be opened with pstats or snakeviz.
+"""
+
+import cProfile
+from dataclasses import dataclass, field
+from datetime import datetime
+import io
+import pstats
+import threading
+import time
+from pathlib import Path
+from flask import Flask, Response, g, has_request_context, request
+import pandas as pd
+
+from src.data.cache import FRAMES
+
+DASH_UPDATE_PATH = "/_dash-update-component"
+PROFILES_DIR: Path = Path.cwd() / "database" / "profiles"
+
+# upper bounds of the latency histogram buckets, in seconds
+BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+@dataclass
+class CallbackStats:
+    """Totals of the requests to one callback."""
+
+    count: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    buckets: list[int] = field(default_factory=lambda: [0] * len(BUCKETS))
+    request_bytes: int = 0
+    response_bytes: int = 0
+    frames: int = 0
+    frame_rows: int = 0
+
+    def observe(
+        self,
+        seconds: float,
+        request_bytes: int,
+        response_bytes: int,
+        frames: int,
+        frame_rows: int,
+        error: bool,
+    ) -> None:
+        self.count += 1
+        self.errors += int(error)
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        self.frames += frames
+        self.frame_rows += frame_rows
+
+
+def label(callback: str) -> str:
+    escaped: str = callback.replace("\\", "\\\\").replace('"', '\\"')
+    return escaped.replace("\n", "\\n")
+
+
+class CallbackMetrics:
+    """The stats of every callback, and the callback whose next invocation is profiled."""
+
+    def __init__(self) -> None:
+        self._stats: dict[str, CallbackStats] = {}
+        self._lock = threading.Lock()
+        self._profiled: str | None = None
+        self.last_profile: str | None = None
+
+    def observe(self, callback: str, *args, **kwargs) -> None:
+        with self._lock:
+            self._stats.setdefault(callback, CallbackStats()).observe(*args, **kwargs)
+
+    def stats(self) -> dict[str, CallbackStats]:
+        with self._lock:
+            return dict(self._stats)
+
+    def profile_next(self, callback: str) -> None:
+        with self._lock:
+            self._profiled = callback
+
+    def should_profile(self, callback: str) -> bool:
+        """Whether to profile this invocation of the callback, disarming the profiler."""
+        with self._lock:
+            if self._profiled != callback:
+                return False
+            self._profiled = None
+            return True
+
+    def to_prometheus(self) -> str:
+        lines: list[str] = [
+            "# HELP dash_callback_duration_seconds Wall time of the Dash callbacks.",
+            "# TYPE dash_callback_duration_seconds histogram",
+        ]
+        stats: dict[str, CallbackStats] = self.stats()
+        for callback, s in sorted(stats.items()):
+            name: str = label(callback)
+            for bound, count in zip(BUCKETS, s.buckets):
+                lines.append(
+                    f'dash_callback_duration_seconds_bucket{{callback="{name}",le="{bound}"}}'
+                    f" {count}"
+                )
+            lines += [
+                f'dash_callback_duration_seconds_bucket{{callback="{name}",le="+Inf"}} '
+                f"{s.count}",
+                f'dash_callback_duration_seconds_sum{{callback="{name}"}} {s.seconds:.6f}',
+                f'dash_callback_duration_seconds_count{{callback="{name}"}} {s.count}',
+            ]
+
+        counters: list[tuple[str, str, str]] = [
+            ("max_seconds", "gauge", "Slowest invocation of the Dash callbacks."),
+            ("errors", "counter", "Failed invocations of the Dash callbacks."),
+            ("request_bytes", "counter", "Bytes received by the Dash callbacks."),
+            ("response_bytes", "counter", "Bytes sent by the Dash callbacks."),
+            ("frames", "counter", "Cached DataFrames read by the Dash callbacks."),
+            (
+                "frame_rows",
+                "counter",
+                "Rows of the DataFrames read by the Dash callbacks.",
+            ),
+        ]
+        for attribute, kind, description in counters:
+            metric: str = f"dash_callback_{attribute}" + (
+                "_total" if kind == "counter" else ""
+            )
+            lines += [f"# HELP {metric} {description}", f"# TYPE {metric} {kind}"]
+            lines += [
+                f'{metric}{{callback="{label(callback)}"}} {getattr(s, attribute)}'
+                for callback, s in sorted(stats.items())
+            ]
+        return "\n".join(lines) + "\n"
+
+
+METRICS = CallbackMetrics()
+
+
+def observe_frame(df: pd.DataFrame) -> None:
+    """Counts a DataFrame read by the callback being served, if any."""
+    if has_request_context() and "callback" in g:
+        g.frames += 1
+        g.frame_rows += len(df)
+
+
+def save_profile(callback: str, profiler: cProfile.Profile) -> str:
+    """Saves the profile and returns its summary."""
+    PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+    safe_name: str = "".join(c if c.isalnum() else "_" for c in callback).strip("_")
+    path: Path = PROFILES_DIR / f"{safe_name}-{datetime.now():%Y%m%d-%H%M%S}.prof"
+    profiler.dump_stats(path)
+
+    summary = io.StringIO()
+    summary.write(f"{callback} ({path})\n")
+    pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(40)
+    return summary.getvalue()
+
+
+def register_metrics(server: Flask, metrics: CallbackMetrics = METRICS) -> None:
+    """Instruments the callbacks served by the Flask server of the Dash app."""
+    FRAMES.on_read = observe_frame
+
+    @server.before_request
+    def start_callback() -> None:
+        if request.path != DASH_UPDATE_PATH:
+            return
+        body: dict = request.get_json(silent=True) or {}
+        g.callback = str(body.get("output", "unknown"))
+        g.frames = 0
+        g.frame_rows = 0
+        g.profiler = None
+        if metrics.should_profile(g.callback):
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+        g.start = time.perf_counter()
+
+    def stop_callback(response_bytes: int, error: bool) -> None:
+        seconds: float = time.perf_counter() - g.pop("start")
+        if g.profiler is not None:
+            g.profiler.disable()
+            metrics.last_profile = save_profile(g.callback, g.profiler)
+        metrics.observe(
+            g.callback,
+            seconds,
+            request.content_length or 0,
+            response_bytes,
+            g.frames,
+            g.frame_rows,
+            error,
+        )
+
+    @server.after_request
+    def end_callback(response: Response) -> Response:
+        if "start" in g:
+            stop_callback(
+                response.calculate_content_length() or 0, response.status_code >= 400
+            )
+        return response
+
+    @server.teardown_request
+    def fail_callback(exception: BaseException | None) -> None:
+        # after_request is skipped when the callback raised
+        if exception is not None and "start" in g:
+            stop_callback(0, True)
+
+    @server.route("/metrics")
+    def prometheus_metrics() -> Response:
+        return Response(
+            metrics.to_prometheus(), mimetype="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    @server.route("/metrics/profile")
+    def callback_profile() -> Response:
+        callback: str | None = request.args.get("callback")
+        if callback:
+            metrics.profile_next(callback)
+            text: str = f"The next invocation of {callback} will be profiled.\n"
+        else:
+            text = metrics.last_profile or "No callback was profiled yet.\n"
+        return Response(text, mimetype="text/plain; charset=utf-8")
@@ -0,0 +1,119 @@
+"""
+Startup mode of the app, and a report of the time spent importing it.
+
+With STARTUP_MODE=lazy (the default), the heavy modules the app only needs for some actions
+(scikit-learn for the predictions, plotly express for the figures...) are imported the first
+time they are used instead of when the server starts. STARTUP_MODE=eager imports everything
+upfront, so that no request pays for it.
+
+Usage (to track the cold start time, optionally failing above a budget):
+    python -m src.startup [--module main] [--top 20] [--budget MS]
+"""
+
+import argparse
+from dataclasses import dataclass
+import importlib
+import importlib.util
+import os
+import re
+import subprocess
+import sys
+import threading
+from types import ModuleType
+
+STARTUP_MODE: str = os.getenv("STARTUP_MODE") or "lazy"
+
+
+class LazyModule(ModuleType):
+    """
+    A module executed on the first access to one of its attributes.
+
+    Unlike importlib.util.LazyLoader, the first access is done under a lock: concurrent
+    requests to a threaded server would otherwise see a half-executed module.
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self._lock = threading.Lock()
+        self._module: ModuleType | None = None
+
+    def load(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, attribute: str):
+        return getattr(self.load(), attribute)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Returns the module, only executing it on the first access to one of its attributes when
+    the startup mode is lazy.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    if STARTUP_MODE != "lazy":
+        return importlib.import_module(name)
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    return LazyModule(name)
+
+
+@dataclass
+class ImportTime:
+    """Import time of a module, in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_import_times(output: str) -> list[ImportTime]:
+    """Parses the output of `python -X importtime`."""
+    return [
+        ImportTime(module, int(self_us), int(cumulative_us), len(indent) // 2)
+        for self_us, cumulative_us, indent, module in IMPORT_TIME_LINE.findall(output)
+    ]
+
+
+def import_times(module: str = "main") -> list[ImportTime]:
+    """The import times of the module and of everything it imports, in a new interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "STARTUP_MODE": STARTUP_MODE},
+        check=True,
+    )
+    return parse_import_times(result.stderr)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Reports the import time of the app.")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget", type=float, help="maximum total import time, in ms")
+    args = parser.parse_args(argv)
+
+    times: list[ImportTime] = import_times(args.module)
+    total_ms: float = sum(t.self_us for t in times) / 1000
+    print(f"{'cumulative':>12} {'self':>10}  module ({STARTUP_MODE} startup)")
+    for t in sorted(times, key=lambda t: t.cumulative_us, reverse=True)[: args.top]:
+        print(
+            f"{t.cumulative_us / 1000:>10.1f}ms {t.self_us / 1000:>8.1f}ms  "
+            f"{'  ' * t.depth}{t.module}"
+        )
+    print(f"Importing {args.module} took {total_ms:.0f}ms ({len(times)} modules)")
+    if args.budget is not None and total_ms > args.budget:
+        parser.exit(1, f"Over the budget of {args.budget:.0f}ms\n")
+
+
+if __name__ == "__main__":
+    main()
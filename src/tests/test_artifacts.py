@@ -0,0 +1,57 @@
+from pathlib import Path
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from src.data.ml.artifacts import load_linear_artifact, save_linear_artifact
+from src.data.ml.registry import ModelRegistry
+
+DESCRIPTIONS: list[str] = [
+    "uber trip",
+    "uber eat",
+    "ifd restaurant",
+    "restaurant pizz",
+    "farm drog",
+    "drog raia farm",
+    "posto ipiranga",
+    "posto shell gasolin",
+]
+SUBCATEGORIES: list[str] = ["A", "B", "B", "B", "C", "C", "A", "A"]
+
+
+# Test cases for save_linear_artifact and load_linear_artifact
+
+
+@pytest.mark.parametrize(
+    "vectorizer",
+    [CountVectorizer(), TfidfVectorizer(sublinear_tf=True, ngram_range=(1, 2))],
+)
+def test_artifact_matches_sklearn(tmp_path: Path, vectorizer: CountVectorizer) -> None:
+    X = vectorizer.fit_transform(DESCRIPTIONS)
+    model = LogisticRegression().fit(X, SUBCATEGORIES)
+    save_linear_artifact(tmp_path / "model", vectorizer, model)
+
+    artifact = load_linear_artifact(tmp_path / "model")
+    new: np.ndarray = np.array(["uber restaurant", "drog posto desconhec", ""])
+    assert isinstance(artifact.coef, np.memmap)
+    np.testing.assert_allclose(
+        artifact.transform(new).toarray(), vectorizer.transform(new).toarray()
+    )
+    X_new = artifact.transform(new)
+    assert artifact.predict(X_new).tolist() == model.predict(X_new).tolist()
+    np.testing.assert_allclose(
+        artifact.predict_proba(X_new), model.predict_proba(X_new)
+    )
+
+
+def test_registry_serves_numpy_artifacts(tmp_path: Path) -> None:
+    vectorizer = CountVectorizer()
+    model = LogisticRegression().fit(
+        vectorizer.fit_transform(DESCRIPTIONS), SUBCATEGORIES
+    )
+    version: str = save_linear_artifact(tmp_path / "model", vectorizer, model)
+
+    registry = ModelRegistry()
+    assert registry.get(tmp_path / "model").version == version
+    assert registry.get(tmp_path / "model") is registry.get(tmp_path / "model")
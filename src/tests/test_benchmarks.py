@@ -0,0 +1,30 @@
+import pandas as pd
+
+from src.benchmarks import Result, regressions
+from src.data.schema import DataSchema
+from src.data.synthetic import synthetic_ledger
+
+# Test cases for the synthetic data and the benchmark results
+
+
+def test_synthetic_ledger_is_reproducible() -> None:
+    df: pd.DataFrame = synthetic_ledger(500, merchants=20)
+    pd.testing.assert_frame_equal(df, synthetic_ledger(500, merchants=20))
+    assert len(df) == 500
+    assert df[DataSchema.DESCRIPTION].nunique() <= 20
+    assert df[DataSchema.SUBCATEGORY].notna().all()
+    # each merchant has a single subcategory
+    assert (
+        df.groupby(DataSchema.DESCRIPTION)[DataSchema.SUBCATEGORY].nunique() == 1
+    ).all()
+
+
+def test_regressions_above_the_tolerance() -> None:
+    baseline = [Result("a", "1k", 1000, median_ms=10.0), Result("b", "1k", 1000, 10.0)]
+    results = [
+        Result("a", "1k", 1000, median_ms=11.0),
+        Result("b", "1k", 1000, median_ms=15.0),
+        Result("c", "1k", 1000, median_ms=99.0),
+    ]
+    slower = regressions(results, baseline, tolerance=0.2)
+    assert [(r.name, ratio) for r, ratio in slower] == [("b", 1.5)]
@@ -0,0 +1,62 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from unidecode import unidecode
+
+from src.data.raw import cleaner
+from src.data.raw.cleaner import GENERAL_PATTERNS, clean_descriptions
+from src.data.raw.descriptions_cache import DescriptionsCache
+from src.data.schema import DataSchema
+
+PATTERNS: list[str] = ["^compra no debito "]
+DESCRIPTIONS: list = [
+    "Compra no débito Padaria São João 12/03/2023",
+    "COMPRA NO DEBITO Padaria Sao Joao 12/03/2023",
+    "Compra no débito Padaria São João 12/03/2023",
+    np.nan,
+    "  Uber *Trip 123456  ",
+    "Pix enviado - Fulano",
+    "Açaí da Praça",
+    None,
+    "  Uber *Trip 123456  ",
+]
+
+
+def fake_tokenize(text: str) -> str:
+    """Stands for the NLTK tokenizer, whose data is not vendored."""
+    return " ".join(dict.fromkeys(text.split()))
+
+
+def clean_row_by_row(patterns: list[str], descriptions: pd.Series) -> pd.Series:
+    """The cleaning of every row on its own, before distinct descriptions were cleaned once."""
+    cleaned: pd.Series = (
+        descriptions.str.lower().str.strip().astype(str).apply(unidecode)
+    )
+    for p in patterns:
+        cleaned = cleaned.str.replace(p, "", regex=True, case=False)
+    for gp in GENERAL_PATTERNS:
+        cleaned = cleaned.str.replace(gp, " ", regex=True)
+    return cleaned.str.strip().apply(fake_tokenize)
+
+
+# Test cases for clean_descriptions function
+
+
+@pytest.mark.parametrize("patterns", [[], PATTERNS])
+def test_clean_descriptions_matches_row_by_row_cleaning(
+    patterns: list[str], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cleaner, "tokenize", fake_tokenize)
+    monkeypatch.setattr(
+        cleaner, "DESCRIPTIONS", DescriptionsCache(tmp_path / "descriptions.sqlite")
+    )
+    df = pd.DataFrame({DataSchema.DESCRIPTION: DESCRIPTIONS}, index=range(10, 19))
+
+    expected: pd.Series = clean_row_by_row(patterns, df[DataSchema.DESCRIPTION])
+    # the second time, the descriptions come from the cache
+    for _ in range(2):
+        actual_df: pd.DataFrame = clean_descriptions(patterns, df.copy())
+        pd.testing.assert_series_equal(
+            actual_df[DataSchema.CLEANED_DESCRIPTION], expected, check_names=False
+        )
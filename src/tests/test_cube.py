@@ -0,0 +1,126 @@
+import pandas as pd
+import pytest
+from dash.exceptions import PreventUpdate
+
+from src.data import cache
+from src.data.cache import FrameCache
+from src.data.cube import CUBE_DIMENSIONS, MonthlyCube
+from src.data.schema import DataSchema
+from src.data.source import DataSource
+
+
+def make_data() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            DataSchema.YEAR: [2022, 2022, 2022, 2021],
+            DataSchema.MONTH: [1, 1, 1, 2],
+            DataSchema.AMOUNT: [100.0, 50.0, 25.0, 300.0],
+            DataSchema.BANK: ["A", "A", "B", "A"],
+            DataSchema.CATEGORY: ["B", "B", "B", None],
+            DataSchema.SUBCATEGORY: ["C", "C", "D", None],
+            DataSchema.RECURRENT: ["D", "D", "D", None],
+            DataSchema.DESCRIPTION: ["E1", "E2", "E3", "E4"],
+            "id": [0, 1, 2, 3],
+        }
+    )
+
+
+def sorted_cube(cube: MonthlyCube) -> pd.DataFrame:
+    return cube.frame.sort_values(CUBE_DIMENSIONS, ignore_index=True)
+
+
+# Test cases for MonthlyCube
+
+
+def test_cube_aggregations_match_raw_rows() -> None:
+    raw = DataSource(make_data())
+    cube = DataSource(MonthlyCube.from_frame(make_data()).frame)
+
+    assert len(cube.dataframe) == 3
+    assert cube.total_month_amount(2022, 1) == raw.total_month_amount(2022, 1)
+    assert cube.total_month_amount(2021, 2) == raw.total_month_amount(2021, 2)
+    assert cube.unique_years == raw.unique_years
+    pd.testing.assert_series_equal(
+        cube.month_income_by_category(1, 2022)[DataSchema.AMOUNT],
+        raw.month_income_by_category(1, 2022)[DataSchema.AMOUNT],
+    )
+
+
+def test_cube_follows_table_operations() -> None:
+    frames = FrameCache()
+    frames.get_or_put("T", "expenses", make_data())
+    cube: MonthlyCube = frames.cube("T", "expenses")
+
+    row: dict = make_data().iloc[0].to_dict()
+    added: dict = dict(row, id=4, **{DataSchema.MONTH: 3})
+    operations: list[dict] = [
+        {"op": "update", "row": dict(row, **{DataSchema.SUBCATEGORY: "D"})},
+        {"op": "remove", "row": make_data().iloc[3].to_dict()},
+        {"op": "add", "row": added},
+    ]
+    frames.apply("T", "expenses", operations)
+
+    assert frames.cube("T", "expenses") is cube
+    pd.testing.assert_frame_equal(
+        sorted_cube(cube),
+        sorted_cube(MonthlyCube.from_frame(frames.get("T", "expenses"))),
+    )
+
+
+def test_cube_follows_cell_changes() -> None:
+    frames = FrameCache()
+    frames.get_or_put("T", "expenses", make_data())
+    cube: MonthlyCube = frames.cube("T", "expenses")
+
+    row: dict = make_data().iloc[0].to_dict()
+    changes: list[dict] = [
+        {
+            "colId": DataSchema.SUBCATEGORY,
+            "oldValue": "C",
+            "newValue": "D",
+            "data": dict(row, **{DataSchema.SUBCATEGORY: "D"}),
+        },
+        {
+            "colId": DataSchema.AMOUNT,
+            "oldValue": 300.0,
+            "newValue": 310.0,
+            "data": dict(make_data().iloc[3].to_dict(), **{DataSchema.AMOUNT: 310.0}),
+        },
+    ]
+    operations: list[dict] = [{"op": "update", "row": c["data"]} for c in changes]
+    frames.apply("T", "expenses", operations, changes)
+
+    assert frames.cube("T", "expenses") is cube
+    pd.testing.assert_frame_equal(
+        sorted_cube(cube),
+        sorted_cube(MonthlyCube.from_frame(frames.get("T", "expenses"))),
+    )
+
+
+# Test cases for the version tokens
+
+
+def test_stale_tokens_are_not_served() -> None:
+    frames = FrameCache()
+    frames.get_or_put("T", "expenses", make_data())
+    token = frames.token("T", "expenses")
+    frames.put("T", "expenses", make_data().iloc[:1])
+
+    with pytest.raises(PreventUpdate):
+        frames.from_token(token)
+    with pytest.raises(PreventUpdate):
+        frames.cube_from_token(token)
+    assert len(frames.from_token(frames.token("T", "expenses"))) == 1
+
+
+def test_newer_tokens_reload_the_ledger(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(cache, "load_user_data", lambda user, kind: make_data())
+    frames = FrameCache()
+    frames.get_or_put("T", "expenses", make_data().iloc[:1])
+    frames.cube("T", "expenses")
+
+    # e.g. written by another server process
+    token = {"user": "T", "kind": "expenses", "version": 3}
+    assert len(frames.from_token(token)) == 4
+    assert frames.cube_from_token(token)[DataSchema.AMOUNT].sum() == 475.0
+    assert frames.token("T", "expenses") == token
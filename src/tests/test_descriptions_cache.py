@@ -0,0 +1,64 @@
+from contextlib import closing
+from functools import partial
+from pathlib import Path
+import sqlite3
+
+import pytest
+
+from src.data.raw.descriptions_cache import DescriptionsCache, signature
+
+# Test cases for DescriptionsCache
+
+
+def test_cache_roundtrip_per_signature(tmp_path: Path) -> None:
+    cache = DescriptionsCache(tmp_path / "cache.sqlite")
+    nubank: str = signature(["^.*?-"])
+    cache.put_many(nubank, {"uber *trip": "uber trip"})
+
+    assert cache.get_many(nubank, ["uber *trip", "ifd*restaurante"]) == {
+        "uber *trip": "uber trip"
+    }
+    assert cache.get_many(signature([]), ["uber *trip"]) == {}
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = DescriptionsCache(tmp_path / "cache.sqlite", max_entries=2)
+    key: str = signature([])
+    cache.put_many(key, {"a": "a"})
+    cache.put_many(key, {"b": "b"})
+    cache.get_many(key, ["a"])
+    cache.put_many(key, {"c": "c"})
+
+    assert len(cache) == 2
+    assert cache.get_many(key, ["a", "b", "c"]) == {"a": "a", "c": "c"}
+
+
+class TrackedConnection(sqlite3.Connection):
+    opened: int = 0
+    closed: int = 0
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        TrackedConnection.opened += 1
+
+    def close(self) -> None:
+        TrackedConnection.closed += 1
+        super().close()
+
+
+def test_cache_closes_its_connections_on_errors(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path: Path = tmp_path / "cache.sqlite"
+    with closing(sqlite3.connect(path)) as connection, connection:
+        connection.execute("CREATE TABLE descriptions (raw TEXT)")
+    monkeypatch.setattr(
+        sqlite3, "connect", partial(sqlite3.connect, factory=TrackedConnection)
+    )
+    monkeypatch.setattr(TrackedConnection, "opened", 0)
+    monkeypatch.setattr(TrackedConnection, "closed", 0)
+    cache = DescriptionsCache(path)
+
+    cache.put_many(signature([]), {"a": "a"})
+    assert cache.get_many(signature([]), ["a"]) == {}
+    assert TrackedConnection.opened == TrackedConnection.closed == 2
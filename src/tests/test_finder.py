@@ -0,0 +1,34 @@
+import i18n
+import numpy as np
+import pandas as pd
+
+from src.data.categorize.expenses_categories import CATEGORIES
+from src.data.categorize.finder import (
+    category_table,
+    find_categories,
+    find_recurrences,
+    recurrence_table,
+    set_subcategories_from_yaml,
+)
+from src.data.schema import DataSchema
+
+# Test cases for the subcategory lookup tables
+
+
+def test_every_subcategory_has_a_category_and_a_recurrence() -> None:
+    labels: dict[str, str] = set_subcategories_from_yaml("en")
+    categorized: set[str] = {s for subs in CATEGORIES.values() for s in subs}
+    assert {labels[label] for label in category_table("en")} == categorized
+    assert recurrence_table("en").keys() == labels.keys()
+
+
+def test_find_categories_and_recurrences_map_whole_columns() -> None:
+    i18n.set("locale", "en")
+    df = pd.DataFrame({DataSchema.SUBCATEGORY: ["Mortgage/Rent", "unknown", np.nan]})
+    df = find_recurrences(find_categories(df.astype("category")))
+    assert df[DataSchema.CATEGORY].tolist()[0] == category_table("en")["Mortgage/Rent"]
+    assert df[DataSchema.CATEGORY].isna().tolist() == [False, True, True]
+    assert df[DataSchema.RECURRENT].tolist() == [
+        i18n.t("general.recurrent_yes", locale="en"),
+        *[i18n.t("general.recurrent_no", locale="en")] * 2,
+    ]
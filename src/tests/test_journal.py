@@ -0,0 +1,125 @@
+from pathlib import Path
+import pandas as pd
+import pytest
+
+from src.data.schema import DataSchema
+from src.data.journal import (
+    Journal,
+    apply_operations,
+    changed_rows,
+    compact,
+    transaction_to_operations,
+)
+from src.data.ledger import Ledger
+
+
+def make_row(id_: int, year: int, amount: float) -> dict:
+    return {
+        DataSchema.YEAR: year,
+        DataSchema.MONTH: 1,
+        DataSchema.AMOUNT: amount,
+        DataSchema.BANK: "A",
+        DataSchema.CATEGORY: "B",
+        DataSchema.SUBCATEGORY: "C",
+        DataSchema.RECURRENT: "D",
+        DataSchema.DESCRIPTION: f"E{id_}",
+        "id": id_,
+    }
+
+
+# Test cases for apply_operations
+
+
+def test_apply_operations_add_update_remove() -> None:
+    df = pd.DataFrame([make_row(0, 2021, 10.0), make_row(1, 2021, 20.0)])
+    operations = transaction_to_operations(
+        {"add": [make_row(2, 2022, 30.0)], "remove": [make_row(0, 2021, 10.0)]}
+    ) + [{"op": "update", "row": make_row(1, 2021, 25.0)}]
+
+    actual_df: pd.DataFrame = apply_operations(df, operations)
+    assert actual_df["id"].tolist() == [2, 1]
+    assert actual_df[DataSchema.AMOUNT].tolist() == [30.0, 25.0]
+
+
+def test_apply_operations_last_operation_wins() -> None:
+    df = pd.DataFrame([make_row(0, 2021, 10.0)])
+    operations = [
+        {"op": "update", "row": make_row(0, 2021, 15.0)},
+        {"op": "remove", "row": make_row(0, 2021, 15.0)},
+    ]
+    assert apply_operations(df, operations).empty
+
+
+def test_apply_operations_updates_rows_in_place() -> None:
+    df = pd.DataFrame([make_row(i, 2021, 10.0) for i in range(3)])
+    operations = [
+        {"op": "update", "row": make_row(1, 2021, 15.0)},
+        {"op": "add", "row": make_row(3, 2021, 5.0)},
+    ]
+    assert apply_operations(df, operations)["id"].tolist() == [3, 0, 1, 2]
+
+
+# Test cases for changed_rows
+
+
+def test_changed_rows_keeps_changed_rows_and_columns() -> None:
+    old_df = pd.DataFrame([make_row(i, 2021, 10.0) for i in range(3)])
+    old_df[DataSchema.SUBCATEGORY] = None
+    new_df = old_df.assign(cleaned_description="e").iloc[::-1]
+    new_df.loc[[0, 2], DataSchema.SUBCATEGORY] = "C"
+
+    actual_df: pd.DataFrame = changed_rows(old_df, new_df)
+    assert actual_df["id"].tolist() == [0, 2]
+    assert actual_df.columns.tolist() == old_df.columns.tolist()
+
+
+# Test cases for Journal and compact
+
+
+def test_journal_survives_reload(tmp_path: Path) -> None:
+    operations = [{"op": "add", "row": make_row(0, 2021, 10.0)}]
+    Journal(tmp_path / "user.journal").append(operations)
+    assert Journal(tmp_path / "user.journal").read() == operations
+
+
+def test_compact_folds_journal_into_ledger(tmp_path: Path) -> None:
+    ledger = Ledger(tmp_path / "ledger")
+    ledger.save(pd.DataFrame([make_row(0, 2021, 10.0), make_row(1, 2022, 20.0)]))
+    journal = Journal(tmp_path / "user.journal")
+    journal.append([{"op": "update", "row": make_row(1, 2022, 25.0)}])
+
+    assert compact(ledger, journal) == [(2022, 1)]
+    assert journal.read() == []
+    assert ledger.load()[DataSchema.AMOUNT].tolist() == [25.0, 10.0]
+
+
+def test_compact_only_reads_the_touched_partitions(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    ledger = Ledger(tmp_path / "ledger")
+    ledger.save(pd.DataFrame([make_row(0, 2021, 10.0), make_row(1, 2022, 20.0)]))
+    journal = Journal(tmp_path / "user.journal")
+    journal.append(
+        transaction_to_operations(
+            {"add": [make_row(2, 2023, 30.0)], "remove": [make_row(0, 2021, 10.0)]}
+        )
+    )
+
+    def load_all(*_) -> pd.DataFrame:
+        raise AssertionError("the whole ledger was loaded")
+
+    monkeypatch.setattr(ledger, "load", load_all)
+    assert sorted(compact(ledger, journal)) == [(2021, 1), (2023, 1)]
+    monkeypatch.undo()
+    assert ledger.load()["id"].tolist() == [2, 1]
+
+
+def test_compact_moves_rows_to_another_month(tmp_path: Path) -> None:
+    ledger = Ledger(tmp_path / "ledger")
+    ledger.save(pd.DataFrame([make_row(0, 2021, 10.0), make_row(1, 2022, 20.0)]))
+    journal = Journal(tmp_path / "user.journal")
+    journal.append([{"op": "update", "row": make_row(0, 2023, 10.0)}])
+
+    assert sorted(compact(ledger, journal)) == [(2021, 1), (2023, 1)]
+    assert ledger.partitions == [(2023, 1), (2022, 1)]
+    assert ledger.load()["id"].tolist() == [0, 1]
@@ -0,0 +1,118 @@
+from pathlib import Path
+import i18n
+import pandas as pd
+
+from src.data.schema import DataSchema
+from src.data.ledger import Ledger
+
+
+def make_data() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            DataSchema.YEAR: [2022, 2021, 2021],
+            DataSchema.MONTH: [1, 2, 2],
+            DataSchema.AMOUNT: [100.0, 200.0, 300.0],
+            DataSchema.BANK: ["A", "A", "B"],
+            DataSchema.CATEGORY: ["B", "B", "B"],
+            DataSchema.SUBCATEGORY: ["C", "C", "C"],
+            DataSchema.RECURRENT: ["D", "D", "D"],
+            DataSchema.DESCRIPTION: ["E1", "E2", "E3"],
+            "id": [0, 1, 2],
+        }
+    )
+
+
+# Test cases for Ledger.save and Ledger.load
+
+
+def test_save_and_load_roundtrip(tmp_path: Path) -> None:
+    ledger = Ledger(tmp_path / "ledger")
+    ledger.save(make_data())
+
+    actual_df: pd.DataFrame = ledger.load()
+    assert ledger.partitions == [(2022, 1), (2021, 2)]
+    assert actual_df["id"].tolist() == [0, 1, 2]
+    assert actual_df[DataSchema.BANK].dtype == "category"
+    assert actual_df[DataSchema.DESCRIPTION].tolist() == ["E1", "E2", "E3"]
+
+
+def test_labels_are_stored_as_codes_and_loaded_in_the_current_locale(
+    tmp_path: Path,
+) -> None:
+    ledger = Ledger(tmp_path / "ledger")
+    df: pd.DataFrame = make_data().assign(
+        **{
+            DataSchema.CATEGORY: "Alimentação",
+            DataSchema.SUBCATEGORY: ["Mantimentos", "Mantimentos", None],
+            DataSchema.RECURRENT: "Sim",
+        }
+    )
+    locale: str = i18n.get("locale")  # type: ignore
+    try:
+        i18n.set("locale", "pt")
+        ledger.save(df)
+        stored: pd.DataFrame = pd.read_parquet(ledger.partition_path(2021, 2))
+        assert stored[DataSchema.SUBCATEGORY].dtype == "int16"
+
+        i18n.set("locale", "en")
+        actual_df: pd.DataFrame = ledger.load()
+    finally:
+        i18n.set("locale", locale)
+    assert actual_df[DataSchema.CATEGORY].tolist() == ["Food"] * 3
+    assert actual_df[DataSchema.SUBCATEGORY].tolist()[:2] == ["Groceries"] * 2
+    assert actual_df[DataSchema.SUBCATEGORY].isna().tolist()[2]
+    assert actual_df[DataSchema.RECURRENT].tolist() == ["Yes"] * 3
+    assert actual_df[DataSchema.BANK].tolist() == ["A", "A", "B"]
+
+
+def test_load_partitions_of_labels(tmp_path: Path) -> None:
+    ledger = Ledger(tmp_path / "ledger")
+    ledger.save(make_data())
+    ledger.write_partition(2021, 2, make_data().iloc[1:])
+
+    actual_df: pd.DataFrame = ledger.load()
+    assert actual_df[DataSchema.SUBCATEGORY].tolist() == ["C", "C", "C"]
+    assert actual_df[DataSchema.BANK].tolist() == ["A", "A", "B"]
+
+
+def test_load_only_requested_years(tmp_path: Path) -> None:
+    ledger = Ledger(tmp_path / "ledger")
+    ledger.save(make_data())
+
+    actual_df: pd.DataFrame = ledger.load(years=[2021])
+    assert actual_df[DataSchema.YEAR].unique().tolist() == [2021]
+
+
+def test_save_rewrites_only_changed_partitions(tmp_path: Path) -> None:
+    ledger = Ledger(tmp_path / "ledger")
+    df: pd.DataFrame = make_data()
+    ledger.save(df)
+
+    df.loc[0, DataSchema.AMOUNT] = 150.0
+    assert ledger.save(df) == [(2022, 1)]
+    assert ledger.save(df) == []
+
+
+def test_save_removes_empty_partitions(tmp_path: Path) -> None:
+    ledger = Ledger(tmp_path / "ledger")
+    df: pd.DataFrame = make_data()
+    ledger.save(df)
+
+    assert ledger.save(df.iloc[1:]) == [(2022, 1)]
+    assert not ledger.partition_path(2022, 1).exists()
+    assert ledger.load()[DataSchema.YEAR].unique().tolist() == [2021]
+
+
+def test_csv_import_and_export(tmp_path: Path) -> None:
+    csv_path: Path = tmp_path / "data.csv"
+    make_data().drop(columns="id").to_csv(csv_path, index=False)
+
+    ledger = Ledger(tmp_path / "ledger")
+    ledger.import_csv(csv_path)
+    assert ledger.load()["id"].tolist() == [0, 1, 2]
+
+    export_path: Path = tmp_path / "export.csv"
+    ledger.export_csv(export_path)
+    pd.testing.assert_frame_equal(
+        pd.read_csv(export_path), make_data().drop(columns="id")
+    )
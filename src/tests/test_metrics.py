@@ -0,0 +1,52 @@
+from flask import Flask
+import pandas as pd
+import pytest
+
+from src import metrics
+from src.data.cache import FRAMES
+from src.metrics import DASH_UPDATE_PATH, CallbackMetrics, register_metrics
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "PROFILES_DIR", tmp_path)
+    monkeypatch.setattr(FRAMES, "on_read", None)
+    server = Flask(__name__)
+
+    @server.route(DASH_UPDATE_PATH, methods=["POST"])
+    def update() -> str:
+        FRAMES.observe(pd.DataFrame({"amount": range(10)}))
+        return "x" * 100
+
+    callback_metrics = CallbackMetrics()
+    register_metrics(server, callback_metrics)
+    return server.test_client(), callback_metrics
+
+
+def test_callbacks_are_measured(client) -> None:
+    test_client, callback_metrics = client
+    for _ in range(2):
+        test_client.post(DASH_UPDATE_PATH, json={"output": "chart.figure"})
+
+    stats = callback_metrics.stats()["chart.figure"]
+    assert stats.count == 2
+    assert stats.response_bytes == 200
+    assert stats.frames == 2 and stats.frame_rows == 20
+
+    text: str = test_client.get("/metrics").get_data(as_text=True)
+    assert 'dash_callback_duration_seconds_count{callback="chart.figure"} 2' in text
+    assert 'dash_callback_frame_rows_total{callback="chart.figure"} 20' in text
+
+
+def test_only_the_next_invocation_is_profiled(client, tmp_path) -> None:
+    test_client, callback_metrics = client
+    test_client.get("/metrics/profile", query_string={"callback": "chart.figure"})
+    test_client.post(DASH_UPDATE_PATH, json={"output": "table.rowData"})
+    assert callback_metrics.last_profile is None
+
+    test_client.post(DASH_UPDATE_PATH, json={"output": "chart.figure"})
+    test_client.post(DASH_UPDATE_PATH, json={"output": "chart.figure"})
+    assert "function calls" in test_client.get("/metrics/profile").get_data(
+        as_text=True
+    )
+    assert len(list(tmp_path.glob("chart_figure-*.prof"))) == 1
@@ -0,0 +1,25 @@
+from pathlib import Path
+import pytest
+
+from src.data.raw import nltk_resources
+from src.data.raw.nltk_resources import MissingResourceError, NLTKResources
+
+# Test cases for NLTKResources
+
+
+def test_resources_are_found_in_the_local_data_dir(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setitem(nltk_resources.RESOURCES, "vendored", "corpora/vendored")
+    (tmp_path / "corpora" / "vendored").mkdir(parents=True)
+    NLTKResources(tmp_path, download=False).require("vendored")
+
+
+def test_missing_resources_are_not_downloaded_offline(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setitem(nltk_resources.RESOURCES, "missing", "corpora/missing")
+    resources = NLTKResources(tmp_path, download=False)
+    monkeypatch.setattr(resources, "fetch", lambda _: pytest.fail("downloaded"))
+    with pytest.raises(MissingResourceError):
+        resources.require("missing")
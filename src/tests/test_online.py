@@ -0,0 +1,72 @@
+import i18n
+import numpy as np
+import pandas as pd
+
+from src.data.ml.online import OnlineModel, confirmed_subcategories
+from src.data.ml.predictor import predict_top_k
+from src.data.schema import DataSchema
+
+# Test cases for OnlineModel
+
+
+CLASSES: list[str] = [
+    "subcategory.dining_out",
+    "subcategory.ride_sharing",
+    "subcategory.groceries",
+]
+
+
+def test_online_model_learns_incrementally() -> None:
+    locale: str = i18n.get("locale")  # type: ignore
+    try:
+        i18n.set("locale", "pt")
+        model = OnlineModel(CLASSES)
+        learned: int = model.partial_fit(
+            np.array(["uber trip", "ifd restaurant", "uber eat"]),
+            np.array(["Compartilhamento de Carro", "Comer Fora", "Desconhecida"]),
+        )
+        assert (learned, model.version, model.n_samples) == (2, 1, 2)
+
+        for _ in range(5):
+            model.partial_fit(
+                np.array(["uber trip"]), np.array(["Compartilhamento de Carro"])
+            )
+        labels, probabilities = predict_top_k(model, model, np.array(["uber"]), k=2)
+    finally:
+        i18n.set("locale", locale)
+    assert labels[0, 0] == "Compartilhamento de Carro"
+    assert probabilities[0, 0] > probabilities[0, 1]
+    assert model.version == 6
+
+
+def test_online_model_follows_the_locale() -> None:
+    locale: str = i18n.get("locale")  # type: ignore
+    try:
+        i18n.set("locale", "pt")
+        model = OnlineModel(CLASSES)
+        model.partial_fit(
+            np.array(["uber trip", "ifd restaurant"]),
+            np.array(["Compartilhamento de Carro", "Comer Fora"]),
+        )
+
+        i18n.set("locale", "en")
+        learned: int = model.partial_fit(np.array(["mercado"]), np.array(["Groceries"]))
+        predicted: list[str] = model.predict(
+            model.transform(np.array(["uber trip"]))
+        ).tolist()
+        classes: list[str] = model.classes_.tolist()
+    finally:
+        i18n.set("locale", locale)
+    assert learned == 1
+    assert predicted == ["Ride-Sharing"]
+    assert classes == ["Dining Out", "Groceries", "Ride-Sharing"]
+
+
+def test_only_user_set_subcategories_are_confirmed() -> None:
+    df = pd.DataFrame(
+        {
+            DataSchema.SUBCATEGORY: ["A", "B", None, "C"],
+            DataSchema.CONFIDENCE: [np.nan, 0.7, np.nan, 1.0],
+        }
+    )
+    assert confirmed_subcategories(df)[DataSchema.SUBCATEGORY].tolist() == ["A"]
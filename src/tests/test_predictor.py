@@ -0,0 +1,171 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import LinearSVC
+
+from src.data.journal import Journal, changed_rows, transaction_to_operations
+from src.data.ml import predictor
+from src.data.ml.artifacts import load_linear_artifact, save_linear_artifact
+from src.data.ml.predictor import (
+    build_merchant_index,
+    predict_subcategories,
+    predict_top_k,
+)
+from src.data.raw import cleaner
+from src.data.raw.cleaner import cleaning_signature
+from src.data.raw.descriptions_cache import DescriptionsCache
+from src.data.schema import DataSchema
+from src.data.source import DataSource
+
+DESCRIPTIONS: list[str] = ["uber trip", "uber eat", "ifd restaurant", "farm drog"]
+SUBCATEGORIES: list[str] = ["A", "B", "B", "C"]
+
+
+# Test cases for predict_top_k function
+
+
+def test_predict_top_k_sorts_by_probability() -> None:
+    vectorizer = TfidfVectorizer()
+    model = LogisticRegression().fit(
+        vectorizer.fit_transform(DESCRIPTIONS), SUBCATEGORIES
+    )
+    new: np.ndarray = np.array(["uber restaurant", "drog"])
+
+    labels, probabilities = predict_top_k(vectorizer, model, new, k=2)
+
+    expected: np.ndarray = model.predict_proba(vectorizer.transform(new))
+    assert labels.shape == probabilities.shape == (2, 2)
+    assert labels[:, 0].tolist() == model.predict(vectorizer.transform(new)).tolist()
+    np.testing.assert_allclose(probabilities[:, 0], expected.max(axis=1))
+    assert (probabilities[:, 0] >= probabilities[:, 1]).all()
+
+
+def test_predict_top_k_without_probabilities() -> None:
+    vectorizer = TfidfVectorizer()
+    model = LinearSVC(dual="auto").fit(
+        vectorizer.fit_transform(DESCRIPTIONS), SUBCATEGORIES
+    )
+
+    labels, probabilities = predict_top_k(vectorizer, model, np.array(["uber"]), k=3)
+
+    assert labels.shape == (1, 1)
+    assert np.isnan(probabilities).all()
+
+
+def test_predict_top_k_with_a_linear_svc_artifact(tmp_path: Path) -> None:
+    vectorizer = TfidfVectorizer()
+    model = LinearSVC(dual="auto").fit(
+        vectorizer.fit_transform(DESCRIPTIONS), SUBCATEGORIES
+    )
+    save_linear_artifact(tmp_path / "model", vectorizer, model)
+    artifact = load_linear_artifact(tmp_path / "model")
+
+    labels, probabilities = predict_top_k(artifact, artifact, np.array(["uber"]), k=3)
+
+    assert labels.tolist() == [model.predict(vectorizer.transform(["uber"])).tolist()]
+    assert np.isnan(probabilities).all()
+
+
+@pytest.fixture
+def cleaned_descriptions(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # cleaned before, so that no NLTK resource is needed
+    descriptions = DescriptionsCache(tmp_path / "descriptions.sqlite")
+    descriptions.put_many(
+        cleaning_signature([]),
+        {
+            "uber trip": "uber trip",
+            "uber trip 123": "uber trip",
+            "farm drog": "farm drog",
+            "***": "",
+        },
+    )
+    monkeypatch.setattr(cleaner, "DESCRIPTIONS", descriptions)
+
+
+@pytest.fixture
+def fitted_model(cleaned_descriptions: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    vectorizer = TfidfVectorizer()
+    model = LogisticRegression().fit(
+        vectorizer.fit_transform(DESCRIPTIONS), SUBCATEGORIES
+    )
+    monkeypatch.setattr(predictor, "load_subcat_model", lambda: (vectorizer, model))
+
+
+def ledger_frame(
+    descriptions: tuple[str, ...] = ("Uber trip", "Farm drog"),
+    subcategories: tuple[str | None, ...] = (None, None),
+) -> pd.DataFrame:
+    rows: list[dict] = [
+        {
+            DataSchema.DESCRIPTION: description,
+            DataSchema.SUBCATEGORY: subcategory,
+            "id": i,
+        }
+        for i, (description, subcategory) in enumerate(zip(descriptions, subcategories))
+    ]
+    return DataSource(rows).dataframe
+
+
+# Test cases for build_merchant_index function
+
+
+@pytest.mark.usefixtures("cleaned_descriptions")
+def test_merchant_index_keeps_the_most_recent_subcategory() -> None:
+    categorized: pd.DataFrame = ledger_frame(
+        ("Uber trip", "UBER TRIP 123", "Farm drog"), ("B", "A", "C")
+    )
+    assert build_merchant_index(categorized) == {"uber trip": "B", "farm drog": "C"}
+
+
+@pytest.mark.usefixtures("cleaned_descriptions")
+def test_merchant_index_leaves_out_empty_descriptions() -> None:
+    categorized: pd.DataFrame = ledger_frame(("***", "Farm drog"), ("A", "C"))
+    assert build_merchant_index(categorized) == {"farm drog": "C"}
+
+
+def test_merchant_index_of_no_rows() -> None:
+    assert build_merchant_index(ledger_frame((), ())) == {}
+
+
+# Test cases for predict_subcategories function
+
+
+@pytest.mark.usefixtures("cleaned_descriptions")
+def test_merchant_index_hits_skip_the_model(monkeypatch: pytest.MonkeyPatch) -> None:
+    def load_subcat_model() -> None:
+        raise AssertionError("the model was loaded")
+
+    monkeypatch.setattr(predictor, "load_subcat_model", load_subcat_model)
+    index: dict[str, str] = {"uber trip": "A", "farm drog": "C"}
+
+    predicted: pd.DataFrame = predict_subcategories(ledger_frame(), index)
+
+    assert predicted[DataSchema.SUBCATEGORY].tolist() == ["A", "C"]
+    assert predicted[DataSchema.CONFIDENCE].tolist() == [1.0, 1.0]
+
+
+@pytest.mark.usefixtures("fitted_model")
+def test_predict_subcategories_on_a_ledger_frame() -> None:
+    df: pd.DataFrame = ledger_frame()
+
+    predicted: pd.DataFrame = predict_subcategories(df.copy(), {"farm drog": "X"})
+
+    assert predicted[DataSchema.SUBCATEGORY].tolist() == ["A", "X"]
+    assert predicted[DataSchema.CONFIDENCE].iloc[1] == 1.0
+
+
+@pytest.mark.usefixtures("fitted_model")
+def test_the_confidence_of_a_first_prediction_is_journaled(tmp_path: Path) -> None:
+    batch: pd.DataFrame = ledger_frame()
+    assert DataSchema.CONFIDENCE not in batch.columns
+
+    rows: pd.DataFrame = changed_rows(batch, predict_subcategories(batch.copy()))
+    journal = Journal(tmp_path / "journal.jsonl")
+    journal.append(transaction_to_operations({"update": rows.to_dict("records")}))
+
+    journaled: list[dict] = [operation["row"] for operation in journal.read()]
+    assert [row["id"] for row in journaled] == [0, 1]
+    assert all(row[DataSchema.CONFIDENCE] > 0 for row in journaled)
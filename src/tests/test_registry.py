@@ -0,0 +1,23 @@
+from pathlib import Path
+import joblib
+
+from src.data.ml.registry import ModelRegistry
+
+# Test cases for ModelRegistry
+
+
+def test_registry_loads_once_and_reloads_on_change(tmp_path: Path) -> None:
+    path: Path = tmp_path / "model.joblib"
+    joblib.dump({"weights": [1, 2]}, path)
+    registry = ModelRegistry()
+
+    first = registry.get(path)
+    assert registry.get(path) is first
+
+    joblib.dump({"weights": [1, 2]}, path)  # same contents, new mtime
+    assert registry.get(path) is first
+
+    version: str = registry.info()["model.joblib"]["version"]
+    joblib.dump({"weights": [3]}, path)
+    assert registry.get(path) == {"weights": [3]}
+    assert registry.info()["model.joblib"]["version"] != version
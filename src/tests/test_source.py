@@ -0,0 +1,49 @@
+import pandas as pd
+
+from src.data.schema import DataSchema
+from src.data.source import DataSource
+
+
+def make_records() -> list[dict]:
+    return [
+        {
+            DataSchema.YEAR: year,
+            DataSchema.MONTH: month,
+            DataSchema.AMOUNT: amount,
+            DataSchema.BANK: "A",
+            DataSchema.CATEGORY: "B",
+            DataSchema.SUBCATEGORY: "C",
+            DataSchema.RECURRENT: "D",
+            DataSchema.DESCRIPTION: "E",
+            DataSchema.CLEANED_DESCRIPTION: "e",
+            "id": id_,
+        }
+        for id_, (year, month, amount) in enumerate(
+            [(2022, 1, 10.0), (2021, 2, 20.0), (2021, 2, 30.0)]
+        )
+    ]
+
+
+# Test cases for DataSource
+
+
+def test_dataframe_is_built_once_with_ledger_dtypes() -> None:
+    source = DataSource(make_records())
+    assert source.dataframe is source.dataframe
+    assert source.dataframe[DataSchema.CATEGORY].dtype == "category"
+    assert source.dataframe[DataSchema.YEAR].dtype == "int16"
+
+
+def test_filters_are_memoized() -> None:
+    source = DataSource(make_records())
+    assert source.filter_year(2021) is source.filter_year(2021)
+    assert source.total_month_amount(2021, 2) == 50.0
+    assert source.unique_years == [2022, 2021]
+
+
+def test_drop_columns_does_not_touch_the_given_frame() -> None:
+    df = pd.DataFrame(make_records())
+    source = DataSource(df)
+    source.drop_columns()
+    assert DataSchema.CLEANED_DESCRIPTION not in source.dataframe.columns
+    assert DataSchema.CLEANED_DESCRIPTION in df.columns
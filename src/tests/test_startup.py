@@ -0,0 +1,61 @@
+import os
+from pathlib import Path
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src import startup
+from src.startup import lazy_import, parse_import_times
+
+ROOT: Path = Path(__file__).parents[2]
+
+# Test cases for the startup
+
+
+def test_parse_import_times() -> None:
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     src.data.schema\n"
+        "import time:       600 |       2500 | main\n"
+    )
+    times = parse_import_times(output)
+    assert [(t.module, t.self_us, t.cumulative_us) for t in times] == [
+        ("src.data.schema", 120, 120),
+        ("main", 600, 2500),
+    ]
+    assert [t.depth for t in times] == [2, 0]
+
+
+def test_lazy_startup_defers_the_heavy_imports() -> None:
+    heavy: list[str] = ["sklearn", "nltk", "plotly.express._chart_types"]
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, main; print([m for m in {heavy} if m in sys.modules])",
+        ],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        env={**os.environ, "STARTUP_MODE": "lazy"},
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_lazy_import_is_thread_safe(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "slow_module.py").write_text(
+        "import time\ntime.sleep(0.2)\nVALUE = 42\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(startup, "STARTUP_MODE", "lazy")
+    monkeypatch.delitem(sys.modules, "slow_module", raising=False)
+
+    module = lazy_import("slow_module")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(executor.map(lambda _: module.VALUE, range(8)))
+    assert values == [42] * 8
@@ -0,0 +1,55 @@
+import io
+import pandas as pd
+import pytest
+
+from src.data.raw.banks import BANKS, SicrediCreditCard
+from src.data.raw.statements import (
+    account_transactions,
+    data_url,
+    main,
+    synthetic_statement,
+)
+from src.data.raw.uploader import upload_bank_data
+from src.data.schema import DataSchema
+
+BANK_LIST = [bank for banks in BANKS.values() for bank in banks.values()]
+
+# Test cases for the synthetic statements
+
+
+@pytest.mark.parametrize("bank", BANK_LIST, ids=lambda bank: type(bank).__name__)
+def test_synthetic_statements_are_read_by_the_banks(bank) -> None:
+    content: bytes = synthetic_statement(bank, 50, merchants=10)
+    content.decode(bank.encoding)
+    df: pd.DataFrame = bank.reader(
+        io.TextIOWrapper(io.BytesIO(content), encoding=bank.encoding)
+    )
+    # plus the balance rows of statements, or the payment of bills
+    assert 50 <= len(df) <= 52
+    assert df[bank.columns.description].notna().all()
+
+
+def test_statements_mix_expenses_and_incomes() -> None:
+    df: pd.DataFrame = account_transactions(1_000, merchants=50)
+    assert (df[DataSchema.AMOUNT] > 0).sum() == 100
+    assert df[DataSchema.DATE].is_monotonic_increasing
+
+
+def test_bills_are_uploaded_without_their_payment() -> None:
+    content: str = data_url(synthetic_statement(SicrediCreditCard(), 200))
+    expenses, incomes = upload_bank_data(SicrediCreditCard(), [content], workers=1)
+
+    assert len(expenses) == 200 and incomes.empty
+    assert expenses[DataSchema.DESCRIPTION].str.contains("/").any()  # installments
+    # the installments are charged in the month after the previous payment
+    assert set(zip(expenses[DataSchema.YEAR], expenses[DataSchema.MONTH])) == {
+        (2024, 12)
+    }
+
+
+def test_statements_need_a_transaction(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        synthetic_statement(BANK_LIST[0], 0)
+    with pytest.raises(SystemExit):
+        main(["--rows", "0", "--output", str(tmp_path)])
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,53 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from src.data.ml.artifacts import load_linear_artifact
+from src.data.ml.predictor import predict_top_k
+from src.data.ml.train import compare_models, save_model
+from src.data.schema import DataSchema
+
+# Test cases for the training CLI
+
+
+def training_data() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            DataSchema.CLEANED_DESCRIPTION: ["uber trip", "uber", "99 taxi", "taxi"]
+            + ["ifd restaurant", "ifood", "restaurant", "ifd"]
+            + ["single"],
+            DataSchema.SUBCATEGORY: ["Transporte"] * 4 + ["Comer fora"] * 4 + ["Rara"],
+        }
+    )
+
+
+def test_compare_models_reports_every_candidate() -> None:
+    reports = compare_models(training_data(), ["logistic_regression", "sgd"], 0.5)
+    assert [r.name for r in reports] == ["logistic_regression", "sgd"]
+    for report in reports:
+        assert 0 <= report.accuracy <= 1
+        assert report.fit_seconds > 0 and report.single_row_ms > 0
+        assert report.artifact_bytes > 0
+
+
+def test_save_model_writes_the_numpy_artifact(tmp_path: Path) -> None:
+    save_model("logistic_regression", training_data(), tmp_path)
+    assert (tmp_path / "subcat_model.joblib").exists()
+    artifact = load_linear_artifact(tmp_path / "subcat_model")
+    assert artifact.meta["model"] == "LogisticRegression"
+    assert "Rara" in artifact.classes_
+
+
+def test_save_model_removes_the_stale_artifact(tmp_path: Path) -> None:
+    save_model("logistic_regression", training_data(), tmp_path)
+    save_model("random_forest", training_data(), tmp_path)
+    assert (tmp_path / "subcat_model.joblib").exists()
+    assert not (tmp_path / "subcat_model").exists()
+
+
+def test_saved_linear_svc_predicts_without_confidence(tmp_path: Path) -> None:
+    save_model("linear_svc", training_data(), tmp_path)
+    artifact = load_linear_artifact(tmp_path / "subcat_model")
+    labels, confidences = predict_top_k(artifact, artifact, np.array(["uber"]))
+    assert labels.tolist() == [["Transporte"]]
+    assert np.isnan(confidences).all()
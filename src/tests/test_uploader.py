@@ -0,0 +1,77 @@
+import base64
+import i18n
+import pandas as pd
+import pytest
+
+from src.data.categorize.finder import LOCALE_PATH
+from src.data.raw import uploader
+from src.data.raw.banks import PersonalTable
+from src.data.raw.uploader import (
+    UploadError,
+    parse,
+    parse_and_clean,
+    upload_bank_data,
+)
+from src.data.schema import DataSchema
+
+
+def make_content(amounts: list[float]) -> str:
+    df = pd.DataFrame(
+        {
+            "Data": ["01/02/2023"] * len(amounts),
+            "Valor": amounts,
+            "Descrição": [f"E{i}" for i in range(len(amounts))],
+            "Banco": ["A"] * len(amounts),
+        }
+    )
+    encoded: str = base64.b64encode(df.to_csv(index=False).encode()).decode()
+    return f"data:text/csv;base64,{encoded}"
+
+
+# Test cases for upload_bank_data function
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_upload_keeps_the_files_order(
+    workers: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setitem(i18n.config.settings, "locale", "pt")
+    monkeypatch.setitem(i18n.config.settings, "load_path", [LOCALE_PATH])
+    contents: list[str] = [make_content([-1.0, 2.0]), make_content([-3.0, 4.0])]
+    expenses, incomes = upload_bank_data(PersonalTable(), contents, workers=workers)
+
+    assert expenses[DataSchema.AMOUNT].tolist() == [1.0, 3.0]
+    assert expenses[DataSchema.RECURRENT].tolist() == ["Não", "Não"]
+    assert incomes[DataSchema.AMOUNT].tolist() == [2.0, 4.0]
+
+
+def test_upload_reports_the_files_that_failed() -> None:
+    contents: list[str] = [make_content([-1.0]), "data:text/csv;base64,YQpi"]
+    with pytest.raises(UploadError) as e:
+        upload_bank_data(PersonalTable(), contents, ["good.csv", "bad.csv"], workers=2)
+
+    assert list(e.value.failures) == ["bad.csv"]
+    assert e.value.expenses[DataSchema.AMOUNT].tolist() == [1.0]
+
+
+def test_upload_reports_any_error_of_a_file(monkeypatch: pytest.MonkeyPatch) -> None:
+    def parse_and_clean(content: str, bank: PersonalTable) -> pd.DataFrame:
+        if content == "boom":
+            raise IndexError("list index out of range")
+        return bank.cleaner(parse(content, bank))
+
+    monkeypatch.setattr(uploader, "parse_and_clean", parse_and_clean)
+    contents: list[str] = [make_content([-1.0]), "boom"]
+    with pytest.raises(UploadError) as e:
+        upload_bank_data(PersonalTable(), contents, ["good.csv", "boom.csv"], workers=1)
+
+    assert e.value.failures == {"boom.csv": "IndexError: list index out of range"}
+
+
+def test_chunked_upload_matches_whole_file(monkeypatch: pytest.MonkeyPatch) -> None:
+    content: str = make_content([-1.0, 2.0, -3.0, 4.0, -5.0])
+    bank = PersonalTable()
+
+    expected: pd.DataFrame = bank.cleaner(parse(content, bank))
+    monkeypatch.setenv("UPLOAD_CHUNKSIZE", "2")
+    pd.testing.assert_frame_equal(parse_and_clean(content, bank), expected)